@@ -1,57 +1,310 @@
 import requests
 import json
+import logging
+import os
 import re
-from typing import Dict, List
-import nltk
-from nltk.tokenize import sent_tokenize, word_tokenize
+import threading
+import time
+from typing import Dict, List, Optional
+from utils.simplify_cache import get_simplification_cache
+from utils.lexicon import lexicon
+from utils.pronunciation import pronunciations
+from utils.text_analysis import TextAnalysis, count_syllables
+from utils.tokenizer import sent_tokenize
 
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+logger = logging.getLogger(__name__)
 
-class AIHelpers:
-    def __init__(self, config=None):
-        self.config = config or {}
+# Generation max_length is rounded up to one of these, so concurrent texts of
+# different lengths share a batch key in InferenceScheduler
+MAX_LENGTH_BUCKETS = (32, 64, 128, 256, 512)
+
+class ModelRegistry:
+    """Process-wide owner of the local T5 simplification pipeline.
+
+    The pipeline is created once per worker, either lazily on first use
+    or in the background at boot (load_async), and warmed up with a dummy
+    generation so the first real request does not pay for lazy init.
+
+    With a model server, an unreachable server is retried with backoff:
+    web workers usually start before model_server.py is listening.
+    """
+
+    def __init__(self):
         self.pipeline = None
-        self._initialize_pipeline()
-        
-        
-    def _initialize_pipeline(self):
-        """Initialize local transformers pipeline"""
-        try:
-            if self.config.get('USE_LOCAL_MODELS', True):
+        self.state = 'not_loaded'  # not_loaded -> loading -> loaded | failed
+        self.error = None
+        self.model_name = None
+        self.load_seconds = None
+        self.remote = None
+        self.retry_at = None  # When a failed model server connection may be retried
+        self.retry_delay = 0
+        self.lock = threading.Lock()
+
+    def get_pipeline(self, config) -> Optional[object]:
+        """Return the shared pipeline, loading it on first use.
+
+        While a background load is in progress this returns None so the
+        caller can fall back to rule-based simplification instead of
+        blocking the request.
+        """
+        if self.state == 'loaded':
+            return self.pipeline
+        if self.state == 'failed' and self._claim_retry():
+            self._load(config, claimed=True)
+            return self.pipeline
+        if self.state in ('loading', 'failed'):
+            return None
+        self._load(config)
+        return self.pipeline
+
+    def _claim_retry(self):
+        """Move a failed model server connection back to 'loading' once its backoff has passed"""
+        with self.lock:
+            if self.state != 'failed' or self.retry_at is None or time.time() < self.retry_at:
+                return False
+            self.state = 'loading'
+            return True
+
+    def load_async(self, config):
+        """Start loading the pipeline in a daemon thread (worker boot)"""
+        with self.lock:
+            if self.state != 'not_loaded':
+                return
+            self.state = 'loading'
+        threading.Thread(target=self._load, args=(config, True), daemon=True).start()
+
+    def _load(self, config, claimed=False):
+        with self.lock:
+            if not claimed:
+                if self.state != 'not_loaded':
+                    return
+                self.state = 'loading'
+            started = time.time()
+            if config.get('MODEL_SERVER_SOCKET'):
+                self._connect_remote(config, started)
+                return
+            try:
                 # Disable TensorFlow to avoid conflicts
-                import os
                 os.environ['USE_TF'] = 'false'
                 os.environ['USE_TORCH'] = 'true'
-                
-                from transformers import pipeline
-                
-                model_name = self.config.get('AI_MODEL_NAME', 'google/flan-t5-small')
-                cache_dir = self.config.get('MODEL_CACHE_DIR', './data/ai_models')
-                
+
+                model_name = config.get('AI_MODEL_NAME', 'google/flan-t5-small')
+                cache_dir = config.get('MODEL_CACHE_DIR', './data/ai_models')
+
                 # Ensure cache directory exists
                 os.makedirs(cache_dir, exist_ok=True)
-                
-                print(f"Initializing local AI model: {model_name}")
-                
-                # Set environment variable for cache directory
                 os.environ['TRANSFORMERS_CACHE'] = cache_dir
-                
-                self.pipeline = pipeline(
+
+                logger.info("Initializing local AI model: %s", model_name)
+                from transformers import pipeline
+
+                generator = pipeline(
                     "text2text-generation",
                     model=model_name,
                     framework="pt"  # Force PyTorch
                 )
-                print("Local AI model initialized successfully!")
-            else:
+                # Warm-up generation so kernels and caches are ready
+                generator("simplify: The cat sat on the mat.", max_length=16)
+
+                self.pipeline = generator
+                self.model_name = model_name
+                self.state = 'loaded'
+                logger.info("Local AI model initialized")
+            except Exception as e:
+                logger.warning("Error initializing local pipeline: %s", e)
                 self.pipeline = None
-                print("Local models disabled, using rule-based fallback")
+                self.error = str(e)
+                self.state = 'failed'
+            finally:
+                self.load_seconds = round(time.time() - started, 2)
+
+    def _connect_remote(self, config, started):
+        """Use the shared model server instead of loading the model here"""
+        from model_server import ModelServerClient, RemotePipeline
+
+        socket_path = config['MODEL_SERVER_SOCKET']
+        try:
+            client = ModelServerClient(socket_path)
+            client.call('ping')
+            self.pipeline = RemotePipeline(client)
+            self.model_name = config.get('AI_MODEL_NAME', 'google/flan-t5-small')
+            self.remote = socket_path
+            self.error = None
+            self.retry_at = None
+            self.retry_delay = 0
+            self.state = 'loaded'
+            logger.info("Using model server at %s", socket_path)
         except Exception as e:
-            print(f"Error initializing local pipeline: {e}")
+            self.retry_delay = min(max(2 * self.retry_delay, config.get('MODEL_SERVER_RETRY_MIN', 1.0)),
+                                   config.get('MODEL_SERVER_RETRY_MAX', 60.0))
+            self.retry_at = time.time() + self.retry_delay
+            logger.warning("Cannot reach model server %s (retrying in %.1fs): %s", socket_path, self.retry_delay, e)
             self.pipeline = None
+            self.error = str(e)
+            self.state = 'failed'
+        finally:
+            self.load_seconds = round(time.time() - started, 2)
+
+    def status(self) -> Dict:
+        """Loading state for /health"""
+        return {
+            'state': self.state,
+            'model': self.model_name,
+            'load_seconds': self.load_seconds,
+            'remote': self.remote,
+            'retry_at': self.retry_at,
+            'error': self.error
+        }
+
+
+model_registry = ModelRegistry()
+
+
+def max_length_bucket(length: int) -> int:
+    """Smallest of MAX_LENGTH_BUCKETS that fits `length`, capped at the largest"""
+    for bucket in MAX_LENGTH_BUCKETS:
+        if length <= bucket:
+            return bucket
+    return MAX_LENGTH_BUCKETS[-1]
+
+
+class _PendingGeneration:
+    def __init__(self, prompt: str, settings: Dict):
+        self.prompt = prompt
+        self.settings = settings
+        self.enqueued = time.time()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class InferenceScheduler:
+    """Dynamic micro-batching for text2text generation.
+
+    Concurrent callers submit one prompt each. A background thread takes
+    the first waiting prompt, keeps collecting for up to `window_ms` or
+    until `max_batch_size` prompts are queued, then runs a single batched
+    pipeline call (the tokenizer pads the inputs) and hands every caller
+    its own output. Prompts are only batched with others that use the
+    same decoding settings, max_length included, so an output never
+    depends on which other requests shared its batch. AIHelpers rounds
+    max_length up to one of MAX_LENGTH_BUCKETS so that texts of
+    different lengths still share batches.
+    """
+
+    def __init__(self, window_ms: float = 20, max_batch_size: int = 8):
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self.pipeline = None
+        self.queue = []
+        self.condition = threading.Condition()
+        self.worker = None
+        self.batch_sizes = {}
+        self.batches = 0
+        self.total_wait = 0.0
+        self.max_queue_depth = 0
+
+    def configure(self, window_ms: float, max_batch_size: int):
+        with self.condition:
+            self.window = window_ms / 1000.0
+            self.max_batch_size = max(1, max_batch_size)
+
+    def generate(self, pipeline, prompt: str, settings: Dict, timeout: float = 30.0) -> str:
+        """Queue one prompt and block until its batch has run"""
+        item = _PendingGeneration(prompt, settings)
+        with self.condition:
+            self.pipeline = pipeline
+            self.queue.append(item)
+            self.max_queue_depth = max(self.max_queue_depth, len(self.queue))
+            if self.worker is None or not self.worker.is_alive():
+                self.worker = threading.Thread(target=self._run, daemon=True)
+                self.worker.start()
+            self.condition.notify()
+        if not item.done.wait(timeout):
+            with self.condition:
+                # Not picked up yet: withdraw it so it does not take a batch slot
+                if item in self.queue:
+                    self.queue.remove(item)
+            raise TimeoutError('Batched generation timed out')
+        if item.error is not None:
+            raise item.error
+        return item.result
+
+    def _take_batch(self):
+        with self.condition:
+            while True:
+                while not self.queue:
+                    self.condition.wait()
+                deadline = self.queue[0].enqueued + self.window
+                while len(self.queue) < self.max_batch_size:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+                if self.queue:
+                    break
+                # Every waiting prompt timed out and was withdrawn while we waited
+
+            first = self.queue[0]
+            shape = self._batch_shape(first.settings)
+            batch = [item for item in self.queue if self._batch_shape(item.settings) == shape][:self.max_batch_size]
+            for item in batch:
+                self.queue.remove(item)
+            return self.pipeline, batch
+
+    @staticmethod
+    def _batch_shape(settings: Dict):
+        return tuple(sorted(settings.items()))
+
+    def _run(self):
+        while True:
+            pipeline, batch = self._take_batch()
+            started = time.time()
+            try:
+                outputs = pipeline([item.prompt for item in batch], batch_size=len(batch), **batch[0].settings)
+                for item, output in zip(batch, outputs):
+                    # Pipelines return either [{...}] or {...} per input
+                    if isinstance(output, list):
+                        output = output[0]
+                    item.result = output['generated_text']
+            except Exception as e:
+                for item in batch:
+                    item.error = e
+            with self.condition:
+                self.batches += 1
+                self.batch_sizes[len(batch)] = self.batch_sizes.get(len(batch), 0) + 1
+                self.total_wait += sum(started - item.enqueued for item in batch)
+            for item in batch:
+                item.done.set()
+
+    def stats(self) -> Dict:
+        """Queue depth and batch-size histogram for /health"""
+        with self.condition:
+            batched = sum(size * count for size, count in self.batch_sizes.items())
+            return {
+                'queue_depth': len(self.queue),
+                'max_queue_depth': self.max_queue_depth,
+                'batches': self.batches,
+                'batch_size_histogram': {str(size): count for size, count in sorted(self.batch_sizes.items())},
+                'avg_queue_wait_ms': round(self.total_wait / batched * 1000, 2) if batched else 0
+            }
+
+
+inference_scheduler = InferenceScheduler()
+
+
+class AIHelpers:
+    def __init__(self, config=None):
+        self.config = config or {}
+        self.pipeline = None
+        self._initialize_pipeline()
+        
+        
+    def _initialize_pipeline(self):
+        """Attach the process-wide local transformers pipeline"""
+        if self.config.get('USE_LOCAL_MODELS', True):
+            self.pipeline = model_registry.get_pipeline(self.config)
+        else:
             self.pipeline = None
             
     def simplify_text(self, text: str) -> str:
@@ -69,24 +322,61 @@ class AIHelpers:
             print(f"Error in text simplification: {e}")
             return self._simplify_rule_based(text)
     
+    def _generation_settings(self, text: str) -> Dict:
+        """Decoding parameters for the local model"""
+        settings = {
+            'max_length': max_length_bucket(len(text.split()) * 2),
+            'num_return_sequences': 1
+        }
+        cached = get_simplification_cache(self.config) is not None
+        if self.config.get('AI_DO_SAMPLE', True) and not (cached and self.config.get('AI_DETERMINISTIC_WHEN_CACHED', True)):
+            settings.update(do_sample=True, temperature=0.7)
+        else:
+            # Greedy decoding: the same input always gives the same output,
+            # so cached results stay valid
+            settings['do_sample'] = False
+        return settings
+    
     def _simplify_with_local_model(self, text: str) -> str:
-        """Use local T5 model for text simplification"""
+        """Use local T5 model for text simplification, with result caching"""
+        simplified = self.model_simplify(text)
+        if simplified is None:
+            return self._simplify_rule_based(text)
+        return simplified
+    
+    def model_simplify(self, text: str, timeout: float = 30.0) -> Optional[str]:
+        """Simplify with the local model only; None when it is unavailable or fails"""
         try:
-            if self.pipeline:
-                prompt = f"simplify: {text}"
-                result = self.pipeline(
-                    prompt,
-                    max_length=min(len(text.split()) * 2, 512),
-                    do_sample=True,
-                    temperature=0.7,
-                    num_return_sequences=1
-                )
+            settings = self._generation_settings(text)
+            cache = get_simplification_cache(self.config)
+            key = None
+            if cache is not None:
+                key = cache.make_key(text, self.config.get('AI_MODEL_NAME', 'google/flan-t5-small'), settings)
+                cached = cache.get(key)
+                if cached is not None:
+                    return cached
+
+            if not self.pipeline:
+                # Loaded in the background, or the model server came up, since the last call
+                self._initialize_pipeline()
+            if not self.pipeline:
+                return None
+            prompt = f"simplify: {text}"
+            simplified = None
+            if self.config.get('AI_BATCHING_ENABLED', False):
+                inference_scheduler.configure(self.config.get('AI_BATCH_WINDOW_MS', 20),
+                                              self.config.get('AI_MAX_BATCH_SIZE', 8))
+                simplified = inference_scheduler.generate(self.pipeline, prompt, settings, timeout=timeout)
+            else:
+                result = self.pipeline(prompt, **settings)
                 if result and len(result) > 0:
-                    return result[0]['generated_text']
-            return self._simplify_rule_based(text)
+                    simplified = result[0]['generated_text']
+            if simplified is not None and cache is not None:
+                cache.set(key, simplified)
+            return simplified
         except Exception as e:
             print(f"Error with local model: {e}")
-            return self._simplify_rule_based(text)
+            return None
     
     def _simplify_with_huggingface(self, text: str) -> str:
         """Use HuggingFace T5 model for text simplification"""
@@ -117,19 +407,6 @@ class AIHelpers:
         
         return self._simplify_rule_based(text)
     
-    def _simplify_with_local_model(self, text: str) -> str:
-        """Use local T5 model for text simplification"""
-        try:
-            if self.pipeline:
-                prompt = f"simplify: {text}"
-                result = self.pipeline(prompt, max_length=len(text.split()) * 2, temperature=0.7)
-                return result[0]['generated_text']
-            else:
-                return self._simplify_rule_based(text)
-        except Exception as e:
-            print(f"Error with local model: {e}")
-            return self._simplify_rule_based(text)
-    
     def _simplify_rule_based(self, text: str) -> str:
         """Rule-based text simplification for dyslexic readers"""
         # Split into sentences
@@ -154,86 +431,26 @@ class AIHelpers:
     
     def _replace_complex_words(self, text: str) -> str:
         """Replace complex words with simpler alternatives"""
-        replacements = {
-            'utilize': 'use',
-            'demonstrate': 'show',
-            'approximately': 'about',
-            'consequently': 'so',
-            'furthermore': 'also',
-            'nevertheless': 'but',
-            'subsequently': 'then',
-            'magnificent': 'great',
-            'enormous': 'huge',
-            'diminish': 'reduce',
-            'acquire': 'get',
-            'commence': 'start',
-            'terminate': 'end'
-        }
-        
-        for complex_word, simple_word in replacements.items():
-            text = re.sub(r'\b' + complex_word + r'\b', simple_word, text, flags=re.IGNORECASE)
-        
-        return text
+        return lexicon.replace(text)
     
     def annotate_text(self, text: str) -> Dict:
         """Add helpful annotations for dyslexic readers"""
-        words = word_tokenize(text)
-        annotations = {}
-        
-        # Identify difficult words (longer than 7 characters)
-        for word in words:
-            clean_word = re.sub(r'[^\w]', '', word.lower())
-            if len(clean_word) > 7:
-                annotations[word] = {
-                    'syllables': self._count_syllables(clean_word),
-                    'difficulty': 'hard' if len(clean_word) > 10 else 'medium'
-                }
-        
-        return {
-            'text': text,
-            'annotations': annotations,
-            'word_count': len(words),
-            'reading_level': self._estimate_reading_level(text)
-        }
+        return TextAnalysis(text).annotation_payload()
     
     def _count_syllables(self, word: str) -> int:
         """Estimate syllable count for a word"""
-        word = word.lower()
-        vowels = 'aeiouy'
-        syllable_count = 0
-        prev_was_vowel = False
-        
-        for char in word:
-            is_vowel = char in vowels
-            if is_vowel and not prev_was_vowel:
-                syllable_count += 1
-            prev_was_vowel = is_vowel
-        
-        # Handle silent 'e'
-        if word.endswith('e') and syllable_count > 1:
-            syllable_count -= 1
-        
-        return max(1, syllable_count)
+        return count_syllables(word)
     
     def _estimate_reading_level(self, text: str) -> str:
         """Estimate reading difficulty level"""
-        sentences = sent_tokenize(text)
-        words = word_tokenize(text)
-        
-        avg_sentence_length = len(words) / len(sentences) if sentences else 0
-        avg_word_length = sum(len(word) for word in words) / len(words) if words else 0
-        
-        if avg_sentence_length < 10 and avg_word_length < 5:
-            return 'Easy'
-        elif avg_sentence_length < 15 and avg_word_length < 6:
-            return 'Medium'
-        else:
-            return 'Hard'
+        return TextAnalysis(text).reading_level
     
     def generate_phoneme_breakdown(self, word: str) -> List[str]:
-        """Generate phoneme breakdown for a word (simplified)"""
-        # This is a simplified phoneme breakdown
-        # In production, you'd use a proper phonemizer library
+        """Phoneme breakdown for a word from the pronunciation dictionary, guessed from letters if unknown"""
+        sounds = pronunciations.sounds(word)
+        if sounds is not None:
+            return sounds
+        
         phoneme_patterns = {
             'ch': ['ch'],
             'sh': ['sh'],
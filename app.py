@@ -51,6 +51,24 @@ app.register_blueprint(dyspraxia_bp, url_prefix='/dyspraxia')
 app.register_blueprint(dashboard_bp, url_prefix='/dashboard')
 app.register_blueprint(bp_doctor, url_prefix='/doctor')
 
+# Choose the sentence/word tokenizer before any request runs
+from utils import tokenizer
+tokenizer.configure(app.config.get('TOKENIZER', 'fast'))
+
+# Warm up the shared simplification model in the background at worker boot
+from ai_helpers import model_registry, inference_scheduler
+if app.config.get('AI_PRELOAD_MODEL') and app.config.get('USE_LOCAL_MODELS'):
+    model_registry.load_async(app.config)
+
+# Pick up document jobs interrupted by a restart of this worker once it serves its first
+# request, not on import: flask CLI commands and test runs import the app too
+from modules.dyslexia import document_jobs
+
+@app.before_request
+def resume_document_jobs():
+    if app.config.get('DOCUMENT_JOBS_RESUME', True):
+        document_jobs(app.config).resume_once()
+
 @app.route('/')
 def index():
     if 'user_id' in session:
@@ -273,13 +291,71 @@ Sitemap: {}/sitemap.xml'''.format(request.url_root.rstrip('/'))
     
     return Response(robots_txt, mimetype='text/plain')
 
+@app.cli.command('rebuild-indexes')
+def rebuild_indexes_command():
+    """Rebuild the per-user row indexes of all data CSV files"""
+    from utils.file_manager import file_manager
+    for filepath in file_manager.rebuild_indexes():
+        print(f"Rebuilt index for {filepath}")
+
+@app.cli.command('build-pronunciations')
+def build_pronunciations_command():
+    """Compile data/pronunciation/dictionary.txt into the memory-mapped lookup file"""
+    from utils.pronunciation import write_dictionary
+    print(f"Wrote {write_dictionary()} pronunciations")
+
+@app.cli.command('build-wordlist')
+def build_wordlist_command():
+    """Compile data/wordlist/word_frequency.txt into the memory-mapped word grade table"""
+    from utils.word_frequency import write_table
+    print(f"Wrote {write_table()} words")
+
+@app.cli.command('build-phonics')
+def build_phonics_command():
+    """Rebuild the phonics item bank (with distractors and pronunciations) from data/phonics/word_families.json"""
+    from utils.phonics_bank import write_item_bank
+    print(f"Wrote {write_item_bank()} phonics items")
+
+@app.cli.command('rebuild-aggregates')
+def rebuild_aggregates_command():
+    """Recompute the materialized per-user progress totals from the CSV files"""
+    from utils.aggregate_store import aggregate_store
+    print(f"Rebuilt aggregates for {aggregate_store.rebuild()} users")
+
+@app.cli.command('check-aggregates')
+def check_aggregates_command():
+    """Compare the materialized progress totals with the CSV files"""
+    from utils.aggregate_store import aggregate_store
+    mismatches = aggregate_store.check()
+    if mismatches:
+        print(f"Aggregates out of date for: {', '.join(mismatches)}")
+        raise SystemExit(1)
+    print("Aggregates are consistent with the CSV files")
+
 @app.route('/health')
 def health_check():
     """Health check endpoint for monitoring"""
+    from utils.simplify_cache import get_simplification_cache
+    from utils.simplify_jobs import get_upgrade_jobs
+    from utils.tts import get_tts_service
+    from modules.dyspraxia import vision_stats
+    cache = get_simplification_cache(app.config)
+    tts = get_tts_service(app.config)
     return jsonify({
         'status': 'healthy',
         'timestamp': datetime.now().isoformat(),
-        'service': 'Cogno Solution'
+        'service': 'Cogno Solution',
+        'models': {
+            'simplification': model_registry.status(),
+            'batching': inference_scheduler.stats(),
+            'upgrades': get_upgrade_jobs(app.config).stats(),
+            'document_jobs': document_jobs(app.config).stats(),
+            'vision': vision_stats()
+        },
+        'caches': {
+            'simplification': cache.stats() if cache else None,
+            'speech': tts.stats() if tts else None
+        }
     })
 
 if __name__ == '__main__':
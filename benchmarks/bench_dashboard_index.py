@@ -0,0 +1,115 @@
+"""
+Benchmark: /dashboard/data latency as progress CSVs grow.
+
+Generates synthetic progress files with 1k .. 1M rows spread over many
+users, then times the dashboard endpoint for one user with a fixed amount
+of history. With the per-user index the warm latency should stay flat;
+the "full scan" column shows the old read_csv + filter cost for comparison.
+
+Usage: python benchmarks/bench_dashboard_index.py [--max-rows 1000000]
+"""
+import argparse
+import csv
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROGRESS_FILES = {
+    'dyslexia/progress.csv': ['user_id', 'activity', 'original_text', 'difficulty', 'word_count', 'readability_score', 'timestamp'],
+    'dyscalculia/progress.csv': ['user_id', 'problem_type', 'difficulty', 'correct', 'user_answer', 'correct_answer', 'timestamp'],
+    'dysgraphia/progress.csv': ['user_id', 'activity', 'text_sample', 'word_count', 'issues_count', 'timestamp'],
+    'dyspraxia/progress.csv': ['user_id', 'activity', 'exercise_name', 'duration', 'stability_score', 'timestamp'],
+    'dyslexia/games.csv': ['user_id', 'game_type', 'difficulty', 'score', 'total_questions', 'accuracy', 'timestamp'],
+}
+
+TARGET_USER = 'bench_user'
+TARGET_ROWS_PER_FILE = 20
+
+
+def make_row(fieldnames, user_id, day):
+    row = []
+    for name in fieldnames:
+        if name == 'user_id':
+            row.append(user_id)
+        elif name == 'timestamp':
+            row.append(f'2025-08-{day:02d}T10:00:00.000000')
+        elif name in ('word_count', 'score', 'total_questions', 'issues_count', 'user_answer', 'correct_answer'):
+            row.append(random.randint(1, 50))
+        elif name in ('accuracy', 'stability_score', 'duration'):
+            row.append(round(random.uniform(0, 100), 1))
+        elif name == 'correct':
+            row.append(random.choice(['True', 'False']))
+        else:
+            row.append('sample')
+    return row
+
+
+def generate(data_dir, total_rows):
+    rows_per_file = max(total_rows // len(PROGRESS_FILES), TARGET_ROWS_PER_FILE)
+    for relpath, fieldnames in PROGRESS_FILES.items():
+        path = os.path.join(data_dir, relpath)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        target_positions = set(random.sample(range(rows_per_file), TARGET_ROWS_PER_FILE))
+        with open(path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(fieldnames)
+            for i in range(rows_per_file):
+                user_id = TARGET_USER if i in target_positions else f'user_{random.randint(1, 5000)}'
+                writer.writerow(make_row(fieldnames, user_id, 1 + i % 28))
+
+
+def time_call(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--max-rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='cogno-bench-')
+    os.chdir(workdir)
+    sys.path.insert(0, REPO_ROOT)
+    from utils.file_manager import file_manager
+    from utils.csv_index import index_registry
+    from modules import dashboard
+
+    def dashboard_data():
+        return dashboard.get_user_progress(TARGET_USER)
+
+    def full_scan():
+        for relpath in PROGRESS_FILES:
+            rows = file_manager.read_csv(os.path.join('data', relpath))
+            [r for r in rows if r['user_id'] == TARGET_USER]
+
+    print(f"{'rows':>10} {'index build ms':>15} {'dashboard ms':>13} {'full scan ms':>13}")
+    try:
+        sizes = [n for n in (1_000, 10_000, 100_000, 1_000_000) if n <= args.max_rows]
+        for total_rows in sizes:
+            shutil.rmtree('data', ignore_errors=True)
+            generate('data', total_rows)
+            index_registry.indexes.clear()
+            start = time.perf_counter()
+            file_manager.rebuild_indexes()
+            build_ms = (time.perf_counter() - start) * 1000
+            dashboard_ms = time_call(dashboard_data, args.repeat)
+            scan_ms = time_call(full_scan, 1 if total_rows > 100_000 else args.repeat)
+            print(f'{total_rows:>10} {build_ms:>15.1f} {dashboard_ms:>13.2f} {scan_ms:>13.1f}')
+    finally:
+        os.chdir(REPO_ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark: camera frame upload formats for the dyspraxia vision endpoints.
+
+Builds the request body for one camera frame in each accepted form
+(JSON with base64 'frame', a raw image/jpeg body, multipart/form-data)
+and measures bytes per frame and the server CPU time to turn the request
+into a decoded image with utils.frames (body parsing, base64 where
+applicable, cv2.imdecode). MediaPipe inference, identical for all three,
+is not included.
+
+Usage: python benchmarks/bench_frame_upload.py [--width 640] [--height 480] [--frames 200]
+"""
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import cv2  # noqa: E402
+import numpy as np  # noqa: E402
+from flask import Flask, request  # noqa: E402
+from utils.frames import decode_frame, read_frame_upload  # noqa: E402
+
+BOUNDARY = 'frameboundary'
+
+
+def make_frame(width, height):
+    """A JPEG with camera-like detail (smoothed noise), as the browser's toBlob would produce"""
+    rng = np.random.default_rng(7)
+    img = cv2.GaussianBlur(rng.integers(0, 256, (height, width, 3), dtype=np.uint8), (9, 9), 0)
+    return cv2.imencode('.jpg', img, [cv2.IMWRITE_JPEG_QUALITY, 80])[1].tobytes()
+
+
+def request_bodies(jpeg):
+    multipart = b''.join([
+        f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="movement"\r\n\r\narm_raise\r\n'.encode(),
+        f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="frame"; filename="frame.jpg"\r\n'
+        'Content-Type: image/jpeg\r\n\r\n'.encode(),
+        jpeg,
+        f'\r\n--{BOUNDARY}--\r\n'.encode()
+    ])
+    return {
+        'json + base64': ('', 'application/json',
+                          json.dumps({'frame': base64.b64encode(jpeg).decode(), 'movement': 'arm_raise'}).encode()),
+        'raw image/jpeg': ('movement=arm_raise', 'image/jpeg', jpeg),
+        'multipart': ('', f'multipart/form-data; boundary={BOUNDARY}', multipart)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--width', type=int, default=640)
+    parser.add_argument('--height', type=int, default=480)
+    parser.add_argument('--frames', type=int, default=200)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    jpeg = make_frame(args.width, args.height)
+    print(f"{args.width}x{args.height} frame, {len(jpeg)} bytes as JPEG")
+    print(f"{'form':>15} | {'bytes/frame':>11} | {'overhead':>8} | {'parse (ms)':>10} | {'parse+decode (ms)':>17}")
+    for name, (query, content_type, body) in request_bodies(jpeg).items():
+        def parse():
+            with app.test_request_context('/detect-movement', method='POST', query_string=query,
+                                          content_type=content_type, data=body):
+                frame, params = read_frame_upload(request)
+                assert params['movement'] == 'arm_raise'
+                return frame
+
+        start = time.process_time()
+        for _ in range(args.frames):
+            parse()
+        parse_cpu = (time.process_time() - start) / args.frames
+        start = time.process_time()
+        for _ in range(args.frames):
+            img = decode_frame(parse())
+        total_cpu = (time.process_time() - start) / args.frames
+        assert img.shape == (args.height, args.width, 3)
+        print(f"{name:>15} | {len(body):>11} | {len(body) / len(jpeg) - 1:>7.0%} | {parse_cpu * 1000:>10.3f} | "
+              f"{total_cpu * 1000:>17.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: building a vision response with a drawn overlay frame vs packed landmarks.
+
+For a pose (33 landmarks) and a hand (21 landmarks) on a camera-sized
+frame, times what the endpoints do after inference: the overlay form
+(draw_landmarks, JPEG re-encode, base64, landmarks as x/y/z dicts) and
+the landmark-only form (utils.landmarks.pack_landmarks), and compares the
+JSON response sizes.
+
+Usage: python benchmarks/bench_landmark_response.py [--width 640] [--height 480] [--repeat 200]
+"""
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import cv2  # noqa: E402
+import mediapipe as mp  # noqa: E402
+import numpy as np  # noqa: E402
+from mediapipe.framework.formats import landmark_pb2  # noqa: E402
+from utils.landmarks import HAND_FIELDS, POSE_FIELDS, pack_landmarks  # noqa: E402
+
+
+def landmark_list(count, rng):
+    landmarks = landmark_pb2.NormalizedLandmarkList()
+    for x, y, z in rng.random((count, 3)):
+        landmarks.landmark.add(x=x, y=y, z=z - 0.5, visibility=0.9)
+    return landmarks
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        body = fn()
+    return (time.perf_counter() - start) / repeat, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--width', type=int, default=640)
+    parser.add_argument('--height', type=int, default=480)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    frame = cv2.GaussianBlur(rng.integers(0, 256, (args.height, args.width, 3), dtype=np.uint8), (9, 9), 0)
+    draw = mp.solutions.drawing_utils
+    spec = draw.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=2)
+    cases = [
+        ('pose', 33, mp.solutions.pose.POSE_CONNECTIONS, POSE_FIELDS),
+        ('hand', 21, mp.solutions.hands.HAND_CONNECTIONS, HAND_FIELDS)
+    ]
+
+    print(f"{args.width}x{args.height} frame, response building after inference")
+    print(f"{'':>5} | {'overlay (ms)':>12} | {'overlay bytes':>13} | {'landmarks (ms)':>14} | {'landmark bytes':>14}")
+    for name, count, connections, fields in cases:
+        landmarks = landmark_list(count, rng)
+        dicts = [{field: getattr(lm, field) for field in fields} for lm in landmarks.landmark]
+
+        def overlay():
+            img = cv2.cvtColor(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB), cv2.COLOR_RGB2BGR)
+            draw.draw_landmarks(img, landmarks, connections, spec, spec)
+            _, buffer = cv2.imencode('.jpg', img)
+            return json.dumps({'landmarks': dicts, 'processed_frame': base64.b64encode(buffer).decode('utf-8')})
+
+        def compact():
+            return json.dumps({'landmarks': pack_landmarks(dicts, fields)})
+
+        overlay_time, overlay_size = timed(overlay, args.repeat)
+        compact_time, compact_size = timed(compact, args.repeat)
+        print(f"{name:>5} | {overlay_time * 1000:>12.2f} | {overlay_size:>13} | {compact_time * 1000:>14.3f} | "
+              f"{compact_size:>14}")
+
+
+if __name__ == '__main__':
+    main()
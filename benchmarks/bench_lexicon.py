@@ -0,0 +1,145 @@
+"""
+Benchmark: word-simplification throughput of the lexicon engine.
+
+Compares the previous implementations (DyslexiaAI's split-and-lookup
+loop over a 27-entry dict and AIHelpers' one re.sub per entry) with
+utils.lexicon.CompiledLexicon, both with the shipped data file and with
+a synthetic lexicon of --entries words, on generated texts of 10 KB to
+1 MB. The shipped lexicon is first checked against the expected
+outputs in data/lexicon/golden_cases.json (passive and perfect
+constructions among them).
+
+Usage: python benchmarks/bench_lexicon.py [--entries 50000] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import random
+import re
+import string
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from utils.lexicon import CompiledLexicon, Lexicon  # noqa: E402
+
+SIZES = [10 * 1024, 100 * 1024, 1024 * 1024]
+GOLDEN = os.path.join(REPO_ROOT, 'data', 'lexicon', 'golden_cases.json')
+
+LEGACY_DICT = {
+    'utilize': 'use', 'demonstrate': 'show', 'approximately': 'about',
+    'consequently': 'so', 'furthermore': 'also', 'nevertheless': 'but',
+    'subsequently': 'then', 'magnificent': 'great', 'enormous': 'huge',
+    'diminish': 'reduce', 'acquire': 'get', 'commence': 'start',
+    'terminate': 'end', 'assistance': 'help', 'sufficient': 'enough',
+    'difficult': 'hard', 'important': 'key', 'understand': 'get',
+    'remember': 'recall', 'different': 'other', 'because': 'since',
+    'immediately': 'now', 'necessary': 'needed', 'opportunity': 'chance',
+    'participate': 'join', 'communicate': 'talk', 'investigate': 'look into'
+}
+LEGACY_REGEX_ENTRIES = list(LEGACY_DICT.items())[:13]
+
+
+def legacy_split_replace(text):
+    """The old DyslexiaAI.replace_complex_words"""
+    simplified_words = []
+    for word in text.split():
+        punctuation = ''
+        clean_word = word
+        if word and not word[-1].isalnum():
+            punctuation = word[-1]
+            clean_word = word[:-1]
+        lower_word = clean_word.lower()
+        if lower_word in LEGACY_DICT:
+            simplified_words.append(LEGACY_DICT[lower_word] + punctuation)
+        else:
+            simplified_words.append(word)
+    return ' '.join(simplified_words)
+
+
+def legacy_regex_replace(text):
+    """The old AIHelpers._replace_complex_words"""
+    for complex_word, simple_word in LEGACY_REGEX_ENTRIES:
+        text = re.sub(r'\b' + complex_word + r'\b', simple_word, text, flags=re.IGNORECASE)
+    return text
+
+
+def synthetic_entries(count, rng):
+    entries = set()
+    while len(entries) < count:
+        word = ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(6, 12)))
+        entries.add(word)
+    return [(word, word[:3]) for word in entries]
+
+
+def make_text(size, vocabulary, rng):
+    common = ['the', 'a', 'to', 'and', 'of', 'in', 'is', 'it', 'we', 'that', 'this', 'reader', 'page', 'story']
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(vocabulary) if rng.random() < 0.15 else rng.choice(common)
+        if rng.random() < 0.1:
+            word = word.capitalize()
+        if rng.random() < 0.08:
+            word += rng.choice('.,;')
+        words.append(word)
+        length += len(word) + 1
+    return ' '.join(words)
+
+
+def timed(fn, text, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--entries', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    shipped = Lexicon(os.path.join(REPO_ROOT, 'data', 'lexicon', 'replacements.csv'))
+    shipped_entries = shipped._load_entries()
+
+    entries = shipped_entries + synthetic_entries(args.entries, rng)
+    start = time.perf_counter()
+    synthetic = CompiledLexicon(entries)
+    build_ms = (time.perf_counter() - start) * 1000
+    shipped_compiled = CompiledLexicon(shipped_entries)
+    print(f"Shipped lexicon: {len(shipped_entries)} entries; synthetic: {synthetic.size} entries "
+          f"(compiled in {build_ms:.0f} ms)")
+
+    with open(GOLDEN, 'r', encoding='utf-8') as file:
+        golden = json.load(file)
+    failures = [case for case in golden if shipped_compiled.replace(case['text']) != case['simplified']]
+    print(f"Golden cases matching: {len(golden) - len(failures)}/{len(golden)}")
+    for case in failures:
+        print(f"  {case['text']!r}: expected {case['simplified']!r}, got {shipped_compiled.replace(case['text'])!r}")
+
+    vocabulary = [entry for entry, _ in shipped_entries if ' ' not in entry] + list(synthetic.words)[:2000]
+    implementations = [
+        ('legacy split+dict (27)', legacy_split_replace),
+        ('legacy re.sub x13', legacy_regex_replace),
+        (f'lexicon ({len(shipped_entries)})', shipped_compiled.replace),
+        (f'lexicon ({synthetic.size})', synthetic.replace),
+    ]
+
+    print(f"\n{'text size':>10} | " + ' | '.join(f'{name:>24}' for name, _ in implementations))
+    for size in SIZES:
+        text = make_text(size, vocabulary, rng)
+        cells = []
+        for _, fn in implementations:
+            seconds = timed(fn, text, args.repeat)
+            cells.append(f'{len(text) / seconds / 1e6:>18.1f} MB/s')
+        print(f"{size // 1024:>7} KB | " + ' | '.join(cells))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+"""
+Benchmark: movement and gesture checks on landmark dicts vs the vectorized rule tables.
+
+The legacy side is the previous DyspraxiaAI code: the detect_movement
+if/elif chain and classify_hand_gesture over lists of x/y/z dicts. The
+engine side is utils.pose_rules on NumPy landmark arrays: the
+single-frame path (RuleSet.check, GestureTable.classify on one hand) and
+the vectorized batch path. Both sides evaluate every movement on
+random poses, and the results are checked to be identical. The "from
+MediaPipe result" rows add reading the landmarks out of MediaPipe's
+landmark list (dicts on the legacy side, from_mediapipe on the engine
+side), which is what a live request or stream frame pays after
+inference. Each time is the best of 3 passes.
+
+Usage: python benchmarks/bench_movement_rules.py [--frames 5000]
+"""
+import argparse
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import numpy as np  # noqa: E402
+from mediapipe.framework.formats import landmark_pb2  # noqa: E402
+from utils.landmarks import HAND_FIELDS, POSE_FIELDS, from_mediapipe, to_dicts  # noqa: E402
+from utils.pose_rules import MOVEMENT_RULES, gesture_table, movement_rules  # noqa: E402
+
+
+def legacy_movement(p, movement_type):
+    """The old detect_movement branches (detection only)"""
+    if movement_type == 'arm_raise':
+        return p[15]['y'] < p[11]['y'] and p[16]['y'] < p[12]['y']
+    elif movement_type == 'side_step':
+        return abs(p[27]['x'] - p[28]['x']) > 0.35
+    elif movement_type == 'march_in_place':
+        return p[25]['y'] < p[23]['y'] or p[26]['y'] < p[24]['y']
+    elif movement_type == 'squat_hold':
+        return p[23]['y'] > p[25]['y'] and p[24]['y'] > p[26]['y']
+    elif movement_type == 'torso_twist':
+        return abs(p[11]['x'] - p[12]['x']) > 0.25
+    elif movement_type == 'jumping_jacks':
+        return p[15]['y'] < p[0]['y'] and p[16]['y'] < p[0]['y'] and abs(p[27]['x'] - p[28]['x']) > 0.4
+    elif movement_type == 'heel_walk':
+        return p[31]['y'] < p[29]['y'] and p[32]['y'] < p[30]['y']
+    elif movement_type == 'balance_reach':
+        return (p[15]['y'] < p[23]['y'] and p[16]['y'] < p[24]['y']) and abs(p[27]['y'] - p[28]['y']) > 0.2
+    return False
+
+
+def legacy_gesture(landmarks):
+    """The old classify_hand_gesture"""
+    fingers_up = []
+    if landmarks[17]['x'] < landmarks[5]['x']:
+        fingers_up.append(landmarks[4]['x'] > landmarks[3]['x'])
+    else:
+        fingers_up.append(landmarks[4]['x'] < landmarks[3]['x'])
+    for tip, pip in ((8, 6), (12, 10), (16, 14), (20, 18)):
+        fingers_up.append(landmarks[tip]['y'] < landmarks[pip]['y'])
+    total_fingers = sum(fingers_up)
+    if total_fingers == 0: return 'rock'
+    if total_fingers == 5: return 'paper'
+    if total_fingers == 2 and fingers_up[1] and fingers_up[2]: return 'scissors'
+    if total_fingers == 1 and fingers_up[1]: return 'point'
+    if total_fingers == 1 and fingers_up[0]: return 'thumbs_up'
+    if total_fingers >= 4: return 'wave'
+    return 'open_palm'
+
+
+def timed(fn, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def to_mediapipe(landmarks, fields):
+    """A MediaPipe NormalizedLandmarkList holding an (n, fields) array"""
+    landmark_list = landmark_pb2.NormalizedLandmarkList()
+    for row in landmarks.tolist():
+        landmark = landmark_list.landmark.add()
+        for field, value in zip(fields, row):
+            setattr(landmark, field, value)
+    return landmark_list
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--frames', type=int, default=5000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    poses = rng.random((args.frames, 33, 4), dtype=np.float32)
+    hands = rng.random((args.frames, 21, 3), dtype=np.float32)
+    pose_dicts = [to_dicts(pose, POSE_FIELDS) for pose in poses]
+    hand_dicts = [to_dicts(hand, HAND_FIELDS) for hand in hands]
+    names = list(MOVEMENT_RULES)
+
+    legacy_time, legacy = timed(lambda: [[legacy_movement(p, name) for name in names] for p in pose_dicts])
+    check_time, checked = timed(lambda: [list(movement_rules.check_all(pose).values()) for pose in poses])
+    frame_time, per_frame = timed(lambda: [movement_rules.evaluate(pose) for pose in poses])
+    batch_time, batch = timed(lambda: movement_rules.evaluate(poses))
+    assert np.array_equal(np.array(legacy), np.array(checked))
+    assert np.array_equal(np.array(legacy), np.array(per_frame)) and np.array_equal(np.array(legacy), batch)
+
+    # What the live paths do: one movement for one frame
+    one_legacy_time, one_legacy = timed(lambda: [legacy_movement(p, names[i % len(names)])
+                                                 for i, p in enumerate(pose_dicts)])
+    one_check_time, one_checked = timed(lambda: [movement_rules.check(pose, names[i % len(names)])
+                                                 for i, pose in enumerate(poses)])
+    assert one_legacy == one_checked
+
+    pose_lists = [to_mediapipe(pose, POSE_FIELDS) for pose in poses]
+    hand_lists = [to_mediapipe(hand, HAND_FIELDS) for hand in hands]
+    live_legacy_time, live_legacy = timed(lambda: [
+        legacy_movement([{'x': lm.x, 'y': lm.y, 'z': lm.z, 'visibility': lm.visibility} for lm in landmarks.landmark],
+                        names[i % len(names)])
+        for i, landmarks in enumerate(pose_lists)])
+    live_time, live = timed(lambda: [movement_rules.check(from_mediapipe(landmarks, POSE_FIELDS), names[i % len(names)])
+                                     for i, landmarks in enumerate(pose_lists)])
+    assert live_legacy == live
+    live_gesture_legacy_time, live_gestures_legacy = timed(lambda: [
+        legacy_gesture([{'x': lm.x, 'y': lm.y, 'z': lm.z} for lm in landmarks.landmark]) for landmarks in hand_lists])
+    live_gesture_time, live_gestures = timed(lambda: [gesture_table.classify(from_mediapipe(landmarks, HAND_FIELDS))
+                                                      for landmarks in hand_lists])
+    assert live_gestures_legacy == live_gestures
+
+    gesture_legacy_time, gestures = timed(lambda: [legacy_gesture(hand) for hand in hand_dicts])
+    gesture_frame_time, gestures_frame = timed(lambda: [gesture_table.classify(hand) for hand in hands])
+    gesture_batch_time, gestures_batch = timed(lambda: gesture_table.classify(hands))
+    assert gestures == gestures_frame == gestures_batch.tolist()
+
+    def us(seconds):
+        return f'{seconds / args.frames * 1e6:.2f}'
+
+    print(f"{args.frames} random frames; results identical")
+    print(f"{'':>36} | {'legacy dicts (us)':>17} | {'arrays, one frame (us)':>22} | {'arrays, batch (us)':>18}")
+    print(f"{'one movement/frame':>36} | {us(one_legacy_time):>17} | {us(one_check_time):>22} | {'-':>18}")
+    print(f"{f'all {len(names)} movements/frame':>36} | {us(legacy_time):>17} | {us(check_time):>22} | "
+          f"{us(batch_time):>18}")
+    print(f"{'gesture/frame':>36} | {us(gesture_legacy_time):>17} | {us(gesture_frame_time):>22} | "
+          f"{us(gesture_batch_time):>18}")
+    print(f"{'one movement, from MediaPipe result':>36} | {us(live_legacy_time):>17} | {us(live_time):>22} | {'-':>18}")
+    print(f"{'gesture, from MediaPipe result':>36} | {us(live_gesture_legacy_time):>17} | {us(live_gesture_time):>22} | "
+          f"{'-':>18}")
+    print(f"\n(evaluate() on one frame at a time, all movements: {us(frame_time)} us/frame)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark: pronunciation lookups from the compiled dictionary file.
+
+Compares a per-process dict parsed from the CMUdict-format source (what
+each worker would otherwise hold) with utils.pronunciation's
+memory-mapped sorted array: startup time, Python heap used per worker
+and lookup latency. Runs on the shipped dictionary and on a synthetic
+one of --entries words, about the size of the full CMUdict.
+
+Usage: python benchmarks/bench_pronunciation.py [--entries 135000] [--lookups 200000]
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from utils.pronunciation import (CONSONANTS, SOURCE_FILE, VOWELS, PronunciationDictionary,  # noqa: E402
+                                 parse_source, write_dictionary)
+
+
+def synthetic_source(path, entries, rng):
+    words = set()
+    with open(path, 'w', encoding='utf-8') as file:
+        while len(words) < entries:
+            word = ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 14)))
+            if word in words:
+                continue
+            words.add(word)
+            phonemes = []
+            for _ in range(rng.randint(1, 4)):
+                phonemes += [rng.choice(CONSONANTS), rng.choice(VOWELS) + rng.choice('012')]
+            file.write(f"{word} {' '.join(phonemes)}\n")
+
+
+def measure(source, lookups, rng):
+    with open(source, 'r', encoding='utf-8') as file:
+        words = list(parse_source(file))
+    queries = [rng.choice(words) if rng.random() < 0.8 else rng.choice(words) + 'zq' for _ in range(lookups)]
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    with open(source, 'r', encoding='utf-8') as file:
+        table = parse_source(file)
+    dict_load = time.perf_counter() - start
+    dict_heap = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    start = time.perf_counter()
+    for word in queries:
+        table.get(word)
+    dict_lookup = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'dictionary.bin')
+        write_dictionary(source, path)
+        tracemalloc.start()
+        start = time.perf_counter()
+        dictionary = PronunciationDictionary(path, source)
+        len(dictionary)
+        mmap_load = time.perf_counter() - start
+        mmap_heap = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        start = time.perf_counter()
+        for word in queries:
+            dictionary.lookup(word)
+        mmap_lookup = time.perf_counter() - start
+        assert all(dictionary.lookup(word) == table.get(word) for word in queries[:2000])
+        size = os.path.getsize(path)
+
+    print(f"  {len(words)} words, compiled file {size / 1024:.0f} KB")
+    print(f"  {'':>14} | {'startup (ms)':>12} | {'heap per worker (KB)':>20} | {'lookup (us)':>11}")
+    print(f"  {'dict':>14} | {dict_load * 1000:>12.1f} | {dict_heap / 1024:>20.0f} | {dict_lookup / lookups * 1e6:>11.2f}")
+    print(f"  {'mmap array':>14} | {mmap_load * 1000:>12.1f} | {mmap_heap / 1024:>20.0f} | {mmap_lookup / lookups * 1e6:>11.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--entries', type=int, default=135000)
+    parser.add_argument('--lookups', type=int, default=200000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    print(f"Shipped dictionary ({SOURCE_FILE}):")
+    measure(os.path.join(REPO_ROOT, SOURCE_FILE), args.lookups, rng)
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'dictionary.txt')
+        synthetic_source(source, args.entries, rng)
+        print(f"Synthetic dictionary ({args.entries} words):")
+        measure(source, args.lookups, rng)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark: T5 simplification throughput with and without micro-batching.
+
+Runs N concurrent client threads against AIHelpers-style generation,
+once calling the pipeline directly per request and once through
+ai_helpers.InferenceScheduler. By default a synthetic pipeline is used
+whose cost is a fixed per-call overhead plus a smaller per-item cost,
+which is roughly how CPU seq2seq generation behaves; pass --real to use
+the configured transformers model instead.
+
+Usage: python benchmarks/bench_t5_batching.py [--clients 32] [--requests 256] [--real]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from ai_helpers import InferenceScheduler  # noqa: E402
+
+SAMPLE_TEXT = ("The enormous committee will subsequently demonstrate that the "
+               "proposal is necessary, because the funding is approximately sufficient.")
+
+
+class SyntheticPipeline:
+    """Stand-in for a text2text pipeline with batch-friendly cost"""
+
+    def __init__(self, call_overhead_ms=40.0, per_item_ms=6.0):
+        self.call_overhead = call_overhead_ms / 1000.0
+        self.per_item = per_item_ms / 1000.0
+        self.lock = threading.Lock()  # one forward pass at a time, like a CPU model
+
+    def __call__(self, prompts, **kwargs):
+        batch = prompts if isinstance(prompts, list) else [prompts]
+        with self.lock:
+            time.sleep(self.call_overhead + self.per_item * len(batch))
+        outputs = [{'generated_text': prompt[len('simplify: '):]} for prompt in batch]
+        return outputs
+
+
+def run(clients, total_requests, call):
+    latencies = []
+    lock = threading.Lock()
+    counter = iter(range(total_requests))
+
+    def client():
+        while True:
+            with lock:
+                if next(counter, None) is None:
+                    return
+            start = time.perf_counter()
+            call()
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'throughput': total_requests / elapsed,
+        'p50_ms': latencies[len(latencies) // 2] * 1000,
+        'p95_ms': latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=256)
+    parser.add_argument('--window-ms', type=float, default=20)
+    parser.add_argument('--max-batch', type=int, default=16)
+    parser.add_argument('--real', action='store_true', help='use the transformers model from config.Config')
+    args = parser.parse_args()
+
+    if args.real:
+        from config import Config
+        from ai_helpers import model_registry
+        config = {k: getattr(Config, k) for k in dir(Config) if k.isupper()}
+        pipeline = model_registry.get_pipeline(config)
+        if pipeline is None:
+            sys.exit(f"Model failed to load: {model_registry.error}")
+    else:
+        pipeline = SyntheticPipeline()
+
+    prompt = f'simplify: {SAMPLE_TEXT}'
+    settings = {'max_length': 64, 'num_return_sequences': 1, 'do_sample': False}
+    scheduler = InferenceScheduler(window_ms=args.window_ms, max_batch_size=args.max_batch)
+
+    direct = run(args.clients, args.requests, lambda: pipeline(prompt, **settings))
+    batched = run(args.clients, args.requests, lambda: scheduler.generate(pipeline, prompt, settings))
+
+    print(f"{'mode':<10} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9}")
+    for name, result in (('direct', direct), ('batched', batched)):
+        print(f"{name:<10} {result['throughput']:>8.1f} {result['p50_ms']:>9.1f} {result['p95_ms']:>9.1f}")
+    print('batch sizes:', scheduler.stats()['batch_size_histogram'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,214 @@
+"""
+Benchmark: text analysis for /dyslexia/simplify and /reader/simplify.
+
+Times the previous analysis code (DyslexiaAI.analyze_text plus
+AIHelpers.annotate_text, each tokenizing separately and counting
+syllables per use) against one utils.text_analysis.TextAnalysis pass
+that produces both payloads, on documents of increasing length. The
+last column is the engine with the fast tokenizer (utils.tokenizer)
+instead of NLTK.
+
+The legacy side keeps the old length/syllable rule for difficult words,
+while the engine uses the word table rule (utils.word_frequency), so
+the payloads differ in the difficult word fields. The benchmark lists
+the payload fields that differ, and for the sample passage the words
+each rule flags, so the behaviour change is visible next to the timings.
+
+Both sides take syllable counts from the pronunciation dictionary
+(utils.pronunciation) where it knows the word.
+
+If the NLTK punkt model is not installed, both sides use an untrained
+PunktSentenceTokenizer so the comparison stays like for like.
+
+Usage: python benchmarks/bench_text_analysis.py [--repeat 3]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import nltk  # noqa: E402
+import nltk.tokenize  # noqa: E402
+
+try:
+    nltk.data.find('tokenizers/punkt')
+except LookupError:
+    print("punkt model not installed; using an untrained PunktSentenceTokenizer")
+    _punkt = nltk.tokenize.PunktSentenceTokenizer()
+    nltk.tokenize.sent_tokenize = lambda text, language='english': _punkt.tokenize(text)
+
+from nltk.tokenize import sent_tokenize, word_tokenize  # noqa: E402
+from utils import tokenizer  # noqa: E402
+from utils.pronunciation import pronunciations  # noqa: E402
+from utils.text_analysis import TextAnalysis  # noqa: E402
+
+SIZES = [1_000, 10_000, 100_000, 500_000]
+PASSAGE = ("The enormous committee will subsequently demonstrate that the proposal is necessary. "
+           "Dr. Smith said it was approximately sufficient, although the funding remains uncertain! "
+           "Do readers understand the extraordinary responsibilities involved? "
+           "Many children enjoy reading stories about animals, adventures and friendship. ")
+
+
+def legacy_count_syllables(word):
+    syllables = pronunciations.syllables(word)
+    if syllables:
+        return syllables
+    word = word.lower()
+    vowels = 'aeiouy'
+    syllable_count = 0
+    prev_was_vowel = False
+    for char in word:
+        is_vowel = char in vowels
+        if is_vowel and not prev_was_vowel:
+            syllable_count += 1
+        prev_was_vowel = is_vowel
+    if word.endswith('e') and syllable_count > 1:
+        syllable_count -= 1
+    return max(1, syllable_count)
+
+
+def legacy_readability(avg_sentence_length, avg_syllables):
+    score = 206.835 - (1.015 * avg_sentence_length) - (84.6 * avg_syllables)
+    for threshold, label in ((90, 'Very Easy'), (80, 'Easy'), (70, 'Fairly Easy'), (60, 'Standard'),
+                             (50, 'Fairly Difficult'), (30, 'Difficult')):
+        if score >= threshold:
+            return label
+    return 'Very Difficult'
+
+
+def legacy_analyze_text(text):
+    """The old DyslexiaAI.analyze_text"""
+    words = word_tokenize(text)
+    sentences = sent_tokenize(text)
+    actual_words = [word for word in words if word.isalnum()]
+    avg_word_length = sum(len(word) for word in actual_words) / len(actual_words) if actual_words else 0
+    avg_sentence_length = len(actual_words) / len(sentences) if sentences else 0
+    total_syllables = sum(legacy_count_syllables(word) for word in actual_words)
+    avg_syllables = total_syllables / len(actual_words) if actual_words else 0
+    difficulty = 'Easy'
+    if avg_word_length > 6 or avg_sentence_length > 15 or avg_syllables > 2:
+        difficulty = 'Hard'
+    elif avg_word_length > 4 or avg_sentence_length > 10 or avg_syllables > 1.5:
+        difficulty = 'Medium'
+    difficult_words = []
+    for word in actual_words:
+        if len(word) > 7 or legacy_count_syllables(word) > 3:
+            difficult_words.append({'word': word, 'syllables': legacy_count_syllables(word), 'length': len(word)})
+    return {
+        'word_count': len(actual_words),
+        'sentence_count': len(sentences),
+        'avg_word_length': round(avg_word_length, 2),
+        'avg_sentence_length': round(avg_sentence_length, 2),
+        'avg_syllables': round(avg_syllables, 2),
+        'difficulty': difficulty,
+        'difficult_words': difficult_words[:10],
+        'readability_score': legacy_readability(avg_sentence_length, avg_syllables)
+    }
+
+
+def legacy_annotate_text(text):
+    """The old AIHelpers.annotate_text with _estimate_reading_level"""
+    words = word_tokenize(text)
+    annotations = {}
+    for word in words:
+        clean_word = re.sub(r'[^\w]', '', word.lower())
+        if len(clean_word) > 7:
+            annotations[word] = {
+                'syllables': legacy_count_syllables(clean_word),
+                'difficulty': 'hard' if len(clean_word) > 10 else 'medium'
+            }
+    sentences = sent_tokenize(text)
+    level_words = word_tokenize(text)
+    avg_sentence_length = len(level_words) / len(sentences) if sentences else 0
+    avg_word_length = sum(len(word) for word in level_words) / len(level_words) if level_words else 0
+    if avg_sentence_length < 10 and avg_word_length < 5:
+        reading_level = 'Easy'
+    elif avg_sentence_length < 15 and avg_word_length < 6:
+        reading_level = 'Medium'
+    else:
+        reading_level = 'Hard'
+    return {'text': text, 'annotations': annotations, 'word_count': len(words), 'reading_level': reading_level}
+
+
+def legacy(text):
+    return legacy_analyze_text(text), legacy_annotate_text(text)
+
+
+def engine(text):
+    analysis = TextAnalysis(text)
+    return analysis.summary(), analysis.annotation_payload()
+
+
+def make_document(size, rng):
+    sentences = [s + '.' for s in PASSAGE.split('. ') if s]
+    parts = []
+    length = 0
+    while length < size:
+        sentence = rng.choice(sentences)
+        parts.append(sentence)
+        length += len(sentence) + 1
+    return ' '.join(parts)
+
+
+def timed(fn, text, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def changed_fields(old, new):
+    """Payload fields whose values differ between the legacy and engine output"""
+    changed = []
+    for name, old_part, new_part in (('analysis', old[0], new[0]), ('annotate', old[1], new[1])):
+        for key in sorted(old_part.keys() | new_part.keys()):
+            if old_part.get(key) != new_part.get(key):
+                changed.append(f'{name}.{key}')
+    return changed
+
+
+def report_rule_change(text):
+    """Print what the word table rule changes in the payloads for one text"""
+    old, new = legacy(text), engine(text)
+    print(f"Sample passage, fields that differ: {', '.join(changed_fields(old, new)) or 'none'}")
+    old_words = set(old[1]['annotations'])
+    new_words = set(new[1]['annotations'])
+    print(f"  difficult, old rule only:  {' '.join(sorted(old_words - new_words)) or '-'}")
+    print(f"  difficult, word table only: {' '.join(sorted(new_words - old_words)) or '-'}")
+    print(f"  difficult, both:            {' '.join(sorted(old_words & new_words)) or '-'}")
+    print(f"  difficulty label: {old[0]['difficulty']} -> {new[0]['difficulty']}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    # Same tokenizer on both sides so only the difficult word rule can differ
+    tokenizer.configure('nltk')
+    report_rule_change(PASSAGE)
+
+    rng = random.Random(7)
+    print(f"{'chars':>9} | {'legacy (ms)':>12} | {'engine (ms)':>12} | {'speedup':>7} "
+          f"| {'engine, fast tokenizer (ms)':>27} | fields that differ")
+    for size in SIZES:
+        text = make_document(size, rng)
+        tokenizer.configure('nltk')
+        changed = changed_fields(legacy(text), engine(text))
+        old = timed(legacy, text, args.repeat)
+        new = timed(engine, text, args.repeat)
+        tokenizer.configure('fast')
+        fast = timed(engine, text, args.repeat)
+        print(f"{len(text):>9} | {old * 1000:>12.1f} | {new * 1000:>12.1f} | {old / new:>6.1f}x "
+              f"| {fast * 1000:>27.1f} | {', '.join(changed) or 'none'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark: concurrent MediaPipe Pose inference with one shared graph vs a pool.
+
+Runs --threads request threads, each processing --frames frames, first
+through one graph behind a lock (what a threaded worker needs without a
+pool) and then through utils.tracker_pool.TrackerPool graphs of
+increasing size. Reports frames per second and the pool's wait time and
+utilization. Throughput can only scale up to the number of CPU cores.
+
+Usage: python benchmarks/bench_vision_pool.py [--threads 8] [--frames 20]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import mediapipe as mp  # noqa: E402
+import numpy as np  # noqa: E402
+from utils.tracker_pool import TrackerPool  # noqa: E402
+
+
+def create_pose():
+    return mp.solutions.pose.Pose(static_image_mode=True, min_detection_confidence=0.7)
+
+
+def run(threads, frames, process):
+    rng = np.random.default_rng(7)
+    images = [rng.integers(0, 256, (480, 640, 3), dtype=np.uint8) for _ in range(4)]
+
+    def worker():
+        for i in range(frames):
+            process(images[i % len(images)])
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return threads * frames / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--frames', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{args.threads} threads x {args.frames} frames, {os.cpu_count()} CPUs")
+    print(f"{'graphs':>14} | {'frames/s':>8} | {'avg wait (ms)':>13} | {'max wait (ms)':>13} | {'utilization':>11}")
+
+    shared = create_pose()
+    shared.process(np.zeros((480, 640, 3), dtype=np.uint8))
+    lock = threading.Lock()
+
+    def process_shared(image):
+        with lock:
+            shared.process(image)
+
+    fps = run(args.threads, args.frames, process_shared)
+    print(f"{'1 shared+lock':>14} | {fps:>8.1f} | {'':>13} | {'':>13} | {'':>11}")
+
+    sizes = sorted({1, 2, 4, os.cpu_count() or 1, args.threads})
+    for size in [s for s in sizes if s <= args.threads]:
+        pool = TrackerPool(create_pose, size, reset=False)
+        # Create the graphs up front so only inference is timed
+        graphs = [pool.checkout() for _ in range(size)]
+        for graph in graphs:
+            graph.process(np.zeros((480, 640, 3), dtype=np.uint8))
+            pool.checkin(graph)
+
+        def process_pooled(image):
+            with pool.borrowed() as graph:
+                graph.process(image)
+
+        fps = run(args.threads, args.frames, process_pooled)
+        stats = pool.stats()
+        print(f"{f'pool of {size}':>14} | {fps:>8.1f} | {stats['avg_wait_ms']:>13.1f} | {stats['max_wait_ms']:>13.1f} | "
+              f"{stats['utilization']:>11.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark: word grade lookups for difficult-word detection.
+
+Compares looking words up one at a time (a dict parsed from the source
+list, and WordTable.grade) with one vectorized WordTable.grades call per
+document, as utils.text_analysis.TextAnalysis does. Reports the cost per
+100 words on documents of increasing length.
+
+Usage: python benchmarks/bench_word_table.py [--repeat 5]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from utils.word_frequency import SOURCE_FILE, parse_source, word_table  # noqa: E402
+
+SIZES = [100, 1_000, 5_000, 50_000]
+
+
+def timed(fn, words, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(words)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with open(os.path.join(REPO_ROOT, SOURCE_FILE), 'r', encoding='utf-8') as file:
+        entries = parse_source(file)
+    grades = {word: grade for word, (_, grade) in entries.items()}
+    vocabulary = list(entries)
+    rng = random.Random(7)
+    len(word_table)
+
+    print(f"{len(word_table)} words in the table")
+    print(f"{'words':>7} | {'dict (ms/100)':>13} | {'per word (ms/100)':>17} | {'vectorized (ms/100)':>19}")
+    for size in SIZES:
+        # Mostly known words with some misses, like running text
+        words = [rng.choice(vocabulary) if rng.random() < 0.85 else rng.choice(vocabulary) + 'qz'
+                 for _ in range(size)]
+        assert word_table.grades(words) == [grades.get(word, 0) for word in words]
+        per_dict = timed(lambda batch: [grades.get(word, 0) for word in batch], words, args.repeat)
+        per_word = timed(lambda batch: [word_table.grade(word) for word in batch], words, args.repeat)
+        vectorized = timed(word_table.grades, words, args.repeat)
+        scale = 100 * 1000 / size
+        print(f"{size:>7} | {per_dict * scale:>13.3f} | {per_word * scale:>17.3f} | {vectorized * scale:>19.3f}")
+
+
+if __name__ == '__main__':
+    main()
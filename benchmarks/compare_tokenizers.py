@@ -0,0 +1,117 @@
+"""
+Golden-corpus check and speed comparison for utils.tokenizer.
+
+For every passage in data/tokenizer/golden_corpus.json it compares:
+
+* fast sentence splitting against the expected sentences;
+* fast word tokens against NLTK's Treebank tokenizer, per sentence;
+* when the punkt model is installed, punkt against the expected
+  sentences and against the fast splitter.
+
+It then times sentence + word tokenization of the whole corpus in both
+modes (with an untrained punkt if the model is missing). It exits
+non-zero if fast-mode agreement drops below --min-agreement.
+
+Usage: python benchmarks/compare_tokenizers.py [--repeat 200] [--min-agreement 0.95] [--verbose]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import nltk  # noqa: E402
+from nltk.tokenize import PunktSentenceTokenizer  # noqa: E402
+from nltk.tokenize.destructive import NLTKWordTokenizer  # noqa: E402
+
+from utils.tokenizer import FastSentenceTokenizer, fast_word_tokenize  # noqa: E402
+
+CORPUS = os.path.join(REPO_ROOT, 'data', 'tokenizer', 'golden_corpus.json')
+
+
+def load_punkt():
+    try:
+        nltk.data.find('tokenizers/punkt')
+    except LookupError:
+        return None
+    return nltk.tokenize.sent_tokenize
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--min-agreement', type=float, default=0.95)
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    with open(CORPUS, 'r', encoding='utf-8') as file:
+        corpus = json.load(file)
+
+    fast_sentences = FastSentenceTokenizer()
+    treebank = NLTKWordTokenizer()
+    punkt = load_punkt()
+
+    sentence_hits = 0
+    word_hits = word_total = 0
+    punkt_golden = punkt_fast = 0
+    for item in corpus:
+        got = fast_sentences.tokenize(item['text'])
+        if got == item['sentences']:
+            sentence_hits += 1
+        elif args.verbose:
+            print(f"SENTENCES differ:\n  expected {item['sentences']}\n  fast     {got}")
+
+        for sentence in item['sentences']:
+            word_total += 1
+            expected_words = treebank.tokenize(sentence)
+            fast_words = fast_word_tokenize(sentence)
+            if fast_words == expected_words:
+                word_hits += 1
+            elif args.verbose:
+                print(f"WORDS differ:\n  treebank {expected_words}\n  fast     {fast_words}")
+
+        if punkt:
+            reference = punkt(item['text'])
+            punkt_golden += reference == item['sentences']
+            punkt_fast += reference == got
+
+    sentence_agreement = sentence_hits / len(corpus)
+    word_agreement = word_hits / word_total
+    print(f"Passages: {len(corpus)}, sentences: {word_total}")
+    print(f"Fast sentence splits matching golden: {sentence_hits}/{len(corpus)} ({sentence_agreement:.0%})")
+    print(f"Fast word tokens matching Treebank:   {word_hits}/{word_total} ({word_agreement:.0%})")
+    if punkt:
+        print(f"punkt matching golden:                {punkt_golden}/{len(corpus)}")
+        print(f"Fast matching punkt:                  {punkt_fast}/{len(corpus)}")
+    else:
+        print("punkt model not installed; skipping punkt comparison (timing uses an untrained punkt)")
+
+    text = ' '.join(item['text'] for item in corpus)
+    reference_sentences = punkt or PunktSentenceTokenizer().tokenize
+
+    def nltk_mode():
+        return [token for sentence in reference_sentences(text) for token in treebank.tokenize(sentence)]
+
+    def fast_mode():
+        return [token for sentence in fast_sentences.tokenize(text) for token in fast_word_tokenize(sentence)]
+
+    timings = {}
+    for name, fn in (('nltk', nltk_mode), ('fast', fast_mode)):
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            fn()
+        timings[name] = (time.perf_counter() - start) / args.repeat
+    print(f"\nPer corpus pass ({len(text)} chars): nltk {timings['nltk'] * 1000:.2f} ms, "
+          f"fast {timings['fast'] * 1000:.2f} ms ({timings['nltk'] / timings['fast']:.1f}x faster)")
+
+    if min(sentence_agreement, word_agreement) < args.min_agreement:
+        print(f"Agreement below {args.min_agreement:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
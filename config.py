@@ -28,6 +28,85 @@ class Config:
     AI_MODEL_NAME = "google/flan-t5-small"
     USE_LOCAL_MODELS = True
     MODEL_CACHE_DIR = "data/ai_models"
+    # Load and warm up the model when the worker boots instead of on first request
+    AI_PRELOAD_MODEL = os.environ.get('AI_PRELOAD_MODEL', 'False').lower() == 'true'
+    AI_DO_SAMPLE = True
+    
+    # Sentence/word tokenizer: 'fast' (bundled regex tokenizer, works offline) or 'nltk' (punkt)
+    TOKENIZER = os.environ.get('TOKENIZER', 'fast')
+    
+    # Unix socket of a shared model server (python model_server.py); empty loads models in-process
+    MODEL_SERVER_SOCKET = os.environ.get('MODEL_SERVER_SOCKET', '')
+    # Seconds before reconnecting to an unreachable model server; doubles per failure up to the max
+    MODEL_SERVER_RETRY_MIN = 1.0
+    MODEL_SERVER_RETRY_MAX = 60.0
+    
+    # Micro-batching of concurrent model calls (useful with threaded workers)
+    AI_BATCHING_ENABLED = os.environ.get('AI_BATCHING_ENABLED', 'False').lower() == 'true'
+    AI_BATCH_WINDOW_MS = int(os.environ.get('AI_BATCH_WINDOW_MS', 20))
+    AI_MAX_BATCH_SIZE = int(os.environ.get('AI_MAX_BATCH_SIZE', 8))
+    
+    # Simplification result cache (memory LRU + shared on-disk tier)
+    SIMPLIFY_CACHE_ENABLED = os.environ.get('SIMPLIFY_CACHE_ENABLED', 'True').lower() == 'true'
+    SIMPLIFY_CACHE_DIR = "data/ai_models/simplify_cache"
+    SIMPLIFY_CACHE_MEMORY_ENTRIES = 512
+    SIMPLIFY_CACHE_TTL = 7 * 24 * 3600  # seconds
+    SIMPLIFY_CACHE_MAX_DISK_MB = 100
+    AI_DETERMINISTIC_WHEN_CACHED = True  # Use greedy decoding so cached results are reproducible
+    
+    # Two-phase simplify: rule-based answer now, model upgrade in the background
+    SIMPLIFY_UPGRADE_DIR = 'data/jobs/upgrades'
+    SIMPLIFY_UPGRADE_WORKERS = 2
+    SIMPLIFY_UPGRADE_MAX_PENDING = 16
+    SIMPLIFY_UPGRADE_TIMEOUT = float(os.environ.get('SIMPLIFY_UPGRADE_TIMEOUT', 10))  # seconds
+    SIMPLIFY_UPGRADE_TTL = 300  # seconds a finished result stays available
+    
+    # Batch text analysis (/dyslexia/analyze-batch) across worker processes
+    BATCH_ANALYSIS_WORKERS = int(os.environ.get('BATCH_ANALYSIS_WORKERS', 0)) or None  # None: one per CPU
+    BATCH_ANALYSIS_MAX_ITEMS = 200
+    BATCH_ANALYSIS_INLINE_CHARS = 20000  # Smaller batches are analyzed in-process
+    BATCH_ANALYSIS_START_METHOD = os.environ.get('BATCH_ANALYSIS_START_METHOD')  # None: forkserver (spawn where unavailable)
+    
+    # Background simplification of long documents (/dyslexia/jobs)
+    DOCUMENT_JOBS_DIR = 'data/jobs'
+    DOCUMENT_JOBS_WORKERS = 1
+    DOCUMENT_JOBS_MAX_PENDING = 8  # Queued or running jobs per process
+    DOCUMENT_JOB_CHUNK_CHARS = 2000
+    DOCUMENT_JOBS_TTL = 7 * 24 * 3600  # seconds a finished job is kept
+    DOCUMENT_JOBS_RESUME = True  # Resume interrupted jobs on this process's first request
+    
+    # Largest phonics question set one request may ask for
+    PHONICS_MAX_QUESTIONS = 50
+    # Server-side game instances awaiting /dyslexia/games/submit
+    GAMES_DIR = 'data/games'
+    GAME_TTL = 3600  # seconds
+    GAME_MAX_PER_OWNER = 20  # a user's oldest games are dropped beyond this
+    
+    # MediaPipe graphs per worker for single-frame requests (checked out one request at a time)
+    VISION_POOL_SIZE = int(os.environ.get('VISION_POOL_SIZE', 0)) or os.cpu_count() or 1
+    VISION_POOL_WAIT_TIMEOUT = 5  # seconds a request waits for a free graph
+    VISION_POOL_IDLE_TIMEOUT = 300  # seconds before an unused graph is closed
+    
+    # Threads per gunicorn worker: Procfile, start.sh and render.yaml pass --threads=${WEB_THREADS:-8}
+    WEB_THREADS = int(os.environ.get('WEB_THREADS', 8))
+    
+    # Camera streaming over WebSocket (/dyspraxia/stream, needs flask-sock). Each open stream
+    # holds one of the WEB_THREADS threads for its whole life, so streams are capped at
+    # WEB_THREADS - VISION_STREAM_RESERVED_THREADS; the reserved threads keep serving login,
+    # /health and the frame uploads a refused stream falls back to
+    VISION_STREAM_RESERVED_THREADS = 4
+    VISION_STREAM_MAX_SESSIONS = max(0, min(int(os.environ.get('VISION_STREAM_MAX_SESSIONS', 4)),
+                                            WEB_THREADS - VISION_STREAM_RESERVED_THREADS))  # per worker
+    VISION_STREAM_IDLE_TIMEOUT = 30  # seconds without a frame before a stream is closed
     
     # TTS Configuration
-    TTS_ENGINE = 'browser'  # Use browser's built-in TTS for now
+    # 'browser' leaves speech to the client, 'espeak' renders audio on the server (set
+    # TTS_ENGINE=espeak where espeak is installed), 'stub' produces placeholder tones for tests
+    TTS_ENGINE = os.environ.get('TTS_ENGINE', 'browser')
+    TTS_VOICE = os.environ.get('TTS_VOICE', 'en')
+    TTS_RATE = 140  # words per minute, slower than espeak's default for dyslexic readers
+    TTS_PITCH = 50
+    TTS_WORKERS = 2
+    TTS_CACHE_DIR = 'data/tts_cache'
+    TTS_CACHE_MAX_MB = 200
+    TTS_MAX_SENTENCES = 40  # Rendered per request; the browser speaks the rest
@@ -0,0 +1,244 @@
+"""
+Local model server shared by all web workers.
+
+Hosts the T5 simplification pipeline and the MediaPipe Hands/Pose graphs
+in one process and serves them over a Unix domain socket, so gunicorn
+workers only need the small client stubs below instead of their own copy
+of torch/transformers and MediaPipe.
+
+Run it next to the web app and point the workers at it:
+
+    python model_server.py --socket /tmp/cogno-models.sock
+    MODEL_SERVER_SOCKET=/tmp/cogno-models.sock gunicorn wsgi:app
+
+Use --fake to serve a lightweight fake backend for local testing.
+
+Wire format: every message is a 4-byte big-endian length followed by a
+UTF-8 JSON object. Requests are {"method": ..., "params": {...}};
+replies are {"result": ...} or {"error": "..."}. Landmarks travel in the
+packed float32 form of utils.landmarks.
+"""
+import argparse
+import json
+import os
+import socket
+import socketserver
+import struct
+import sys
+import threading
+
+from utils.landmarks import HAND_FIELDS, POSE_FIELDS, pack_landmarks
+
+_LENGTH = struct.Struct('>I')
+
+
+def send_message(sock, message):
+    data = json.dumps(message).encode('utf-8')
+    sock.sendall(_LENGTH.pack(len(data)) + data)
+
+
+def _recv_exact(sock, size):
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            raise ConnectionError('Model server connection closed')
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def recv_message(sock):
+    (size,) = _LENGTH.unpack(_recv_exact(sock, _LENGTH.size))
+    return json.loads(_recv_exact(sock, size).decode('utf-8'))
+
+
+# --- Client side -----------------------------------------------------------
+
+class ModelServerClient:
+    """Blocking client with one connection per calling thread"""
+
+    def __init__(self, socket_path, timeout=30.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.local = threading.local()
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.local.sock = sock
+        return sock
+
+    def call(self, method, **params):
+        """Invoke a backend method.
+
+        Sending on a kept-alive connection the server has since closed is
+        retried once on a new connection. Failures after the request went
+        out, timeouts included, are not: the server may still be running it.
+        """
+        sock = getattr(self.local, 'sock', None)
+        try:
+            if sock is not None:
+                try:
+                    send_message(sock, {'method': method, 'params': params})
+                except socket.timeout:
+                    raise
+                except OSError:
+                    sock.close()
+                    sock = None
+            if sock is None:
+                sock = self._connect()
+                send_message(sock, {'method': method, 'params': params})
+            reply = recv_message(sock)
+        except OSError:
+            if sock is not None:
+                sock.close()
+            self.local.sock = None
+            raise
+        if 'error' in reply:
+            raise RuntimeError(f"Model server error in {method}: {reply['error']}")
+        return reply['result']
+
+
+class RemotePipeline:
+    """Callable with the text2text pipeline interface, backed by the server"""
+
+    def __init__(self, client):
+        self.client = client
+
+    def __call__(self, prompts, **settings):
+        settings.pop('batch_size', None)
+        if isinstance(prompts, str):
+            prompts = [prompts]
+        outputs = self.client.call('generate', prompts=list(prompts), settings=settings)
+        return [{'generated_text': text} for text in outputs]
+
+
+# --- Server side -----------------------------------------------------------
+
+class ModelBackend:
+    """Real models: the shared T5 pipeline and one DyspraxiaAI"""
+
+    def __init__(self, config):
+        from ai_helpers import model_registry, inference_scheduler
+        from modules.dyspraxia import DyspraxiaAI
+
+        self.config = config
+        self.scheduler = inference_scheduler
+        self.pipeline = model_registry.get_pipeline(config)
+        if self.pipeline is None:
+            print(f"T5 pipeline unavailable: {model_registry.error}")
+        self.dyspraxia = DyspraxiaAI()  # Borrows a graph per call from its pools, so calls run in parallel
+
+    def generate(self, prompts, settings):
+        if self.pipeline is None:
+            raise RuntimeError('T5 pipeline is not loaded')
+        if len(prompts) == 1 and self.config.get('AI_BATCHING_ENABLED'):
+            # Requests from different web workers batch together here
+            return [self.scheduler.generate(self.pipeline, prompts[0], settings)]
+        outputs = self.pipeline(prompts if len(prompts) > 1 else prompts[0], **settings)
+        return [(output[0] if isinstance(output, list) else output)['generated_text'] for output in outputs]
+
+    def detect_hand_landmarks(self, frame, draw=True):
+        landmarks, gesture, img = self.dyspraxia.detect_hand_landmarks(frame, draw=draw)
+        return {'landmarks': pack_landmarks(landmarks, HAND_FIELDS), 'gesture': gesture, 'image': _encode_image(img)}
+
+    def detect_pose_landmarks(self, frame, draw=True):
+        landmarks, img = self.dyspraxia.detect_pose_landmarks(frame, draw=draw)
+        return {'landmarks': pack_landmarks(landmarks, POSE_FIELDS), 'image': _encode_image(img)}
+
+    def ping(self):
+        return {'backend': 'models', 't5': self.pipeline is not None}
+
+
+class FakeBackend:
+    """Deterministic stand-in so the client path can be tested without models"""
+
+    def generate(self, prompts, settings):
+        return [prompt.split(':', 1)[-1].strip() for prompt in prompts]
+
+    def detect_hand_landmarks(self, frame, draw=True):
+        # An open hand: every fingertip above its middle joint
+        landmarks = [{'x': 0.5 + 0.01 * i, 'y': 0.8 - 0.03 * i, 'z': 0.0} for i in range(21)]
+        return {'landmarks': pack_landmarks(landmarks, HAND_FIELDS), 'gesture': 'paper', 'image': frame if draw else None}
+
+    def detect_pose_landmarks(self, frame, draw=True):
+        landmarks = [{'x': 0.5, 'y': i / 33.0, 'z': 0.0, 'visibility': 1.0} for i in range(33)]
+        return {'landmarks': pack_landmarks(landmarks, POSE_FIELDS), 'image': frame if draw else None}
+
+    def ping(self):
+        return {'backend': 'fake'}
+
+
+def _encode_image(img):
+    if img is None:
+        return None
+    import base64
+    import cv2
+    _, buffer = cv2.imencode('.jpg', img)
+    return base64.b64encode(buffer).decode('utf-8')
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    METHODS = ('generate', 'detect_hand_landmarks', 'detect_pose_landmarks', 'ping')
+
+    def handle(self):
+        backend = self.server.backend
+        while True:
+            try:
+                request = recv_message(self.request)
+            except (ConnectionError, OSError):
+                return
+            method = request.get('method')
+            try:
+                if method not in self.METHODS:
+                    raise ValueError(f'Unknown method {method!r}')
+                reply = {'result': getattr(backend, method)(**request.get('params', {}))}
+            except Exception as e:
+                reply = {'error': str(e)}
+            send_message(self.request, reply)
+
+
+class ModelServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, backend):
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        super().__init__(socket_path, _Handler)
+        self.backend = backend
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Shared local model server')
+    parser.add_argument('--socket', default=os.environ.get('MODEL_SERVER_SOCKET') or '/tmp/cogno-models.sock')
+    parser.add_argument('--fake', action='store_true', help='serve the fake backend (no models loaded)')
+    args = parser.parse_args()
+
+    # This process hosts the models itself; never proxy to another server
+    os.environ['MODEL_SERVER_SOCKET'] = ''
+
+    if args.fake:
+        backend = FakeBackend()
+    else:
+        from config import Config
+        config = {key: getattr(Config, key) for key in dir(Config) if key.isupper()}
+        config['MODEL_SERVER_SOCKET'] = ''
+        backend = ModelBackend(config)
+
+    server = ModelServer(args.socket, backend)
+    print(f"Model server ({type(backend).__name__}) listening on {args.socket}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(args.socket):
+            os.remove(args.socket)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -156,7 +156,7 @@ def profile():
     if 'user_id' not in session:
         return redirect(url_for('auth.login'))
     
-    users = file_manager.read_csv('data/users/users.csv')
-    user = next((u for u in users if u['id'] == session['user_id']), None)
+    users = file_manager.read_user_rows('data/users/users.csv', session['user_id'], key='id')
+    user = users[0] if users else None
     
     return render_template('auth/profile.html', user=user)
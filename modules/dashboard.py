@@ -1,5 +1,6 @@
 from flask import Blueprint, render_template, request, jsonify, session, redirect, url_for
 from utils.file_manager import file_manager
+from utils.aggregate_store import aggregate_store
 import pandas as pd
 from datetime import datetime, timedelta
 import json
@@ -171,14 +172,8 @@ def get_dashboard_data():
     
     user_id = session['user_id']
     
-    # Collect data from all modules
-    data = {
-        'dyslexia': get_dyslexia_progress(user_id),
-        'dyscalculia': get_dyscalculia_progress(user_id),
-        'dysgraphia': get_dysgraphia_progress(user_id),
-        'dyspraxia': get_dyspraxia_progress(user_id),
-        'overall_stats': get_overall_stats(user_id)
-    }
+    # Collect data from all modules (materialized, updated on every write)
+    data = get_user_progress(user_id)
     
     # Generate AI recommendations
     recommendations = dashboard_ai.generate_ai_recommendations(data)
@@ -222,149 +217,54 @@ def get_activity_report(activity_id):
     except Exception as e:
         return jsonify({'success': False, 'message': f'Error generating report: {str(e)}'})
 
+def get_user_progress(user_id):
+    """Collect dashboard data for all modules from the materialized totals"""
+    return aggregate_store.get(user_id).dashboard_data()
+
 def get_dyslexia_progress(user_id):
     """Get dyslexia progress data"""
-    progress_data = file_manager.read_csv('data/dyslexia/progress.csv')
-    games_data = file_manager.read_csv('data/dyslexia/games.csv')
-    
-    user_progress = [p for p in progress_data if p['user_id'] == user_id]
-    user_games = [g for g in games_data if g['user_id'] == user_id]
-    
-    # Calculate average accuracy
-    total_accuracy = sum(float(g.get('accuracy', 0)) for g in user_games)
-    avg_accuracy = total_accuracy / len(user_games) if user_games else 0
-    
-    return {
-        'total_sessions': len(user_progress),
-        'total_games': len(user_games),
-        'avg_accuracy': round(avg_accuracy, 1),
-        'recent_activity': user_progress[-5:] if user_progress else []
-    }
+    return get_user_progress(user_id)['dyslexia']
 
 def get_dyscalculia_progress(user_id):
     """Get dyscalculia progress data"""
-    progress_data = file_manager.read_csv('data/dyscalculia/progress.csv')
-    user_progress = [p for p in progress_data if p['user_id'] == user_id]
-    
-    correct_answers = len([p for p in user_progress if p.get('correct') == 'True'])
-    total_answers = len(user_progress)
-    
-    return {
-        'total_problems': total_answers,
-        'correct_answers': correct_answers,
-        'accuracy': (correct_answers / total_answers * 100) if total_answers > 0 else 0,
-        'recent_activity': user_progress[-5:] if user_progress else []
-    }
+    return get_user_progress(user_id)['dyscalculia']
 
 def get_dysgraphia_progress(user_id):
     """Get dysgraphia progress data"""
-    progress_data = file_manager.read_csv('data/dysgraphia/progress.csv')
-    user_progress = [p for p in progress_data if p['user_id'] == user_id]
-    
-    total_words = sum(int(p.get('word_count', 0)) for p in user_progress)
-    
-    return {
-        'total_sessions': len(user_progress),
-        'total_words_written': total_words,
-        'avg_words_per_session': total_words / len(user_progress) if user_progress else 0,
-        'recent_activity': user_progress[-5:] if user_progress else []
-    }
+    return get_user_progress(user_id)['dysgraphia']
 
 def get_dyspraxia_progress(user_id):
     """Get dyspraxia progress data"""
-    progress_data = file_manager.read_csv('data/dyspraxia/progress.csv')
-    user_progress = [p for p in progress_data if p['user_id'] == user_id]
-    
-    avg_stability = sum(float(p.get('stability_score', 0)) for p in user_progress) / len(user_progress) if user_progress else 0
-    
-    return {
-        'total_exercises': len(user_progress),
-        'avg_stability': round(avg_stability, 1),
-        'total_duration': sum(float(p.get('duration', 0)) for p in user_progress),
-        'recent_activity': user_progress[-5:] if user_progress else []
-    }
+    return get_user_progress(user_id)['dyspraxia']
 
 def get_overall_stats(user_id):
     """Get overall statistics across all modules"""
-    all_activities = 0
-    
-    for module in ['dyslexia', 'dyscalculia', 'dysgraphia', 'dyspraxia']:
-        progress_data = file_manager.read_csv(f'data/{module}/progress.csv')
-        user_activities = [p for p in progress_data if p['user_id'] == user_id]
-        all_activities += len(user_activities)
-    
-    return {
-        'total_activities': all_activities,
-        'active_days': calculate_active_days(user_id),
-        'streak': calculate_streak(user_id)
-    }
+    return get_user_progress(user_id)['overall_stats']
 
 def calculate_active_days(user_id):
     """Calculate number of active days"""
-    all_dates = set()
-    
-    for module in ['dyslexia', 'dyscalculia', 'dysgraphia', 'dyspraxia']:
-        progress_data = file_manager.read_csv(f'data/{module}/progress.csv')
-        user_activities = [p for p in progress_data if p['user_id'] == user_id]
-        
-        for activity in user_activities:
-            if 'timestamp' in activity:
-                date = activity['timestamp'].split('T')[0]
-                all_dates.add(date)
-    
-    return len(all_dates)
+    return get_overall_stats(user_id)['active_days']
 
 def calculate_streak(user_id):
     """Calculate current streak of consecutive days"""
-    all_dates = []
-    
-    for module in ['dyslexia', 'dyscalculia', 'dysgraphia', 'dyspraxia']:
-        progress_data = file_manager.read_csv(f'data/{module}/progress.csv')
-        user_activities = [p for p in progress_data if p['user_id'] == user_id]
-        
-        for activity in user_activities:
-            if 'timestamp' in activity:
-                date = activity['timestamp'].split('T')[0]
-                all_dates.append(date)
-    
-    if not all_dates:
-        return 0
-    
-    # Sort dates and find consecutive days
-    unique_dates = sorted(set(all_dates), reverse=True)
-    
-    if not unique_dates:
-        return 0
-    
-    streak = 1
-    current_date = datetime.strptime(unique_dates[0], '%Y-%m-%d').date()
-    
-    for i in range(1, len(unique_dates)):
-        prev_date = datetime.strptime(unique_dates[i], '%Y-%m-%d').date()
-        if (current_date - prev_date).days == 1:
-            streak += 1
-            current_date = prev_date
-        else:
-            break
-    
-    return streak
+    return get_overall_stats(user_id)['streak']
 
 def get_dyslexia_activity_report(user_id, timestamp):
     """Generate detailed report for dyslexia activity"""
-    progress_data = file_manager.read_csv('data/dyslexia/progress.csv')
-    games_data = file_manager.read_csv('data/dyslexia/games.csv')
+    progress_data = file_manager.read_user_rows('data/dyslexia/progress.csv', user_id)
     
     # Find specific activity
     activity = None
     for p in progress_data:
-        if p['user_id'] == user_id and timestamp in p.get('timestamp', ''):
+        if timestamp in p.get('timestamp', ''):
             activity = p
             break
     
     if not activity:
         # Try games data
+        games_data = file_manager.read_user_rows('data/dyslexia/games.csv', user_id)
         for g in games_data:
-            if g['user_id'] == user_id and timestamp in g.get('timestamp', ''):
+            if timestamp in g.get('timestamp', ''):
                 activity = g
                 break
     
@@ -427,11 +327,11 @@ def get_dyslexia_activity_report(user_id, timestamp):
 
 def get_dyscalculia_activity_report(user_id, timestamp):
     """Generate detailed report for dyscalculia activity"""
-    progress_data = file_manager.read_csv('data/dyscalculia/progress.csv')
+    progress_data = file_manager.read_user_rows('data/dyscalculia/progress.csv', user_id)
     
     activity = None
     for p in progress_data:
-        if p['user_id'] == user_id and timestamp in p.get('timestamp', ''):
+        if timestamp in p.get('timestamp', ''):
             activity = p
             break
     
@@ -468,11 +368,11 @@ def get_dyscalculia_activity_report(user_id, timestamp):
 
 def get_dysgraphia_activity_report(user_id, timestamp):
     """Generate detailed report for dysgraphia activity"""
-    progress_data = file_manager.read_csv('data/dysgraphia/progress.csv')
+    progress_data = file_manager.read_user_rows('data/dysgraphia/progress.csv', user_id)
     
     activity = None
     for p in progress_data:
-        if p['user_id'] == user_id and timestamp in p.get('timestamp', ''):
+        if timestamp in p.get('timestamp', ''):
             activity = p
             break
     
@@ -514,11 +414,11 @@ def get_dysgraphia_activity_report(user_id, timestamp):
 
 def get_dyspraxia_activity_report(user_id, timestamp):
     """Generate detailed report for dyspraxia activity"""
-    progress_data = file_manager.read_csv('data/dyspraxia/progress.csv')
+    progress_data = file_manager.read_user_rows('data/dyspraxia/progress.csv', user_id)
     
     activity = None
     for p in progress_data:
-        if p['user_id'] == user_id and timestamp in p.get('timestamp', ''):
+        if timestamp in p.get('timestamp', ''):
             activity = p
             break
     
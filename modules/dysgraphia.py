@@ -325,8 +325,7 @@ def writing_history():
     if 'user_id' not in session:
         return jsonify({'success': False, 'message': 'Not logged in'})
     
-    writings = file_manager.read_csv('data/dysgraphia/writings.csv')
-    user_writings = [w for w in writings if w['user_id'] == session['user_id']]
+    user_writings = file_manager.read_user_rows('data/dysgraphia/writings.csv', session['user_id'])
     
     # Sort by timestamp, most recent first
     user_writings.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
@@ -1,9 +1,19 @@
-from flask import Blueprint, render_template, request, jsonify, session, redirect, url_for
+from flask import Blueprint, render_template, request, jsonify, session, redirect, url_for, Response, stream_with_context, current_app, send_file
 from utils.file_manager import file_manager
+from utils.simplify_jobs import get_upgrade_jobs
+from utils.batch_analysis import get_batch_analyzer, read_uploads, BatchTooLarge
+from utils.document_jobs import get_document_jobs
+from utils.tts import get_tts_service
+from utils.phonics_bank import phonics_bank, DIFFICULTIES
+from utils.game_store import get_game_store
+from utils.lexicon import lexicon
+from utils.text_analysis import TextAnalysis, count_syllables, readability_label
+from utils.tokenizer import sent_tokenize
 import re
-import nltk
-from nltk.tokenize import sent_tokenize, word_tokenize
 import random
+import json
+import time
+from collections import Counter
 
 import os
 os.environ["TF_ENABLE_ONEDNN_OPTS"] = "0"
@@ -12,63 +22,9 @@ os.environ["TF_ENABLE_ONEDNN_OPTS"] = "0"
 
 dyslexia_bp = Blueprint('dyslexia', __name__)
 
-# Download NLTK data if not present
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-
 class DyslexiaAI:
     def __init__(self):
-        self.simple_words = self.load_simple_words()
-        self.phonics_words = self.load_phonics_words()
-    
-    def load_simple_words(self):
-        """Load simple word replacements"""
-        return {
-            'utilize': 'use', 'demonstrate': 'show', 'approximately': 'about',
-            'consequently': 'so', 'furthermore': 'also', 'nevertheless': 'but',
-            'subsequently': 'then', 'magnificent': 'great', 'enormous': 'huge',
-            'diminish': 'reduce', 'acquire': 'get', 'commence': 'start',
-            'terminate': 'end', 'assistance': 'help', 'sufficient': 'enough',
-            'difficult': 'hard', 'important': 'key', 'understand': 'get',
-            'remember': 'recall', 'different': 'other', 'because': 'since',
-            'immediately': 'now', 'necessary': 'needed', 'opportunity': 'chance',
-            'participate': 'join', 'communicate': 'talk', 'investigate': 'look into'
-        }
-    
-    def load_phonics_words(self):
-        """Load phonics word database with different difficulty levels"""
-        return {
-            'easy': [
-                {'word': 'cat', 'sounds': ['c', 'a', 't'], 'phonemes': ['k', 'æ', 't']},
-                {'word': 'dog', 'sounds': ['d', 'o', 'g'], 'phonemes': ['d', 'ɒ', 'g']},
-                {'word': 'sun', 'sounds': ['s', 'u', 'n'], 'phonemes': ['s', 'ʌ', 'n']},
-                {'word': 'hat', 'sounds': ['h', 'a', 't'], 'phonemes': ['h', 'æ', 't']},
-                {'word': 'pen', 'sounds': ['p', 'e', 'n'], 'phonemes': ['p', 'e', 'n']},
-                {'word': 'big', 'sounds': ['b', 'i', 'g'], 'phonemes': ['b', 'ɪ', 'g']},
-                {'word': 'red', 'sounds': ['r', 'e', 'd'], 'phonemes': ['r', 'e', 'd']},
-                {'word': 'top', 'sounds': ['t', 'o', 'p'], 'phonemes': ['t', 'ɒ', 'p']},
-            ],
-            'medium': [
-                {'word': 'fish', 'sounds': ['f', 'i', 'sh'], 'phonemes': ['f', 'ɪ', 'ʃ']},
-                {'word': 'ship', 'sounds': ['sh', 'i', 'p'], 'phonemes': ['ʃ', 'ɪ', 'p']},
-                {'word': 'chair', 'sounds': ['ch', 'ai', 'r'], 'phonemes': ['tʃ', 'eə', 'r']},
-                {'word': 'think', 'sounds': ['th', 'i', 'nk'], 'phonemes': ['θ', 'ɪ', 'ŋk']},
-                {'word': 'phone', 'sounds': ['ph', 'o', 'ne'], 'phonemes': ['f', 'əʊ', 'n']},
-                {'word': 'night', 'sounds': ['n', 'igh', 't'], 'phonemes': ['n', 'aɪ', 't']},
-                {'word': 'light', 'sounds': ['l', 'igh', 't'], 'phonemes': ['l', 'aɪ', 't']},
-                {'word': 'train', 'sounds': ['tr', 'ai', 'n'], 'phonemes': ['tr', 'eɪ', 'n']},
-            ],
-            'hard': [
-                {'word': 'through', 'sounds': ['th', 'r', 'ough'], 'phonemes': ['θ', 'r', 'uː']},
-                {'word': 'enough', 'sounds': ['e', 'n', 'ough'], 'phonemes': ['ɪ', 'n', 'ʌf']},
-                {'word': 'daughter', 'sounds': ['d', 'augh', 'ter'], 'phonemes': ['d', 'ɔː', 'tə']},
-                {'word': 'knight', 'sounds': ['kn', 'igh', 't'], 'phonemes': ['n', 'aɪ', 't']},
-                {'word': 'psychology', 'sounds': ['ps', 'y', 'ch', 'o', 'lo', 'gy'], 'phonemes': ['s', 'aɪ', 'k', 'ɒ', 'lə', 'dʒi']},
-                {'word': 'rhythm', 'sounds': ['rh', 'y', 'th', 'm'], 'phonemes': ['r', 'ɪ', 'ð', 'm']},
-            ]
-        }
+        self.phonics_bank = phonics_bank
     
     def simplify_text(self, text):
         """Enhanced text simplification for dyslexic readers using local AI"""
@@ -90,6 +46,38 @@ class DyslexiaAI:
             # Fallback to existing rule-based method
             return self._rule_based_simplify(text)
 
+    def iter_simplify(self, text):
+        """Simplify sentence by sentence, yielding each result as soon as it is ready"""
+        if not text.strip():
+            return
+        
+        try:
+            from ai_helpers import AIHelpers
+            from flask import current_app
+            
+            ai_helper = AIHelpers(current_app.config)
+            sentences = sent_tokenize(text)
+        except Exception as e:
+            print(f"AI simplification failed, using rule-based: {e}")
+            yield from self._iter_rule_based_simplify(text)
+            return
+        
+        for sentence in sentences:
+            try:
+                yield self._post_process_for_dyslexia(ai_helper.simplify_text(sentence))
+            except Exception as e:
+                print(f"AI simplification failed, using rule-based: {e}")
+                yield from self._iter_rule_based_simplify(sentence)
+
+    def model_simplify(self, text, config, timeout=30.0):
+        """Model-only simplification for background upgrades; None if the model is unavailable"""
+        from ai_helpers import AIHelpers
+        
+        simplified = AIHelpers(config).model_simplify(text, timeout=timeout)
+        if simplified is None:
+            return None
+        return self._post_process_for_dyslexia(simplified)
+
     def _post_process_for_dyslexia(self, text):
         """Additional processing specific to dyslexia needs"""
         # Your existing logic here...
@@ -99,15 +87,17 @@ class DyslexiaAI:
 
     def _rule_based_simplify(self, text):
         """Your existing rule-based simplification logic"""
-        # Move your existing simplification logic here
+        return ' '.join(self._iter_rule_based_simplify(text))
+
+    def _iter_rule_based_simplify(self, text):
+        """Yield rule-based simplified sentences (or sentence parts) one at a time"""
         sentences = sent_tokenize(text)
-        simplified_sentences = []
         
         for sentence in sentences:
             # Remove complex punctuation
             sentence = re.sub(r'[;:]', '.', sentence)
-            sentence = re.sub(r'["""]', '"', sentence)
-            sentence = re.sub(r'['']', "'", sentence)
+            sentence = re.sub(r'[“”]', '"', sentence)
+            sentence = re.sub(r'[‘’]', "'", sentence)
             
             # Split long sentences at conjunctions
             if len(sentence.split()) > 15:
@@ -118,149 +108,51 @@ class DyslexiaAI:
                         part = self.replace_complex_words(part)
                         if not part.endswith('.') and i == len(parts) - 1:
                             part += '.'
-                        simplified_sentences.append(part)
+                        yield part
             else:
-                sentence = self.replace_complex_words(sentence)
-                simplified_sentences.append(sentence)
-        
-        return ' '.join(simplified_sentences)
+                yield self.replace_complex_words(sentence)
     
     def replace_complex_words(self, text):
         """Replace complex words with simpler alternatives"""
-        words = text.split()
-        simplified_words = []
-        
-        for word in words:
-            # Extract punctuation
-            punctuation = ''
-            clean_word = word
-            if word and not word[-1].isalnum():
-                punctuation = word[-1]
-                clean_word = word[:-1]
-            
-            # Check for replacement
-            lower_word = clean_word.lower()
-            if lower_word in self.simple_words:
-                simplified_words.append(self.simple_words[lower_word] + punctuation)
-            else:
-                simplified_words.append(word)
-        
-        return ' '.join(simplified_words)
+        return lexicon.replace(text)
     
     def analyze_text(self, text):
         """Enhanced text analysis"""
-        words = word_tokenize(text)
-        sentences = sent_tokenize(text)
-        
-        # Filter out punctuation for word analysis
-        actual_words = [word for word in words if word.isalnum()]
-        
-        avg_word_length = sum(len(word) for word in actual_words) / len(actual_words) if actual_words else 0
-        avg_sentence_length = len(actual_words) / len(sentences) if sentences else 0
-        
-        # Count syllables (simplified)
-        total_syllables = sum(self.count_syllables(word) for word in actual_words)
-        avg_syllables = total_syllables / len(actual_words) if actual_words else 0
-        
-        # Determine difficulty
-        difficulty = 'Easy'
-        if avg_word_length > 6 or avg_sentence_length > 15 or avg_syllables > 2:
-            difficulty = 'Hard'
-        elif avg_word_length > 4 or avg_sentence_length > 10 or avg_syllables > 1.5:
-            difficulty = 'Medium'
-        
-        # Find difficult words
-        difficult_words = []
-        for word in actual_words:
-            if len(word) > 7 or self.count_syllables(word) > 3:
-                difficult_words.append({
-                    'word': word,
-                    'syllables': self.count_syllables(word),
-                    'length': len(word)
-                })
-        
-        return {
-            'word_count': len(actual_words),
-            'sentence_count': len(sentences),
-            'avg_word_length': round(avg_word_length, 2),
-            'avg_sentence_length': round(avg_sentence_length, 2),
-            'avg_syllables': round(avg_syllables, 2),
-            'difficulty': difficulty,
-            'difficult_words': difficult_words[:10],  # Limit to 10 most difficult
-            'readability_score': self.calculate_readability_score(avg_sentence_length, avg_syllables)
-        }
+        return TextAnalysis(text).summary()
     
     def count_syllables(self, word):
         """Count syllables in a word"""
-        word = word.lower()
-        vowels = 'aeiouy'
-        syllable_count = 0
-        prev_was_vowel = False
-        
-        for char in word:
-            is_vowel = char in vowels
-            if is_vowel and not prev_was_vowel:
-                syllable_count += 1
-            prev_was_vowel = is_vowel
-        
-        # Handle silent 'e'
-        if word.endswith('e') and syllable_count > 1:
-            syllable_count -= 1
-        
-        return max(1, syllable_count)
+        return count_syllables(word)
     
     def calculate_readability_score(self, avg_sentence_length, avg_syllables):
         """Calculate a simplified readability score"""
-        # Simplified Flesch Reading Ease formula
-        score = 206.835 - (1.015 * avg_sentence_length) - (84.6 * avg_syllables)
-        
-        if score >= 90:
-            return 'Very Easy'
-        elif score >= 80:
-            return 'Easy'
-        elif score >= 70:
-            return 'Fairly Easy'
-        elif score >= 60:
-            return 'Standard'
-        elif score >= 50:
-            return 'Fairly Difficult'
-        elif score >= 30:
-            return 'Difficult'
-        else:
-            return 'Very Difficult'
+        return readability_label(avg_sentence_length, avg_syllables)
     
-    def generate_phonics_questions(self, difficulty='easy', count=5):
-        """Generate phonics questions based on difficulty"""
-        words_pool = self.phonics_words.get(difficulty, self.phonics_words['easy'])
-        selected_words = random.sample(words_pool, min(count, len(words_pool)))
-        
+    def generate_phonics_questions(self, difficulty='easy', count=5, phoneme=None, pattern=None, seed=None):
+        """Generate phonics questions from the item bank ('mixed' draws from every level)"""
+        if difficulty == 'mixed':
+            difficulty = None
+        elif difficulty not in DIFFICULTIES:
+            difficulty = 'easy'
+        items = self.phonics_bank.select(count, difficulty, phoneme=phoneme, pattern=pattern)
+        return self.phonics_questions([item['id'] for item in items], seed)
+    
+    def phonics_questions(self, item_ids, seed=None):
+        """Questions for the given items; the same ids and seed always give the same options"""
+        rng = random.Random(seed)
+        return [self.phonics_bank.make_question(self.phonics_bank.get(item_id), rng) for item_id in item_ids]
+    
+    def word_building_questions(self, item_ids):
+        """Build-the-word questions: the sounds of each item, answered by the word"""
         questions = []
-        for word_data in selected_words:
-            # Create multiple choice options
-            correct_sounds = '-'.join(word_data['sounds'])
-            
-            # Generate wrong options
-            wrong_options = []
-            for _ in range(3):
-                # Create plausible wrong answers
-                wrong_sounds = word_data['sounds'].copy()
-                if len(wrong_sounds) > 1:
-                    # Swap some sounds
-                    idx1, idx2 = random.sample(range(len(wrong_sounds)), 2)
-                    wrong_sounds[idx1], wrong_sounds[idx2] = wrong_sounds[idx2], wrong_sounds[idx1]
-                wrong_options.append('-'.join(wrong_sounds))
-            
-            options = [correct_sounds] + wrong_options
-            random.shuffle(options)
-            
+        for item_id in item_ids:
+            item = self.phonics_bank.get(item_id)
             questions.append({
-                'word': word_data['word'],
-                'correct_sounds': correct_sounds,
-                'options': options,
-                'correct_index': options.index(correct_sounds),
-                'phonemes': word_data.get('phonemes', [])
+                'item_id': item_id,
+                'sounds': item['sounds'],
+                'correct': item['word'],
+                'level': item['difficulty'].capitalize()
             })
-        
         return questions
 
 dyslexia_ai = DyslexiaAI()
@@ -288,29 +180,53 @@ def simplify_text():
     if not text.strip():
         return jsonify({'success': False, 'message': 'No text provided'})
     
+    if data.get('stream') or request.accept_mimetypes.best == 'text/event-stream':
+        return Response(stream_with_context(stream_simplification(text)), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    
+    if data.get('two_phase'):
+        return simplify_two_phase(text)
+    
     try:
         simplified = dyslexia_ai.simplify_text(text)
         analysis = dyslexia_ai.analyze_text(text)
+        save_simplification_progress(text, analysis)
         
-        # Save progress
-        progress_data = {
-            'user_id': session['user_id'],
-            'activity': 'text_simplification',
-            'original_text': text[:100] + '...' if len(text) > 100 else text,
-            'difficulty': analysis['difficulty'],
-            'word_count': analysis['word_count'],
-            'readability_score': analysis['readability_score'],
-            'timestamp': file_manager.get_timestamp()
-        }
+        return jsonify({
+            'success': True,
+            'original': text,
+            'simplified': simplified,
+            'analysis': analysis
+        })
         
-        fieldnames = ['user_id', 'activity', 'original_text', 'difficulty', 'word_count', 'readability_score', 'timestamp']
-        file_manager.append_csv('data/dyslexia/progress.csv', progress_data, fieldnames)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error processing text: {str(e)}'
+        }), 500
+
+def simplify_two_phase(text):
+    """Answer with the rule-based text now and upgrade it with the model in the background"""
+    try:
+        simplified = dyslexia_ai._rule_based_simplify(text)
+        analysis = dyslexia_ai.analyze_text(text)
+        save_simplification_progress(text, analysis)
+        
+        job_id = None
+        config = current_app.config
+        if config.get('USE_LOCAL_MODELS', True):
+            timeout = config.get('SIMPLIFY_UPGRADE_TIMEOUT', 10.0)
+            job_id = get_upgrade_jobs(config).submit(
+                lambda: dyslexia_ai.model_simplify(text, config, timeout=timeout),
+                simplified, owner=session['user_id'])
         
         return jsonify({
             'success': True,
             'original': text,
             'simplified': simplified,
-            'analysis': analysis
+            'analysis': analysis,
+            'job_id': job_id,
+            'final': job_id is None
         })
         
     except Exception as e:
@@ -319,30 +235,282 @@ def simplify_text():
             'message': f'Error processing text: {str(e)}'
         }), 500
 
+@dyslexia_bp.route('/simplify/result/<job_id>')
+def simplify_result(job_id):
+    """Poll a two-phase simplify job for the model's upgraded text"""
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'message': 'Not logged in'})
+    
+    job = get_upgrade_jobs(current_app.config).get(job_id, owner=session['user_id'])
+    if job is None:
+        return jsonify({'success': False, 'message': 'Unknown or expired job'}), 404
+    return jsonify({'success': True, **job})
+
+@dyslexia_bp.route('/analyze-batch', methods=['POST'])
+def analyze_batch():
+    """Analyze many texts at once: a JSON list, or uploaded text files / zip archives"""
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'message': 'Not logged in'})
+    
+    config = current_app.config
+    max_items = config.get('BATCH_ANALYSIS_MAX_ITEMS', 200)
+    try:
+        if request.files:
+            files = request.files.getlist('files') + request.files.getlist('file')
+            items = read_uploads(files, max_items, config.get('MAX_CONTENT_LENGTH') or 16 * 1024 * 1024)
+            simplify = request.form.get('simplify', '').lower() in ('1', 'true', 'yes')
+        else:
+            data = request.get_json(silent=True) or {}
+            items = []
+            for i, entry in enumerate(data.get('texts') or []):
+                if isinstance(entry, dict):
+                    items.append((entry.get('name') or f'text-{i + 1}', str(entry.get('text', ''))))
+                else:
+                    items.append((f'text-{i + 1}', str(entry)))
+            simplify = bool(data.get('simplify'))
+    except BatchTooLarge as e:
+        return jsonify({'success': False, 'message': str(e)}), 413
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Could not read batch: {str(e)}'}), 400
+    
+    items = [(name, text) for name, text in items if text.strip()]
+    if not items:
+        return jsonify({'success': False, 'message': 'No text provided'})
+    if len(items) > max_items:
+        return jsonify({'success': False, 'message': f'At most {max_items} texts per batch'}), 413
+    
+    try:
+        start = time.perf_counter()
+        results = get_batch_analyzer(config).analyze([text for _, text in items], simplify=simplify)
+        elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+        
+        save_batch_progress(items, results)
+        
+        return jsonify({
+            'success': True,
+            'count': len(items),
+            'elapsed_ms': elapsed_ms,
+            'results': [{'index': i, 'name': name, **result} for i, ((name, _), result) in enumerate(zip(items, results))]
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Error processing batch: {str(e)}'
+        }), 500
+
+def save_batch_progress(items, results):
+    """Record a whole batch as one progress row instead of one append per text"""
+    analyses = [result['analysis'] for result in results]
+    names = ', '.join(name for name, _ in items)
+    summary = f'{len(items)} texts: {names}'
+    progress_data = {
+        'user_id': session['user_id'],
+        'activity': 'batch_text_analysis',
+        'original_text': summary[:100] + '...' if len(summary) > 100 else summary,
+        'difficulty': Counter(analysis['difficulty'] for analysis in analyses).most_common(1)[0][0],
+        'word_count': sum(analysis['word_count'] for analysis in analyses),
+        'readability_score': Counter(analysis['readability_score'] for analysis in analyses).most_common(1)[0][0],
+        'timestamp': file_manager.get_timestamp()
+    }
+    
+    fieldnames = ['user_id', 'activity', 'original_text', 'difficulty', 'word_count', 'readability_score', 'timestamp']
+    file_manager.append_csv('data/dyslexia/progress.csv', progress_data, fieldnames)
+
+def process_document_chunk(chunk, config):
+    """Simplify and annotate one chunk of a document job (runs outside any request)"""
+    try:
+        from ai_helpers import AIHelpers
+        simplified = dyslexia_ai._post_process_for_dyslexia(AIHelpers(config).simplify_text(chunk))
+    except Exception as e:
+        print(f"AI simplification failed, using rule-based: {e}")
+        simplified = dyslexia_ai._rule_based_simplify(chunk)
+    return {'simplified': simplified, 'annotations': TextAnalysis(chunk).annotations}
+
+def document_jobs(config):
+    """The process-wide document job runner"""
+    return get_document_jobs(
+        config,
+        lambda chunk: process_document_chunk(chunk, config),
+        on_complete=lambda meta, text: save_simplification_progress(text, dyslexia_ai.analyze_text(text), user_id=meta['owner'])
+    )
+
+@dyslexia_bp.route('/jobs', methods=['GET', 'POST'])
+def simplify_jobs():
+    """Submit a long text or document for background simplification, or list your jobs"""
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'message': 'Not logged in'})
+    
+    config = current_app.config
+    jobs = document_jobs(config)
+    if request.method == 'GET':
+        return jsonify({'success': True, 'jobs': jobs.list_jobs(session['user_id'])})
+    
+    upload = request.files.get('file')
+    if upload is not None:
+        name = upload.filename
+        text = upload.read().decode('utf-8', errors='replace')
+    else:
+        data = request.get_json(silent=True) or {}
+        name = data.get('name')
+        text = str(data.get('text', ''))
+    
+    if not text.strip():
+        return jsonify({'success': False, 'message': 'No text provided'})
+    
+    job = jobs.submit(text, session['user_id'], name=name, chunk_chars=config.get('DOCUMENT_JOB_CHUNK_CHARS', 2000))
+    if job is None:
+        return jsonify({'success': False, 'message': 'Too many documents in progress, try again shortly'}), 503
+    return jsonify({'success': True, **jobs.get(job['id'], session['user_id'])}), 202
+
+@dyslexia_bp.route('/jobs/<job_id>')
+def simplify_job_status(job_id):
+    """Progress of a document job; ?since=N adds the results of chunks N onwards"""
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'message': 'Not logged in'})
+    
+    since = request.args.get('since', type=int)
+    job = document_jobs(current_app.config).get(job_id, session['user_id'], since=since)
+    if job is None:
+        return jsonify({'success': False, 'message': 'Unknown job'}), 404
+    return jsonify({'success': True, **job})
+
+@dyslexia_bp.route('/jobs/<job_id>/stream')
+def simplify_job_stream(job_id):
+    """SSE: a 'chunk' event per finished chunk, 'progress' updates, then 'done'"""
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'message': 'Not logged in'})
+    
+    jobs = document_jobs(current_app.config)
+    owner = session['user_id']
+    if jobs.get(job_id, owner) is None:
+        return jsonify({'success': False, 'message': 'Unknown job'}), 404
+    
+    def events(since):
+        while True:
+            job = jobs.get(job_id, owner, since=since)
+            if job is None:
+                yield sse_event('error', {'success': False, 'message': 'Unknown job'})
+                return
+            results = job.pop('results')
+            for result in results:
+                yield sse_event('chunk', result)
+            since += len(results)
+            yield sse_event('progress', job)
+            if job['final'] and since >= job['done_chunks']:
+                yield sse_event('done', {'success': job['status'] == 'completed', **job})
+                return
+            time.sleep(0.5)
+    
+    return Response(stream_with_context(events(request.args.get('since', 0, type=int))), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@dyslexia_bp.route('/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_simplify_job(job_id):
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'message': 'Not logged in'})
+    
+    jobs = document_jobs(current_app.config)
+    if not jobs.cancel(job_id, session['user_id']):
+        return jsonify({'success': False, 'message': 'Unknown job'}), 404
+    return jsonify({'success': True, **jobs.get(job_id, session['user_id'])})
+
+def save_simplification_progress(text, analysis, user_id=None):
+    """Record a text simplification in the user's progress"""
+    progress_data = {
+        'user_id': user_id or session['user_id'],
+        'activity': 'text_simplification',
+        'original_text': text[:100] + '...' if len(text) > 100 else text,
+        'difficulty': analysis['difficulty'],
+        'word_count': analysis['word_count'],
+        'readability_score': analysis['readability_score'],
+        'timestamp': file_manager.get_timestamp()
+    }
+    
+    fieldnames = ['user_id', 'activity', 'original_text', 'difficulty', 'word_count', 'readability_score', 'timestamp']
+    file_manager.append_csv('data/dyslexia/progress.csv', progress_data, fieldnames)
+
+def sse_event(event, data):
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def stream_simplification(text):
+    """SSE stream: one 'sentence' event per simplified sentence, then 'analysis' and 'done'"""
+    try:
+        index = 0
+        for sentence in dyslexia_ai.iter_simplify(text):
+            yield sse_event('sentence', {'index': index, 'text': sentence})
+            index += 1
+        
+        analysis = dyslexia_ai.analyze_text(text)
+        save_simplification_progress(text, analysis)
+        yield sse_event('analysis', {'original': text, 'analysis': analysis})
+        yield sse_event('done', {'success': True, 'sentences': index})
+    except Exception as e:
+        yield sse_event('error', {'success': False, 'message': f'Error processing text: {str(e)}'})
+
 @dyslexia_bp.route('/games')
 def games():
     if 'user_id' not in session:
         return redirect(url_for('auth.login'))
     return render_template('dyslexia/games.html')
 
+# Only these question fields go to the browser; answers stay on the server
+PUBLIC_QUESTION_FIELDS = {
+    'phonics': ('word', 'options', 'level'),
+    'word-building': ('sounds', 'level')
+}
+
+def start_game(game_type, item_ids, difficulty, seed, questions):
+    """Store a game instance and return the response with the answer-free questions"""
+    game_id = get_game_store(current_app.config).create(session['user_id'], game_type, difficulty, item_ids, seed)
+    fields = PUBLIC_QUESTION_FIELDS[game_type]
+    return jsonify({
+        'success': True,
+        'game_id': game_id,
+        'game_type': game_type,
+        'questions': [{field: question[field] for field in fields} for question in questions],
+        'difficulty': difficulty,
+        'total_questions': len(questions)
+    })
+
+def game_request_options(data):
+    difficulty = data.get('difficulty', 'easy')
+    count = max(1, min(int(data.get('count', 5)), current_app.config.get('PHONICS_MAX_QUESTIONS', 50)))
+    return difficulty, count
+
 @dyslexia_bp.route('/games/phonics', methods=['POST'])
 def phonics_game():
     if 'user_id' not in session:
         return jsonify({'success': False, 'message': 'Not logged in'})
     
     data = request.get_json()
-    difficulty = data.get('difficulty', 'easy')
-    question_count = data.get('count', 5)
     
     try:
-        questions = dyslexia_ai.generate_phonics_questions(difficulty, question_count)
+        difficulty, question_count = game_request_options(data)
+        seed = random.getrandbits(32)
+        questions = dyslexia_ai.generate_phonics_questions(difficulty, question_count, phoneme=data.get('phoneme'),
+                                                           pattern=data.get('pattern'), seed=seed)
+        return start_game('phonics', [question['item_id'] for question in questions], difficulty, seed, questions)
         
+    except Exception as e:
         return jsonify({
-            'success': True,
-            'questions': questions,
-            'difficulty': difficulty,
-            'total_questions': len(questions)
-        })
+            'success': False,
+            'message': f'Error generating questions: {str(e)}'
+        }), 500
+
+@dyslexia_bp.route('/games/word-building', methods=['POST'])
+def word_building_game():
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'message': 'Not logged in'})
+    
+    data = request.get_json()
+    
+    try:
+        difficulty, question_count = game_request_options(data)
+        level = None if difficulty == 'mixed' else difficulty if difficulty in DIFFICULTIES else 'easy'
+        item_ids = [item['id'] for item in phonics_bank.select(question_count, level, pattern=data.get('pattern'))]
+        return start_game('word-building', item_ids, difficulty, None, dyslexia_ai.word_building_questions(item_ids))
         
     except Exception as e:
         return jsonify({
@@ -350,6 +518,32 @@ def phonics_game():
             'message': f'Error generating questions: {str(e)}'
         }), 500
 
+def score_game(game, answers):
+    """Score answers against a stored game: (correct count, per-question details)"""
+    details = []
+    if game['game_type'] == 'phonics':
+        for i, question in enumerate(dyslexia_ai.phonics_questions(game['item_ids'], game['seed'])):
+            answer = answers[i] if i < len(answers) else None
+            # JSON true/false arrive as bools, which are ints in Python
+            valid = isinstance(answer, int) and not isinstance(answer, bool) and 0 <= answer < len(question['options'])
+            chosen = question['options'][answer] if valid else None
+            details.append({
+                'question': question['word'],
+                'user_answer': chosen,
+                'correct_answer': question['correct_sounds'],
+                'is_correct': valid and answer == question['correct_index']
+            })
+    else:
+        for i, question in enumerate(dyslexia_ai.word_building_questions(game['item_ids'])):
+            answer = answers[i] if i < len(answers) else None
+            answer = answer.lower().strip() if isinstance(answer, str) else ''
+            details.append({
+                'question': ' + '.join(question['sounds']),
+                'user_answer': answer or None,
+                'correct_answer': question['correct'],
+                'is_correct': answer == question['correct']
+            })
+    return sum(detail['is_correct'] for detail in details), details
 
 @dyslexia_bp.route('/games/submit', methods=['POST'])
 def submit_game():
@@ -357,48 +551,26 @@ def submit_game():
         return jsonify({'success': False, 'message': 'Not logged in'})
     
     data = request.get_json()
+    game_id = data.get('game_id')
     answers = data.get('answers', [])
-    game_type = data.get('game_type', 'phonics')
-    difficulty = data.get('difficulty', 'easy')
-    questions = data.get('questions', []) # This will now be sent from the frontend
     
-    if not answers or not questions:
+    if not game_id or not isinstance(answers, list):
         return jsonify({'success': False, 'message': 'Incomplete game data provided'})
     
+    game = get_game_store(current_app.config).pop(game_id, session['user_id'])
+    if game is None:
+        return jsonify({'success': False, 'message': 'Unknown or expired game'}), 404
+    
     try:
-        # Calculate score based on game type
-        if game_type == 'phonics':
-            correct_count = 0
-            for i, answer_index in enumerate(answers):
-                # Ensure the index and answer are valid
-                if i < len(questions) and answer_index == questions[i].get('correct_index', -1):
-                    correct_count += 1
-            
-            score = correct_count
-            total_questions = len(questions)
-            accuracy = (correct_count / total_questions) * 100 if total_questions > 0 else 0
-            
-        elif game_type == 'word-building':
-            correct_count = 0
-            # The 'questions' list now contains the correct answers
-            for i, answer in enumerate(answers):
-                if i < len(questions) and answer.lower().strip() == questions[i].get('correct', ''):
-                    correct_count += 1
-            
-            score = correct_count
-            total_questions = len(questions)
-            accuracy = (correct_count / total_questions) * 100 if total_questions > 0 else 0
-        
-        else: # Default case
-            score = 0
-            total_questions = len(questions)
-            accuracy = 0
+        score, details = score_game(game, answers)
+        total_questions = len(details)
+        accuracy = (score / total_questions) * 100 if total_questions > 0 else 0
         
         # Save game progress
         game_data = {
             'user_id': session['user_id'],
-            'game_type': game_type,
-            'difficulty': difficulty,
+            'game_type': game['game_type'],
+            'difficulty': game['difficulty'],
             'score': score,
             'total_questions': total_questions,
             'accuracy': round(accuracy, 2),
@@ -413,6 +585,7 @@ def submit_game():
             'score': score,
             'total': total_questions,
             'accuracy': round(accuracy, 2),
+            'details': details,
             'message': f'Great job! You got {score} out of {total_questions} correct!'
         })
         
@@ -421,6 +594,7 @@ def submit_game():
             'success': False,
             'message': f'Error processing game results: {str(e)}'
         }), 500
+
 @dyslexia_bp.route('/text-to-speech', methods=['POST'])
 def text_to_speech():
     """Handle text-to-speech requests"""
@@ -433,10 +607,46 @@ def text_to_speech():
     if not text.strip():
         return jsonify({'success': False, 'message': 'No text provided'})
     
-    # For now, return success - actual TTS is handled client-side
-    # In production, you could integrate with services like Google TTS API
+    service = get_tts_service(current_app.config)
+    if service is None:
+        # No server-side engine configured: the browser speaks the text itself
+        return jsonify({
+            'success': True,
+            'message': 'Text ready for speech synthesis',
+            'engine': 'browser',
+            'text': text
+        })
+    
+    try:
+        settings = service.settings(data.get('voice'), data.get('rate'), data.get('pitch'))
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'message': 'Invalid voice settings'}), 400
+    
+    # One clip per sentence, rendered in reading order in the background. Only the first
+    # TTS_MAX_SENTENCES are rendered, so one request cannot queue unbounded synthesis runs
+    sentences = sent_tokenize(text)
+    max_sentences = current_app.config.get('TTS_MAX_SENTENCES', 40)
+    clips = service.prepare(sentences[:max_sentences], settings)
     return jsonify({
         'success': True,
-        'message': 'Text ready for speech synthesis',
-        'text': text
+        'message': 'Audio is being generated',
+        'engine': service.engine.name,
+        'text': text,
+        'settings': settings,
+        'audio': [{'index': clip['index'], 'text': clip['text'],
+                   'url': url_for('dyslexia.speech_audio', key=clip['key'])} for clip in clips],
+        'remaining_text': ' '.join(sentences[max_sentences:]) or None
     })
+
+@dyslexia_bp.route('/text-to-speech/<key>.wav')
+def speech_audio(key):
+    """A rendered sentence clip, with Range and conditional request support"""
+    if 'user_id' not in session:
+        return jsonify({'success': False, 'message': 'Not logged in'}), 401
+    
+    service = get_tts_service(current_app.config)
+    path = service.audio_path(key) if service else None
+    if path is None:
+        return jsonify({'success': False, 'message': 'Unknown audio clip'}), 404
+    # The key hashes the text and voice settings, so a clip never changes
+    return send_file(os.path.abspath(path), mimetype='audio/wav', conditional=True, etag=key, max_age=7 * 24 * 3600)
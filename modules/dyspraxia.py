@@ -1,5 +1,10 @@
 from flask import Blueprint, render_template, request, jsonify, session, redirect, url_for
 from utils.file_manager import file_manager
+from utils.aggregate_store import aggregate_store
+from utils.frames import read_frame_upload, decode_frame, frame_to_text
+from utils.landmarks import pack_landmarks, unpack_landmarks, from_mediapipe, as_array, to_dicts, HAND_FIELDS, POSE_FIELDS
+from utils.pose_rules import movement_rules, gesture_table, MOVEMENT_RULES, POSE_LANDMARKS
+from config import Config
 import cv2
 import numpy as np
 import base64
@@ -10,6 +15,13 @@ import os
 import math
 import mediapipe as mp
 import random
+import threading
+from utils.tracker_pool import TrackerPool
+
+try:
+    from flask_sock import Sock
+except ImportError:  # Optional: without it the camera pages send frames over HTTP
+    Sock = None
 
 dyspraxia_bp = Blueprint('dyspraxia', __name__)
 
@@ -19,21 +31,7 @@ class DyspraxiaAI:
         self.mp_hands = mp.solutions.hands
         self.mp_pose = mp.solutions.pose
         self.mp_draw = mp.solutions.drawing_utils
-        
-        # Hand detection setup
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=2,
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.5
-        )
-        
-        # Pose detection setup
-        self.pose = self.mp_pose.Pose(
-            static_image_mode=False,
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.5
-        )
+        self._create_graphs()
         
         self.balance_exercises = [
             {
@@ -193,28 +191,69 @@ class DyspraxiaAI:
             }
         ]
 
-    def detect_hand_landmarks(self, frame_bytes):
-        """Detect hand landmarks using MediaPipe and return gesture and processed image."""
+    def _create_graphs(self):
+        """Pools of MediaPipe Hands and Pose graphs for single-frame requests.
+
+        Each request borrows a graph for itself, so concurrent requests run
+        in parallel instead of sharing (and corrupting) one graph. Requests
+        come from many users, so these graphs treat every frame as a still.
+        """
+        self.hand_graphs = TrackerPool(lambda: self.create_hands(static_image_mode=True), Config.VISION_POOL_SIZE,
+                                       Config.VISION_POOL_IDLE_TIMEOUT, reset=False)
+        self.pose_graphs = TrackerPool(lambda: self.create_pose(static_image_mode=True), Config.VISION_POOL_SIZE,
+                                       Config.VISION_POOL_IDLE_TIMEOUT, reset=False)
+
+    def create_hands(self, static_image_mode=False):
+        """A new MediaPipe Hands graph (by default tracking across the frames it is given)"""
+        return self.mp_hands.Hands(
+            static_image_mode=static_image_mode,
+            max_num_hands=2,
+            min_detection_confidence=0.7,
+            min_tracking_confidence=0.5
+        )
+
+    def create_pose(self, static_image_mode=False):
+        """A new MediaPipe Pose graph (by default tracking across the frames it is given)"""
+        return self.mp_pose.Pose(
+            static_image_mode=static_image_mode,
+            min_detection_confidence=0.7,
+            min_tracking_confidence=0.5
+        )
+
+    def _process(self, graph, pool, img_rgb):
+        """Run the caller's graph (a stream's tracker), or one borrowed from the pool"""
+        if graph is not None:
+            return graph.process(img_rgb)
+        with pool.borrowed(Config.VISION_POOL_WAIT_TIMEOUT) as graph:
+            return graph.process(img_rgb)
+
+    def detect_hand_landmarks(self, frame_bytes, hands=None, draw=True):
+        """Detect hand landmarks using MediaPipe and return gesture and processed image.
+
+        frame_bytes is an encoded image, as bytes or base64 text. hands is
+        the graph to run, by default one from the pool. With draw=False no
+        overlay image is made and None is returned in its place.
+        """
         try:
-            nparr = np.frombuffer(base64.b64decode(frame_bytes), np.uint8)
-            img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+            img = decode_frame(frame_bytes)
             if img is None: return None, 'none', None
             
             img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-            results = self.hands.process(img_rgb)
-            img_bgr = cv2.cvtColor(img_rgb, cv2.COLOR_RGB2BGR) # For drawing
+            results = self._process(hands, self.hand_graphs, img_rgb)
+            img_bgr = cv2.cvtColor(img_rgb, cv2.COLOR_RGB2BGR) if draw else None # For drawing
             
             hand_landmarks_data = None
             gesture = 'none'
             
             if results.multi_hand_landmarks:
                 for hand_landmarks in results.multi_hand_landmarks:
-                    self.mp_draw.draw_landmarks(
-                        img_bgr, hand_landmarks, self.mp_hands.HAND_CONNECTIONS,
-                        self.mp_draw.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=2),
-                        self.mp_draw.DrawingSpec(color=(0, 255, 0), thickness=2)
-                    )
-                    hand_landmarks_data = [{'x': lm.x, 'y': lm.y, 'z': lm.z} for lm in hand_landmarks.landmark]
+                    if draw:
+                        self.mp_draw.draw_landmarks(
+                            img_bgr, hand_landmarks, self.mp_hands.HAND_CONNECTIONS,
+                            self.mp_draw.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=2),
+                            self.mp_draw.DrawingSpec(color=(0, 255, 0), thickness=2)
+                        )
+                    hand_landmarks_data = from_mediapipe(hand_landmarks, HAND_FIELDS)
                     gesture = self.classify_hand_gesture(hand_landmarks_data)
                     break # Process first hand found
             
@@ -225,61 +264,33 @@ class DyspraxiaAI:
             return None, 'none', None
 
     def classify_hand_gesture(self, landmarks):
-        """Classify hand gesture from landmark positions."""
-        if not landmarks or len(landmarks) < 21: return 'none'
+        """Classify hand gesture from landmark positions (see GESTURE_RULES in utils.pose_rules)."""
+        if landmarks is None or len(landmarks) < 21: return 'none'
         try:
-            thumb_tip, thumb_ip = landmarks[4], landmarks[3]
-            index_tip, index_pip = landmarks[8], landmarks[6]
-            middle_tip, middle_pip = landmarks[12], landmarks[10]
-            ring_tip, ring_pip = landmarks[16], landmarks[14]
-            pinky_tip, pinky_pip = landmarks[20], landmarks[18]
-            
-            fingers_up = []
-            # Thumb check (works for both hands)
-            if landmarks[17]['x'] < landmarks[5]['x']: # Simple Right Hand check
-                fingers_up.append(thumb_tip['x'] > thumb_ip['x'])
-            else: # Left Hand
-                fingers_up.append(thumb_tip['x'] < thumb_ip['x'])
-            
-            # Other four fingers
-            fingers_up.append(index_tip['y'] < index_pip['y'])
-            fingers_up.append(middle_tip['y'] < middle_pip['y'])
-            fingers_up.append(ring_tip['y'] < ring_pip['y'])
-            fingers_up.append(pinky_tip['y'] < pinky_pip['y'])
-            
-            total_fingers = sum(fingers_up)
-            
-            if total_fingers == 0: return 'rock'
-            if total_fingers == 5: return 'paper'
-            if total_fingers == 2 and fingers_up[1] and fingers_up[2]: return 'scissors'
-            if total_fingers == 1 and fingers_up[1]: return 'point'
-            if total_fingers == 1 and fingers_up[0]: return 'thumbs_up'
-            if total_fingers >= 4: return 'wave'
-            
-            return 'open_palm'
+            return gesture_table.classify(as_array(landmarks, HAND_FIELDS)[:21])
         except Exception as e:
             print(f"Error classifying gesture: {e}")
             return 'none'
 
-    def detect_pose_landmarks(self, frame_bytes):
-        """Detect pose landmarks using MediaPipe."""
+    def detect_pose_landmarks(self, frame_bytes, pose=None, draw=True):
+        """Detect pose landmarks using MediaPipe (arguments as for detect_hand_landmarks)."""
         try:
-            nparr = np.frombuffer(base64.b64decode(frame_bytes), np.uint8)
-            img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+            img = decode_frame(frame_bytes)
             if img is None: return None, None
             
             img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-            results = self.pose.process(img_rgb)
-            img_bgr = cv2.cvtColor(img_rgb, cv2.COLOR_RGB2BGR) # For drawing
+            results = self._process(pose, self.pose_graphs, img_rgb)
+            img_bgr = cv2.cvtColor(img_rgb, cv2.COLOR_RGB2BGR) if draw else None # For drawing
             
             pose_landmarks_data = None
             if results.pose_landmarks:
-                self.mp_draw.draw_landmarks(
-                    img_bgr, results.pose_landmarks, self.mp_pose.POSE_CONNECTIONS,
-                    self.mp_draw.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=2),
-                    self.mp_draw.DrawingSpec(color=(0, 255, 0), thickness=2)
-                )
-                pose_landmarks_data = [{'x': lm.x, 'y': lm.y, 'z': lm.z, 'visibility': lm.visibility} for lm in results.pose_landmarks.landmark]
+                if draw:
+                    self.mp_draw.draw_landmarks(
+                        img_bgr, results.pose_landmarks, self.mp_pose.POSE_CONNECTIONS,
+                        self.mp_draw.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=2),
+                        self.mp_draw.DrawingSpec(color=(0, 255, 0), thickness=2)
+                    )
+                pose_landmarks_data = from_mediapipe(results.pose_landmarks, POSE_FIELDS)
             
             return pose_landmarks_data, img_bgr
             
@@ -289,18 +300,15 @@ class DyspraxiaAI:
 
     def analyze_balance_pose(self, pose_landmarks):
         """Analyze balance from pose landmarks."""
-        if not pose_landmarks or len(pose_landmarks) < 33:
+        if pose_landmarks is None or len(pose_landmarks) < 33:
             return {'balance_score': 0, 'feedback': ['No pose detected']}
         try:
-            left_hip, right_hip = pose_landmarks[23], pose_landmarks[24]
-            left_ankle, right_ankle = pose_landmarks[27], pose_landmarks[28]
-            left_shoulder, right_shoulder = pose_landmarks[11], pose_landmarks[12]
-            
-            center_x = (left_hip['x'] + right_hip['x']) / 2
-            center_y = (left_hip['y'] + right_hip['y']) / 2
-            
-            hip_width = abs(left_hip['x'] - right_hip['x'])
-            shoulder_level = abs(left_shoulder['y'] - right_shoulder['y'])
+            points = as_array(pose_landmarks, POSE_FIELDS).astype(np.float64)
+            hips = points[[POSE_LANDMARKS['left_hip'], POSE_LANDMARKS['right_hip']], :2]
+            shoulders_y = points[[POSE_LANDMARKS['left_shoulder'], POSE_LANDMARKS['right_shoulder']], 1]
+
+            center_x, center_y = hips.mean(axis=0).tolist()
+            shoulder_level = abs(shoulders_y[0] - shoulders_y[1])
             
             balance_score = 100
             feedback = []
@@ -323,6 +331,28 @@ class DyspraxiaAI:
             print(f"Error analyzing balance: {e}")
             return {'balance_score': 0, 'feedback': ['Analysis error']}
 
+    def evaluate_movement(self, pose_landmarks, movement_type):
+        """Whether pose landmarks show the requested camera exercise movement, with feedback.
+
+        Movements are rule entries in utils.pose_rules.MOVEMENT_RULES;
+        evaluate_movements checks all of them at once.
+        """
+        rule = MOVEMENT_RULES.get(movement_type)
+        if pose_landmarks is None:
+            return False, ['No pose detected.']
+        if rule is None:
+            return False, ['Unknown movement type.']
+        detected = movement_rules.check(as_array(pose_landmarks, POSE_FIELDS), movement_type)
+        return detected, [rule['success'] if detected else rule['hint']]
+
+    def evaluate_movements(self, pose_landmarks):
+        """{movement: detected} for every camera exercise movement, for one frame's pose landmarks
+        or (as arrays of flags) a batch of them stacked as (frames, 33, 4)"""
+        pose_landmarks = np.asarray(pose_landmarks)
+        if pose_landmarks.ndim == 2:
+            return movement_rules.check_all(pose_landmarks)
+        results = movement_rules.evaluate(pose_landmarks)
+        return {name: results[..., i] for i, name in enumerate(movement_rules.names)}
 
     # Frame saving is disabled to reduce storage usage on deployment
     def save_correct_pose_frame(self, img, user_id, exercise_name, timer):
@@ -376,7 +406,65 @@ class DyspraxiaAI:
             print(f"Error saving game data: {e}")
             return False
 
-dyspraxia_ai = DyspraxiaAI()
+class RemoteDyspraxiaAI(DyspraxiaAI):
+    """DyspraxiaAI whose MediaPipe graphs live in the shared model server."""
+
+    def __init__(self, socket_path):
+        from model_server import ModelServerClient
+        self.client = ModelServerClient(socket_path)
+        super().__init__()
+
+    def _create_graphs(self):
+        self.hand_graphs = None
+        self.pose_graphs = None
+
+    def create_hands(self, static_image_mode=False):
+        return None  # Streams share the server's graphs
+
+    def create_pose(self, static_image_mode=False):
+        return None
+
+    @staticmethod
+    def _decode_image(image_b64):
+        return decode_frame(image_b64) if image_b64 else None
+
+    def detect_hand_landmarks(self, frame_bytes, hands=None, draw=True):
+        """Detect hand landmarks via the model server."""
+        try:
+            result = self.client.call('detect_hand_landmarks', frame=frame_to_text(frame_bytes), draw=draw)
+            return unpack_landmarks(result['landmarks']), result['gesture'], self._decode_image(result['image'])
+        except Exception as e:
+            print(f"Error in hand detection: {e}")
+            return None, 'none', None
+
+    def detect_pose_landmarks(self, frame_bytes, pose=None, draw=True):
+        """Detect pose landmarks via the model server."""
+        try:
+            result = self.client.call('detect_pose_landmarks', frame=frame_to_text(frame_bytes), draw=draw)
+            return unpack_landmarks(result['landmarks']), self._decode_image(result['image'])
+        except Exception as e:
+            print(f"Error in pose detection: {e}")
+            return None, None
+
+if Config.MODEL_SERVER_SOCKET:
+    dyspraxia_ai = RemoteDyspraxiaAI(Config.MODEL_SERVER_SOCKET)
+else:
+    dyspraxia_ai = DyspraxiaAI()
+
+# Open /dyspraxia/stream sessions in this worker, across all modes; each holds a gunicorn thread
+stream_slots = threading.BoundedSemaphore(Config.VISION_STREAM_MAX_SESSIONS)
+
+# Tracker graphs for /dyspraxia/stream, one per open stream
+stream_trackers = {
+    'hands': TrackerPool(dyspraxia_ai.create_hands, Config.VISION_STREAM_MAX_SESSIONS, Config.VISION_POOL_IDLE_TIMEOUT),
+    'pose': TrackerPool(dyspraxia_ai.create_pose, Config.VISION_STREAM_MAX_SESSIONS, Config.VISION_POOL_IDLE_TIMEOUT)
+}
+
+def vision_stats():
+    """Wait time and utilization of the MediaPipe graph pools in this worker"""
+    pools = {'hands': dyspraxia_ai.hand_graphs, 'pose': dyspraxia_ai.pose_graphs,
+             'stream_hands': stream_trackers['hands'], 'stream_pose': stream_trackers['pose']}
+    return {name: pool.stats() for name, pool in pools.items() if pool is not None}
 
 # --- Navigation Routes ---
 @dyspraxia_bp.route('/')
@@ -387,7 +475,7 @@ def main():
 @dyspraxia_bp.route('/balance-training')
 def balance_training():
     if 'user_id' not in session: return redirect(url_for('auth.login'))
-    return render_template('dyspraxia/balance_training.html')
+    return render_template('dyspraxia/balance_training.html', streaming=Sock is not None)
 
 @dyspraxia_bp.route('/coordination-games')
 def coordination_games():
@@ -466,114 +554,19 @@ camera_exercises_list = [
 @dyspraxia_bp.route('/camera-exercises')
 def camera_exercises():
     if 'user_id' not in session: return redirect(url_for('auth.login'))
-    return render_template('dyspraxia/camera_exercises.html', exercises=camera_exercises_list)
+    return render_template('dyspraxia/camera_exercises.html', exercises=camera_exercises_list, streaming=Sock is not None)
 
 # --- Camera Exercise API: Detect Movement ---
 @dyspraxia_bp.route('/detect-movement', methods=['POST'])
 def detect_movement():
     if 'user_id' not in session: return jsonify({'success': False, 'message': 'Not logged in'})
-    data = request.get_json()
-    frame_data = data.get('frame', '')
+    frame_data, data = read_frame_upload(request)
     movement_type = data.get('movement', '')
     if not frame_data or not movement_type:
         return jsonify({'success': False, 'message': 'Missing frame or movement type'})
     try:
-        pose_landmarks, img = dyspraxia_ai.detect_pose_landmarks(frame_data)
-        detected = False
-        feedback = []
-        if pose_landmarks:
-            # Movement detection logic
-            if movement_type == 'arm_raise':
-                # Both wrists above shoulders
-                left_wrist = pose_landmarks[15]
-                right_wrist = pose_landmarks[16]
-                left_shoulder = pose_landmarks[11]
-                right_shoulder = pose_landmarks[12]
-                if left_wrist['y'] < left_shoulder['y'] and right_wrist['y'] < right_shoulder['y']:
-                    detected = True
-                    feedback.append('Arms raised correctly!')
-                else:
-                    feedback.append('Raise both arms above your head.')
-            elif movement_type == 'side_step':
-                # Detect lateral movement by ankle x distance
-                left_ankle = pose_landmarks[27]
-                right_ankle = pose_landmarks[28]
-                if abs(left_ankle['x'] - right_ankle['x']) > 0.35:
-                    detected = True
-                    feedback.append('Good side step!')
-                else:
-                    feedback.append('Step wider to the side.')
-            elif movement_type == 'march_in_place':
-                # At least one knee above hip
-                left_knee = pose_landmarks[25]
-                right_knee = pose_landmarks[26]
-                left_hip = pose_landmarks[23]
-                right_hip = pose_landmarks[24]
-                if left_knee['y'] < left_hip['y'] or right_knee['y'] < right_hip['y']:
-                    detected = True
-                    feedback.append('Great knee lift!')
-                else:
-                    feedback.append('Lift your knees higher.')
-            elif movement_type == 'squat_hold':
-                # Hip below knee
-                left_hip = pose_landmarks[23]
-                right_hip = pose_landmarks[24]
-                left_knee = pose_landmarks[25]
-                right_knee = pose_landmarks[26]
-                if left_hip['y'] > left_knee['y'] and right_hip['y'] > right_knee['y']:
-                    detected = True
-                    feedback.append('Squat position held!')
-                else:
-                    feedback.append('Lower your hips more.')
-            elif movement_type == 'torso_twist':
-                # Shoulders rotated (difference in x)
-                left_shoulder = pose_landmarks[11]
-                right_shoulder = pose_landmarks[12]
-                if abs(left_shoulder['x'] - right_shoulder['x']) > 0.25:
-                    detected = True
-                    feedback.append('Good torso twist!')
-                else:
-                    feedback.append('Twist your torso more.')
-            elif movement_type == 'jumping_jacks':
-                # Wrists above head and ankles apart
-                left_wrist = pose_landmarks[15]
-                right_wrist = pose_landmarks[16]
-                left_ankle = pose_landmarks[27]
-                right_ankle = pose_landmarks[28]
-                head = pose_landmarks[0]
-                if left_wrist['y'] < head['y'] and right_wrist['y'] < head['y'] and abs(left_ankle['x'] - right_ankle['x']) > 0.4:
-                    detected = True
-                    feedback.append('Jumping jack detected!')
-                else:
-                    feedback.append('Jump higher and spread your feet.')
-            elif movement_type == 'heel_walk':
-                # Toes above heels (simulate by ankle/foot landmarks)
-                left_heel = pose_landmarks[29]
-                right_heel = pose_landmarks[30]
-                left_foot_index = pose_landmarks[31]
-                right_foot_index = pose_landmarks[32]
-                if left_foot_index['y'] < left_heel['y'] and right_foot_index['y'] < right_heel['y']:
-                    detected = True
-                    feedback.append('Heel walk detected!')
-                else:
-                    feedback.append('Lift your toes up for heel walk.')
-            elif movement_type == 'balance_reach':
-                # One foot on ground, both hands forward (wrists in front of hips)
-                left_ankle = pose_landmarks[27]
-                right_ankle = pose_landmarks[28]
-                left_wrist = pose_landmarks[15]
-                right_wrist = pose_landmarks[16]
-                left_hip = pose_landmarks[23]
-                right_hip = pose_landmarks[24]
-                if (left_wrist['y'] < left_hip['y'] and right_wrist['y'] < right_hip['y']) and (abs(left_ankle['y'] - right_ankle['y']) > 0.2):
-                    detected = True
-                    feedback.append('Balance reach detected!')
-                else:
-                    feedback.append('Reach forward and balance on one foot.')
-            else:
-                feedback.append('Unknown movement type.')
-        else:
-            feedback.append('No pose detected.')
+        pose_landmarks, img = dyspraxia_ai.detect_pose_landmarks(frame_data, draw=False)
+        detected, feedback = dyspraxia_ai.evaluate_movement(pose_landmarks, movement_type)
         return jsonify({'success': True, 'detected': detected, 'feedback': feedback})
     except Exception as e:
         return jsonify({'success': False, 'message': f'Error detecting movement: {str(e)}'}), 500
@@ -599,32 +592,36 @@ def save_camera_exercise():
         return jsonify({'success': False, 'message': f'Error saving result: {str(e)}'}), 500
 
 # --- Balance Training API Routes ---
+def balance_frame_result(pose_landmarks, timer):
+    """Balance check payload for one frame of a balance exercise."""
+    pose_correct, balance_score, feedback = False, 0, ["No pose detected."]
+
+    if pose_landmarks is not None:
+        analysis = dyspraxia_ai.analyze_balance_pose(pose_landmarks)
+        balance_score, feedback = analysis.get('balance_score', 0), analysis.get('feedback', [])
+        if balance_score > 70: pose_correct = True
+
+    # Frame saving disabled: do not write to disk
+    frame_saved, saved_path = False, None
+    # if pose_correct and img is not None:
+    #     frame_saved, saved_path = dyspraxia_ai.save_correct_pose_frame(img, session['user_id'], exercise_name, timer)
+    return {
+        'pose_correct': pose_correct, 'balance_score': balance_score,
+        'feedback': feedback, 'frame_saved': frame_saved, 'saved_path': saved_path,
+        'autoend': timer <= 0, 'timer': timer
+    }
+
 @dyspraxia_bp.route('/process-frame', methods=['POST'])
 def process_frame():
     """Process frame for balance exercises using MediaPipe."""
     if 'user_id' not in session: return jsonify({'success': False, 'message': 'Not logged in'})
-    data = request.get_json()
-    frame_data = data.get('frame', ''); exercise_name = data.get('exercise_name', ''); timer = data.get('timer', 0)
+    frame_data, data = read_frame_upload(request)
+    exercise_name = data.get('exercise_name', ''); timer = float(data.get('timer') or 0)
     if not frame_data or not exercise_name: return jsonify({'success': False, 'message': 'Missing frame or exercise name'})
     
     try:
-        pose_landmarks, img = dyspraxia_ai.detect_pose_landmarks(frame_data)
-        pose_correct, balance_score, feedback = False, 0, ["No pose detected."]
-
-        if pose_landmarks:
-            analysis = dyspraxia_ai.analyze_balance_pose(pose_landmarks)
-            balance_score, feedback = analysis.get('balance_score', 0), analysis.get('feedback', [])
-            if balance_score > 70: pose_correct = True
-        
-        # Frame saving disabled: do not write to disk
-        frame_saved, saved_path = False, None
-        # if pose_correct and img is not None:
-        #     frame_saved, saved_path = dyspraxia_ai.save_correct_pose_frame(img, session['user_id'], exercise_name, timer)
-        return jsonify({
-            'success': True, 'pose_correct': pose_correct, 'balance_score': balance_score,
-            'feedback': feedback, 'frame_saved': frame_saved, 'saved_path': saved_path,
-            'autoend': timer <= 0, 'timer': timer
-        })
+        pose_landmarks, img = dyspraxia_ai.detect_pose_landmarks(frame_data, draw=False)
+        return jsonify({'success': True, **balance_frame_result(pose_landmarks, timer)})
     except Exception as e:
         return jsonify({'success': False, 'message': f'Error processing frame: {str(e)}'}), 500
 
@@ -655,19 +652,35 @@ def submit_balance_result():
         return jsonify({'success': False, 'message': f'Error saving progress: {str(e)}'}), 500
 
 # --- Coordination Games API Routes ---
+def landmarks_only(frame_data, data):
+    """Whether to answer with packed landmarks instead of a drawn overlay frame.
+
+    The 'response' parameter asks for 'landmarks' or 'frame'. Without it,
+    binary uploads (the current pages, which draw the overlay themselves)
+    get landmarks and JSON base64 uploads (older clients) get the frame.
+    """
+    response = data.get('response') or ('frame' if isinstance(frame_data, str) else 'landmarks')
+    return response == 'landmarks'
+
 @dyspraxia_bp.route('/detect-hand-gesture', methods=['POST'])
 def detect_hand_gesture():
     if 'user_id' not in session: return jsonify({'success': False, 'message': 'Not logged in'})
-    frame_data = request.get_json().get('frame', '')
+    frame_data, data = read_frame_upload(request)
     if not frame_data: return jsonify({'success': False, 'message': 'No frame data'})
     try:
-        hand_landmarks, gesture, processed_img = dyspraxia_ai.detect_hand_landmarks(frame_data)
+        compact = landmarks_only(frame_data, data)
+        hand_landmarks, gesture, processed_img = dyspraxia_ai.detect_hand_landmarks(frame_data, draw=not compact)
+        if compact:
+            return jsonify({
+                'success': True, 'gesture': gesture, 'hand_detected': hand_landmarks is not None,
+                'landmarks': pack_landmarks(hand_landmarks, HAND_FIELDS)
+            })
         processed_frame = None
         if processed_img is not None:
             _, buffer = cv2.imencode('.jpg', processed_img); processed_frame = base64.b64encode(buffer).decode('utf-8')
         return jsonify({
             'success': True, 'gesture': gesture, 'hand_detected': hand_landmarks is not None,
-            'landmarks': hand_landmarks, 'processed_frame': processed_frame
+            'landmarks': to_dicts(hand_landmarks, HAND_FIELDS), 'processed_frame': processed_frame
         })
     except Exception as e:
         return jsonify({'success': False, 'message': f'Error detecting gesture: {str(e)}'}), 500
@@ -675,16 +688,22 @@ def detect_hand_gesture():
 @dyspraxia_bp.route('/detect-pose', methods=['POST'])
 def detect_pose():
     if 'user_id' not in session: return jsonify({'success': False, 'message': 'Not logged in'})
-    frame_data = request.get_json().get('frame', '')
+    frame_data, data = read_frame_upload(request)
     if not frame_data: return jsonify({'success': False, 'message': 'No frame data'})
     try:
-        pose_landmarks, processed_img = dyspraxia_ai.detect_pose_landmarks(frame_data)
-        balance_analysis = dyspraxia_ai.analyze_balance_pose(pose_landmarks) if pose_landmarks else None
+        compact = landmarks_only(frame_data, data)
+        pose_landmarks, processed_img = dyspraxia_ai.detect_pose_landmarks(frame_data, draw=not compact)
+        balance_analysis = dyspraxia_ai.analyze_balance_pose(pose_landmarks) if pose_landmarks is not None else None
+        if compact:
+            return jsonify({
+                'success': True, 'pose_detected': pose_landmarks is not None,
+                'pose_landmarks': pack_landmarks(pose_landmarks, POSE_FIELDS), 'balance_analysis': balance_analysis
+            })
         processed_frame = None
         if processed_img is not None:
             _, buffer = cv2.imencode('.jpg', processed_img); processed_frame = base64.b64encode(buffer).decode('utf-8')
         return jsonify({
-            'success': True, 'pose_detected': pose_landmarks is not None, 'pose_landmarks': pose_landmarks,
+            'success': True, 'pose_detected': pose_landmarks is not None, 'pose_landmarks': to_dicts(pose_landmarks, POSE_FIELDS),
             'balance_analysis': balance_analysis, 'processed_frame': processed_frame
         })
     except Exception as e:
@@ -709,31 +728,24 @@ def save_game_results():
 def get_game_stats():
     if 'user_id' not in session: return jsonify({'success': False, 'message': 'Not logged in'})
     try:
-        user_games = [g for g in file_manager.read_csv('data/dyspraxia/games.csv') if g.get('user_id') == session['user_id']]
-        if not user_games: raise FileNotFoundError
-        total_games = len(user_games)
-        game_counts = {}
-        for game in user_games: game_counts[game.get('game_type')] = game_counts.get(game.get('game_type'), 0) + 1
-        stats = {
-            'total_games': total_games,
-            'average_accuracy': round(sum(float(g.get('accuracy', 0)) for g in user_games) / total_games, 1),
-            'total_time_played': round(sum(float(g.get('game_time', 0)) for g in user_games)),
-            'favorite_game': max(game_counts.items(), key=lambda item: item[1])[0],
-            'game_breakdown': game_counts,
-            'recent_scores': [float(g.get('accuracy', 0)) for g in user_games[-5:]]
-        }
+        stats = aggregate_store.get(session['user_id']).game_stats()
         return jsonify({'success': True, 'stats': stats})
-    except (FileNotFoundError, IndexError):
-        return jsonify({'success': True, 'stats': {'total_games': 0, 'average_accuracy': 0, 'total_time_played': 0, 'favorite_game': 'N/A', 'game_breakdown': {}, 'recent_scores': []}})
     except Exception as e:
         return jsonify({'success': False, 'message': f'Error getting stats: {str(e)}'}), 500
 
 @dyspraxia_bp.route('/validate-gesture', methods=['POST'])
 def validate_gesture():
     if 'user_id' not in session: return jsonify({'success': False, 'message': 'Not logged in'})
-    data = request.get_json(); frame_data = data.get('frame', ''); expected_gesture = data.get('expected_gesture', '')
+    frame_data, data = read_frame_upload(request); expected_gesture = data.get('expected_gesture', '')
     try:
-        hand_landmarks, detected_gesture, processed_img = dyspraxia_ai.detect_hand_landmarks(frame_data)
+        compact = landmarks_only(frame_data, data)
+        hand_landmarks, detected_gesture, processed_img = dyspraxia_ai.detect_hand_landmarks(frame_data, draw=not compact)
+        if compact:
+            return jsonify({
+                'success': True, 'detected_gesture': detected_gesture, 'expected_gesture': expected_gesture,
+                'is_correct': detected_gesture == expected_gesture, 'hand_detected': hand_landmarks is not None,
+                'landmarks': pack_landmarks(hand_landmarks, HAND_FIELDS)
+            })
         processed_frame = None
         if processed_img is not None:
             _, buffer = cv2.imencode('.jpg', processed_img); processed_frame = base64.b64encode(buffer).decode('utf-8')
@@ -743,4 +755,99 @@ def validate_gesture():
             'processed_frame': processed_frame
         })
     except Exception as e:
-        return jsonify({'success': False, 'message': f'Error validating gesture: {str(e)}'}), 500
\ No newline at end of file
+        return jsonify({'success': False, 'message': f'Error validating gesture: {str(e)}'}), 500
+
+# --- Camera Streaming (WebSocket) ---
+def _stream_movement(frame, params, tracker):
+    pose_landmarks, _ = dyspraxia_ai.detect_pose_landmarks(frame, tracker, draw=False)
+    detected, feedback = dyspraxia_ai.evaluate_movement(pose_landmarks, params.get('movement', ''))
+    return {'detected': detected, 'feedback': feedback}
+
+def _stream_balance(frame, params, tracker):
+    pose_landmarks, _ = dyspraxia_ai.detect_pose_landmarks(frame, tracker, draw=False)
+    return balance_frame_result(pose_landmarks, float(params.get('timer') or 0))
+
+def _stream_gesture(frame, params, tracker):
+    hand_landmarks, gesture, _ = dyspraxia_ai.detect_hand_landmarks(frame, tracker, draw=False)
+    result = {'gesture': gesture, 'hand_detected': hand_landmarks is not None,
+              'landmarks': pack_landmarks(hand_landmarks, HAND_FIELDS)}
+    if params.get('expected_gesture'):
+        result['is_correct'] = gesture == params['expected_gesture']
+    return result
+
+# mode: (tracker pool, frame handler)
+STREAM_MODES = {
+    'movement': ('pose', _stream_movement),
+    'balance': ('pose', _stream_balance),
+    'gesture': ('hands', _stream_gesture)
+}
+
+def stream_frames(ws):
+    """Camera frames for one exercise session over a WebSocket.
+
+    The first message is JSON text with the mode ('movement', 'balance'
+    or 'gesture') and its parameters (movement, timer, expected_gesture).
+    After that, binary messages are encoded frames and JSON text messages
+    update the parameters. Each processed frame is answered with a JSON
+    result. The session gets its own tracker graph from a bounded pool,
+    so tracking state never mixes between children. Frames that queue up
+    while one is being processed are dropped except the newest.
+    """
+    def send(message):
+        ws.send(json.dumps(message))
+
+    if 'user_id' not in session:
+        return send({'type': 'error', 'message': 'Not logged in'})
+    # Refuse straight away, before waiting for the first message, so streams never take
+    # the threads Config.VISION_STREAM_RESERVED_THREADS keeps for other requests
+    if not stream_slots.acquire(blocking=False):
+        return send({'type': 'error', 'message': 'Too many camera streams are open; using uploads instead'})
+    try:
+        run_stream(ws, send)
+    finally:
+        stream_slots.release()
+
+def run_stream(ws, send):
+    """stream_frames body for a session that holds a stream slot"""
+    try:
+        params = json.loads(ws.receive(timeout=Config.VISION_STREAM_IDLE_TIMEOUT) or '{}')
+    except (TypeError, ValueError):
+        params = {}
+    if params.get('mode') not in STREAM_MODES:
+        return send({'type': 'error', 'message': 'Unknown stream mode'})
+    pool_name, handle_frame = STREAM_MODES[params['mode']]
+    pool = stream_trackers[pool_name]
+    try:
+        tracker = pool.checkout(timeout=0)
+    except TimeoutError:
+        return send({'type': 'error', 'message': 'Too many camera streams are open; using uploads instead'})
+
+    try:
+        send({'type': 'ready'})
+        while True:
+            message = ws.receive(timeout=Config.VISION_STREAM_IDLE_TIMEOUT)
+            if message is None:
+                break  # Idle stream: free the tracker
+            frame, frames = None, 0
+            while message is not None:
+                if isinstance(message, str):
+                    try:
+                        params.update(json.loads(message))
+                    except (TypeError, ValueError):
+                        pass
+                else:
+                    frame, frames = message, frames + 1
+                message = ws.receive(timeout=0)
+            if frame is None:
+                continue
+            try:
+                result = {'type': 'result', 'success': True, **handle_frame(frame, params, tracker)}
+            except Exception as e:
+                result = {'type': 'result', 'success': False, 'message': f'Error processing frame: {str(e)}'}
+            result['dropped_frames'] = frames - 1
+            send(result)
+    finally:
+        pool.checkin(tracker)
+
+if Sock is not None:
+    Sock().route('/stream', bp=dyspraxia_bp)(stream_frames)
@@ -10,4 +10,4 @@ python -c "import nltk; nltk.download('punkt'); nltk.download('stopwords'); nltk
 mkdir -p data/users data/progress data/dyslexia data/dyscalculia data/dysgraphia data/dyspraxia data/ai_models static/uploads static/user_data
 
 # Start the application
-gunicorn --bind 0.0.0.0:$PORT wsgi:app
+gunicorn --threads=${WEB_THREADS:-8} --bind 0.0.0.0:$PORT wsgi:app
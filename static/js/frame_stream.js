@@ -0,0 +1,67 @@
+// Streams camera frames to /dyspraxia/stream over one WebSocket.
+// Only one frame is in flight at a time: frames captured while waiting for
+// a result replace each other, so the server always gets the newest one.
+class FrameStream {
+    constructor(mode, params, onResult) {
+        this.mode = mode;
+        this.params = params || {};
+        this.onResult = onResult;
+        this.ws = null;
+        this.pending = null;
+        this.inFlight = false;
+    }
+
+    // Resolves true once the server is ready, false if streaming is unavailable
+    open() {
+        return new Promise(resolve => {
+            if (!window.WebSocket) return resolve(false);
+            const scheme = location.protocol === 'https:' ? 'wss' : 'ws';
+            const ws = new WebSocket(`${scheme}://${location.host}/dyspraxia/stream`);
+            ws.onopen = () => ws.send(JSON.stringify({ mode: this.mode, ...this.params }));
+            ws.onmessage = event => {
+                const message = JSON.parse(event.data);
+                if (message.type === 'ready') {
+                    this.ws = ws;
+                    resolve(true);
+                } else if (message.type === 'error') {
+                    console.warn('Frame stream:', message.message);
+                    ws.close();
+                } else if (message.type === 'result') {
+                    this.inFlight = false;
+                    this.flush();
+                    this.onResult(message);
+                }
+            };
+            ws.onclose = () => {
+                if (this.ws !== ws) resolve(false);
+                this.ws = null;
+                this.inFlight = false;
+            };
+        });
+    }
+
+    get connected() {
+        return this.ws !== null && this.ws.readyState === WebSocket.OPEN;
+    }
+
+    // frame is a JPEG Blob; params (optional) update the stream parameters
+    send(frame, params) {
+        this.pending = { frame, params };
+        this.flush();
+    }
+
+    flush() {
+        if (!this.connected || this.inFlight || !this.pending) return;
+        const { frame, params } = this.pending;
+        this.pending = null;
+        if (params) this.ws.send(JSON.stringify(params));
+        this.ws.send(frame);
+        this.inFlight = true;
+    }
+
+    close() {
+        if (this.ws) this.ws.close();
+        this.ws = null;
+        this.pending = null;
+    }
+}
@@ -0,0 +1,45 @@
+// Client-side landmark overlay for the dyspraxia camera pages.
+// The server sends landmarks packed as {shape: [n, fields], data: base64 float32}
+// (utils/landmarks.py) and the page draws them over its own video frame.
+const HAND_CONNECTIONS = [
+    [0, 1], [0, 5], [0, 17], [1, 2], [2, 3], [3, 4], [5, 6], [5, 9], [6, 7], [7, 8], [9, 10],
+    [9, 13], [10, 11], [11, 12], [13, 14], [13, 17], [14, 15], [15, 16], [17, 18], [18, 19], [19, 20]
+];
+const POSE_CONNECTIONS = [
+    [0, 1], [0, 4], [1, 2], [2, 3], [3, 7], [4, 5], [5, 6], [6, 8], [9, 10], [11, 12], [11, 13],
+    [11, 23], [12, 14], [12, 24], [13, 15], [14, 16], [15, 17], [15, 19], [15, 21], [16, 18], [16, 20],
+    [16, 22], [17, 19], [18, 20], [23, 24], [23, 25], [24, 26], [25, 27], [26, 28], [27, 29], [27, 31],
+    [28, 30], [28, 32], [29, 31], [30, 32]
+];
+
+// Array of per-landmark Float32Array rows ([x, y, z] or [x, y, z, visibility]), or null
+function unpackLandmarks(packed) {
+    if (!packed) return null;
+    const bytes = Uint8Array.from(atob(packed.data), c => c.charCodeAt(0));
+    const values = new Float32Array(bytes.buffer);
+    const [count, fields] = packed.shape;
+    const rows = [];
+    for (let i = 0; i < count; i++) rows.push(values.subarray(i * fields, (i + 1) * fields));
+    return rows;
+}
+
+// Same look as the server-drawn overlay: green lines and joints, coordinates normalized to the canvas
+function drawLandmarks(ctx, landmarks, connections, width, height) {
+    if (!landmarks) return;
+    ctx.save();
+    ctx.strokeStyle = '#00ff00';
+    ctx.fillStyle = '#00ff00';
+    ctx.lineWidth = 2;
+    ctx.beginPath();
+    for (const [from, to] of connections) {
+        ctx.moveTo(landmarks[from][0] * width, landmarks[from][1] * height);
+        ctx.lineTo(landmarks[to][0] * width, landmarks[to][1] * height);
+    }
+    ctx.stroke();
+    for (const point of landmarks) {
+        ctx.beginPath();
+        ctx.arc(point[0] * width, point[1] * height, 2, 0, 2 * Math.PI);
+        ctx.fill();
+    }
+    ctx.restore();
+}
@@ -0,0 +1,61 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_helpers import AIHelpers, InferenceScheduler  # noqa: E402
+
+
+class RecordingPipeline:
+    """Stand-in text2text pipeline that records each call's prompts"""
+
+    def __init__(self, gate=None):
+        self.calls = []
+        self.gate = gate
+
+    def __call__(self, prompts, **settings):
+        if self.gate is not None:
+            self.gate.wait()
+        self.calls.append((list(prompts), settings))
+        return [{'generated_text': prompt.upper()} for prompt in prompts]
+
+
+def test_texts_of_different_lengths_share_one_pipeline_call():
+    helpers = AIHelpers({'USE_LOCAL_MODELS': False, 'AI_DO_SAMPLE': False})
+    short_text = 'The cat sat on the mat.'
+    long_text = 'The enormous committee will subsequently demonstrate that the proposal is necessary.'
+    short_settings = helpers._generation_settings(short_text)
+    long_settings = helpers._generation_settings(long_text)
+
+    pipeline = RecordingPipeline()
+    scheduler = InferenceScheduler(window_ms=200, max_batch_size=2)
+    results = {}
+
+    def generate(text, settings):
+        results[text] = scheduler.generate(pipeline, text, settings, timeout=5)
+
+    threads = [threading.Thread(target=generate, args=args)
+               for args in ((short_text, short_settings), (long_text, long_settings))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(pipeline.calls) == 1
+    assert sorted(pipeline.calls[0][0]) == sorted([short_text, long_text])
+    assert results == {short_text: short_text.upper(), long_text: long_text.upper()}
+
+
+def test_scheduler_keeps_running_when_every_queued_prompt_times_out():
+    scheduler = InferenceScheduler(window_ms=200, max_batch_size=4)
+    # Withdrawn while the scheduler is still collecting its batch
+    with pytest.raises(TimeoutError):
+        scheduler.generate(RecordingPipeline(), 'withdrawn', {'max_length': 32}, timeout=0.02)
+    time.sleep(0.3)
+
+    assert scheduler.worker.is_alive()
+    assert scheduler.generate(RecordingPipeline(), 'after', {'max_length': 32}, timeout=5) == 'AFTER'
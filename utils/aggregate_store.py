@@ -0,0 +1,164 @@
+import json
+import math
+import os
+import re
+import threading
+from contextlib import contextmanager
+from utils.file_manager import file_manager
+from utils.progress_stats import SOURCES, ProgressAggregator, aggregate_user_progress, dump_state, load_state
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to the in-process lock only
+    fcntl = None
+
+
+class AggregateStore:
+    """Materialized per-user progress totals, updated on every write.
+
+    Each user has a small JSON file under data/aggregates holding the
+    running totals of ProgressAggregator. FileManager.append_csv feeds
+    new rows in through an append hook, so dashboard and game-stats reads
+    cost one small file read instead of a pass over the CSVs. A user
+    without a file is rebuilt from the CSVs on first access.
+    """
+
+    def __init__(self, base_path='data/aggregates'):
+        self.base_path = base_path
+        self.lock = threading.Lock()
+        self.sources = {os.path.normpath(source): source for source in SOURCES}
+
+    def _path(self, user_id):
+        safe_id = re.sub(r'[^A-Za-z0-9_.-]', '_', str(user_id))
+        return os.path.join(self.base_path, f'{safe_id}.json')
+
+    @contextmanager
+    def _exclusive(self):
+        """Serialize writers across threads and worker processes"""
+        with self.lock:
+            if fcntl is None:
+                yield
+                return
+            os.makedirs(self.base_path, exist_ok=True)
+            with open(os.path.join(self.base_path, '.lock'), 'a') as handle:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _read(self, user_id):
+        try:
+            with open(self._path(user_id), 'r', encoding='utf-8') as file:
+                return load_state(json.load(file))
+        except FileNotFoundError:
+            return None
+
+    def _write(self, user_id, state):
+        os.makedirs(self.base_path, exist_ok=True)
+        path = self._path(user_id)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(dump_state(state), file)
+        os.replace(tmp_path, path)
+
+    def get(self, user_id):
+        """Return the aggregator for a user, building it from the CSVs if needed"""
+        state = self._read(user_id)
+        if state is None:
+            state = self.rebuild_user(user_id)
+        return ProgressAggregator(state)
+
+    def rebuild_user(self, user_id):
+        """Recompute one user's totals from the CSV files"""
+        with self._exclusive():
+            state = aggregate_user_progress(file_manager, user_id).state
+            self._write(user_id, state)
+        return state
+
+    def record_append(self, filepath, row):
+        """Append hook: fold a freshly written row into its user's totals"""
+        source = self.sources.get(filepath)
+        user_id = row.get('user_id')
+        if source is None or user_id is None:
+            return
+        try:
+            with self._exclusive():
+                state = self._read(user_id)
+                if state is None:
+                    # First write for this user: the CSVs already contain the row
+                    state = aggregate_user_progress(file_manager, user_id).state
+                else:
+                    ProgressAggregator(state).add(source, row)
+                self._write(user_id, state)
+        except Exception:
+            # The row is in the CSV but not in the totals: drop them so the next read rebuilds
+            self.invalidate(user_id)
+            raise
+
+    def invalidate(self, user_id):
+        """Discard a user's stored totals; the next get() rebuilds them from the CSVs"""
+        with self._exclusive():
+            try:
+                os.remove(self._path(user_id))
+            except FileNotFoundError:
+                pass
+
+    def _recompute_all(self):
+        """Fold every source CSV into fresh per-user aggregators"""
+        aggregators = {}
+        for source in SOURCES:
+            for row in file_manager.read_csv(source):
+                user_id = row.get('user_id')
+                if user_id is None:
+                    continue
+                aggregators.setdefault(user_id, ProgressAggregator()).add(source, row)
+        return aggregators
+
+    def rebuild(self):
+        """Recompute every user's totals from the CSVs; returns the user count"""
+        with self._exclusive():
+            aggregators = self._recompute_all()
+            for user_id, aggregator in aggregators.items():
+                self._write(user_id, aggregator.state)
+            keep = {os.path.basename(self._path(user_id)) for user_id in aggregators}
+            if os.path.isdir(self.base_path):
+                for name in os.listdir(self.base_path):
+                    if name.endswith('.json') and name not in keep:
+                        os.remove(os.path.join(self.base_path, name))
+        return len(aggregators)
+
+    def check(self):
+        """Compare stored totals with a recomputation; returns mismatching user ids"""
+        aggregators = self._recompute_all()
+        stored_ids = set()
+        if os.path.isdir(self.base_path):
+            stored_ids = {name[:-len('.json')] for name in os.listdir(self.base_path) if name.endswith('.json')}
+
+        mismatches = []
+        for user_id, aggregator in aggregators.items():
+            stored = self._read(user_id)
+            # Users without a file yet are built lazily on first read
+            if stored is not None and not _same(dump_state(stored), dump_state(aggregator.state)):
+                mismatches.append(user_id)
+        expected = {os.path.basename(self._path(user_id))[:-len('.json')] for user_id in aggregators}
+        empty = dump_state(ProgressAggregator().state)
+        for user_id in sorted(stored_ids - expected):
+            if not _same(dump_state(self._read(user_id)), empty):
+                mismatches.append(user_id)
+        return mismatches
+
+
+def _same(a, b):
+    """Structural equality that tolerates float summation order"""
+    if isinstance(a, float) or isinstance(b, float):
+        return isinstance(a, (int, float)) and isinstance(b, (int, float)) and math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9)
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_same(a[k], b[k]) for k in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(_same(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+aggregate_store = AggregateStore()
+file_manager.add_append_hook(aggregate_store.record_append)
@@ -0,0 +1,15 @@
+import hashlib
+
+
+def source_digest(*paths):
+    """SHA-256 hex digest of the contents of the source files a generated file is built from.
+
+    Generated files store it and compare it when loaded. File mtimes
+    cannot tell whether one is out of date: after a clone or checkout
+    they only reflect the order files were written in.
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as file:
+            digest.update(file.read())
+    return digest.hexdigest()
@@ -0,0 +1,137 @@
+import io
+import multiprocessing
+import os
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from utils import tokenizer
+
+TEXT_EXTENSIONS = ('.txt', '.md', '.text', '.csv')
+
+# Pool workers must not be forked from a web worker that already runs request, model and
+# TTS threads: a lock held by one of them at fork time would stay locked in the child
+DEFAULT_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+
+class BatchTooLarge(ValueError):
+    """The uploaded batch exceeds the configured item or size limits"""
+
+
+def analyze_item(text, simplify=False):
+    """Analyze (and optionally rule-simplify) one text; runs in a pool worker"""
+    from modules.dyslexia import dyslexia_ai
+
+    start = time.perf_counter()
+    result = {'analysis': dyslexia_ai.analyze_text(text)}
+    if simplify:
+        result['simplified'] = dyslexia_ai._rule_based_simplify(text)
+    result['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 2)
+    return result
+
+
+def read_zip(stream, max_items, max_bytes):
+    """(name, text) pairs for the text files inside a zip archive"""
+    items = []
+    total = 0
+    with zipfile.ZipFile(stream) as archive:
+        for info in archive.infolist():
+            name = info.filename
+            if info.is_dir() or name.startswith('__MACOSX/') or not name.lower().endswith(TEXT_EXTENSIONS):
+                continue
+            if len(items) >= max_items:
+                raise BatchTooLarge(f'At most {max_items} texts per batch')
+            # Trust the bytes actually read, not the sizes the archive claims
+            with archive.open(info) as member:
+                data = member.read(max_bytes - total + 1)
+            total += len(data)
+            if total > max_bytes:
+                raise BatchTooLarge('Uncompressed batch is too large')
+            items.append((name, data.decode('utf-8', errors='replace')))
+    return items
+
+
+def read_uploads(files, max_items, max_bytes):
+    """(name, text) pairs from uploaded text files and zip archives, in upload order"""
+    items = []
+    for upload in files:
+        name = upload.filename or f'file-{len(items) + 1}'
+        data = upload.read()
+        if name.lower().endswith('.zip'):
+            total = sum(len(text) for _, text in items)
+            items.extend(read_zip(io.BytesIO(data), max_items - len(items), max_bytes - total))
+        else:
+            items.append((name, data.decode('utf-8', errors='replace')))
+        if len(items) > max_items:
+            raise BatchTooLarge(f'At most {max_items} texts per batch')
+    return items
+
+
+class BatchAnalyzer:
+    """Runs text analysis for a batch of texts across worker processes.
+
+    Text analysis is pure-Python CPU work, so threads would serialize on
+    the GIL; a process pool lets a batch of worksheets use every core.
+    The pool is created on the first batch and kept for the life of the
+    worker. Batches too small to be worth the IPC run in-process.
+    """
+
+    def __init__(self, max_workers=None, inline_chars=20000, start_method=None, tokenizer_mode='fast'):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.inline_chars = inline_chars
+        self.start_method = start_method
+        self.tokenizer_mode = tokenizer_mode
+        self.executor = None
+        self.lock = threading.Lock()
+
+    def _get_executor(self):
+        with self.lock:
+            if self.executor is None:
+                context = multiprocessing.get_context(self.start_method or DEFAULT_START_METHOD)
+                if context.get_start_method() == 'forkserver':
+                    context.set_forkserver_preload(['utils.batch_analysis'])
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=context,
+                    initializer=tokenizer.configure, initargs=(self.tokenizer_mode,))
+            return self.executor
+
+    def _reset_executor(self):
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown(wait=False, cancel_futures=True)
+                self.executor = None
+
+    def analyze(self, texts, simplify=False):
+        """Results for `texts`, in the same order, each with its own elapsed_ms"""
+        if len(texts) <= 1 or self.max_workers <= 1 or sum(len(text) for text in texts) < self.inline_chars:
+            return [analyze_item(text, simplify) for text in texts]
+
+        executor = self._get_executor()
+        # Larger chunks cut IPC round trips when there are many small texts
+        chunksize = max(1, len(texts) // (self.max_workers * 4))
+        try:
+            return list(executor.map(analyze_item, texts, [simplify] * len(texts), chunksize=chunksize))
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); start a fresh pool next time
+            self._reset_executor()
+            raise
+
+
+_analyzer = None
+_analyzer_lock = threading.Lock()
+
+
+def get_batch_analyzer(config):
+    """Process-wide batch analyzer configured from the Flask config"""
+    global _analyzer
+    with _analyzer_lock:
+        if _analyzer is None:
+            _analyzer = BatchAnalyzer(
+                max_workers=config.get('BATCH_ANALYSIS_WORKERS'),
+                inline_chars=config.get('BATCH_ANALYSIS_INLINE_CHARS', 20000),
+                start_method=config.get('BATCH_ANALYSIS_START_METHOD') or None,
+                tokenizer_mode=config.get('TOKENIZER', 'fast')
+            )
+        return _analyzer
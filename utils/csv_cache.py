@@ -0,0 +1,62 @@
+import os
+import threading
+from utils.csv_index import iter_records, row_to_dict
+
+
+class TailCache:
+    """Process-wide cache of parsed CSV rows for append-only files.
+
+    Each entry remembers the parsed rows and the byte offset parsing
+    stopped at. A later read only parses the bytes appended since then.
+    If the file shrank, was replaced (new inode) or changed without
+    growing, the entry is thrown away and the file is parsed again.
+
+    Cached row dictionaries are shared between callers and must be
+    treated as read-only.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def read(self, filepath):
+        """Return all rows of a CSV file as dictionaries"""
+        path = os.path.normpath(filepath)
+        stat = os.stat(path)  # FileNotFoundError propagates to the caller
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry is None or self._stale(entry, stat):
+                entry = {'inode': stat.st_ino, 'offset': 0, 'mtime': None, 'header': None, 'rows': []}
+                self.entries[path] = entry
+            if stat.st_size > entry['offset']:
+                self._parse_tail(path, entry, stat.st_size)
+            entry['mtime'] = stat.st_mtime_ns
+            return list(entry['rows'])
+
+    def invalidate(self, filepath=None):
+        """Forget one file, or everything when no path is given"""
+        with self.lock:
+            if filepath is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(os.path.normpath(filepath), None)
+
+    def _stale(self, entry, stat):
+        if stat.st_ino != entry['inode'] or stat.st_size < entry['offset']:
+            return True
+        # Same size but touched since we parsed it: rewritten in place
+        return stat.st_size == entry['offset'] and stat.st_mtime_ns != entry['mtime']
+
+    def _parse_tail(self, path, entry, end):
+        with open(path, 'rb') as fh:
+            for _, next_offset, values in iter_records(fh, entry['offset'], end):
+                entry['offset'] = next_offset
+                if not values:
+                    continue
+                if entry['header'] is None:
+                    entry['header'] = values
+                    continue
+                entry['rows'].append(row_to_dict(entry['header'], values))
+
+
+csv_cache = TailCache()
@@ -0,0 +1,269 @@
+import csv
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def iter_records(fh, start=0, end=None):
+    """Yield (offset, next_offset, row) for every CSV record in a binary file.
+
+    Offsets are byte positions of the first line of each record, so a
+    record can later be re-read with read_record(). Records spanning
+    several lines (quoted newlines) are handled by letting csv.reader pull
+    lines as it needs them. Parsing stops at `end` or at the last complete
+    line, so a half-written trailing row is left for the next scan. Blank
+    lines come through as empty rows so callers can track the position.
+    """
+    fh.seek(start)
+    position = start
+
+    def lines():
+        nonlocal position
+        while end is None or position < end:
+            raw = fh.readline()
+            if not raw or not raw.endswith(b'\n'):
+                return
+            position += len(raw)
+            yield raw.decode('utf-8')
+
+    reader = csv.reader(lines())
+    while True:
+        offset = position
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        yield offset, position, row
+
+
+def read_record(fh, offset):
+    """Parse the single CSV record starting at a byte offset"""
+    fh.seek(offset)
+
+    def lines():
+        while True:
+            raw = fh.readline()
+            if not raw:
+                return
+            yield raw.decode('utf-8')
+
+    return next(csv.reader(lines()), [])
+
+
+def row_to_dict(header, values):
+    """Map a parsed record onto the header the way csv.DictReader does"""
+    row = dict(zip(header, values))
+    for name in header[len(values):]:
+        row[name] = None
+    if len(values) > len(header):
+        row[None] = values[len(header):]
+    return row
+
+
+class CSVIndex:
+    """Persistent key -> row-offset index for one CSV file.
+
+    The index lives next to the CSV in two files. `<file>.idx.json` is a
+    snapshot of the offsets covering the first `size` bytes of the file.
+    `<file>.idx.log` gets one JSON line [inode, offset, end, key] per row
+    appended since, so an append costs one short write whatever the file
+    size. Loading replays the log lines that continue the snapshot; rows
+    appended after that point (by this process or another worker, or
+    whose log line was lost in a crash) are picked up by scanning only the
+    uncovered tail. A file that shrank, was replaced or lost its index is
+    re-indexed. The snapshot is rewritten and the log emptied on a
+    rebuild, and once the log holds more rows than the snapshot.
+    """
+
+    # Never compact a log shorter than this
+    COMPACT_MIN = 1000
+
+    def __init__(self, filepath, key='user_id'):
+        self.filepath = filepath
+        self.key = key
+        self.index_path = f'{filepath}.idx.json'
+        self.log_path = f'{filepath}.idx.log'
+        self.header = None
+        self.size = 0
+        self.inode = None
+        self.offsets = {}
+        self.snapshot_rows = 0
+        self.logged = 0
+        self.lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """Load the on-disk snapshot if it matches this file and key, then replay the log"""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as file:
+                stored = json.load(file)
+        except (FileNotFoundError, ValueError):
+            return
+        if stored.get('key') != self.key:
+            return
+        self.header = stored.get('header')
+        self.size = stored.get('size', 0)
+        self.inode = stored.get('inode')
+        self.offsets = stored.get('offsets', {})
+        self.snapshot_rows = sum(len(offsets) for offsets in self.offsets.values())
+        self._replay()
+
+    def _replay(self):
+        try:
+            with open(self.log_path, 'r', encoding='utf-8') as file:
+                for line in file:
+                    if not line.endswith('\n'):
+                        break  # Partly written by a worker that died mid-write
+                    try:
+                        inode, offset, end, value = json.loads(line)
+                    except ValueError:
+                        continue
+                    # Only lines that continue the covered range: older, duplicate or
+                    # out-of-order lines are skipped and the tail scan covers any gap
+                    if inode != self.inode or offset != self.size:
+                        continue
+                    self.size = end
+                    if value is not None:
+                        self.offsets.setdefault(value, []).append(offset)
+                    self.logged += 1
+        except FileNotFoundError:
+            pass
+
+    def _log(self, offset, end, value):
+        """Append one row's entry to the index log"""
+        try:
+            with open(self.log_path, 'a', encoding='utf-8') as file:
+                file.write(json.dumps([self.inode, offset, end, value]) + '\n')
+            self.logged += 1
+        except OSError:
+            logger.exception("Error writing CSV index log %s", self.log_path)
+
+    def _persist(self):
+        """Atomically write the snapshot next to the CSV file and start an empty log"""
+        tmp_path = f'{self.index_path}.{os.getpid()}.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as file:
+                json.dump({
+                    'key': self.key,
+                    'header': self.header,
+                    'size': self.size,
+                    'inode': self.inode,
+                    'offsets': self.offsets
+                }, file)
+            os.replace(tmp_path, self.index_path)
+            # Log lines another worker appends meanwhile are lost; the tail scan covers them
+            tmp_path = f'{self.log_path}.{os.getpid()}.tmp'
+            open(tmp_path, 'w').close()
+            os.replace(tmp_path, self.log_path)
+            self.snapshot_rows = sum(len(offsets) for offsets in self.offsets.values())
+            self.logged = 0
+        except OSError:
+            logger.exception("Error writing CSV index %s", self.index_path)
+
+    def _reset(self):
+        self.header = None
+        self.size = 0
+        self.inode = None
+        self.offsets = {}
+
+    def _scan(self, fh, start, end):
+        """Index every record between two byte offsets"""
+        column = None
+        self.size = start
+        for offset, next_offset, row in iter_records(fh, start, end):
+            self.size = next_offset
+            if not row:
+                continue
+            if self.header is None:
+                self.header = row
+                continue
+            if column is None:
+                column = self.header.index(self.key) if self.key in self.header else -1
+            if 0 <= column < len(row):
+                self.offsets.setdefault(row[column], []).append(offset)
+
+    def refresh(self):
+        """Bring the index up to date with the file on disk"""
+        try:
+            stat = os.stat(self.filepath)
+        except FileNotFoundError:
+            self._reset()
+            return
+        if stat.st_size < self.size or stat.st_ino != self.inode:
+            # Truncated or replaced by write_csv: start over
+            self._reset()
+            self.inode = stat.st_ino
+        if stat.st_size == self.size:
+            return
+        with open(self.filepath, 'rb') as fh:
+            rebuilding = self.size == 0
+            self._scan(fh, self.size, stat.st_size)
+        if rebuilding:
+            self._persist()
+
+    def rebuild(self):
+        """Discard the index and re-scan the whole file"""
+        with self.lock:
+            self._reset()
+            self.refresh()
+            if self.inode is not None:
+                self._persist()
+
+    def record_append(self, values, offset, end):
+        """Register a row (list of written values) this process just appended"""
+        with self.lock:
+            if self.header is None or self.size != offset:
+                # Someone else wrote in between; the next refresh scans it
+                return
+            self.size = end
+            value = None
+            if self.key in self.header:
+                column = self.header.index(self.key)
+                if column < len(values):
+                    value = values[column]
+                    self.offsets.setdefault(value, []).append(offset)
+            self._log(offset, end, value)
+            if self.logged > max(self.COMPACT_MIN, self.snapshot_rows):
+                self._persist()
+
+    def read(self, key_value):
+        """Return the rows for one key as dictionaries, in file order"""
+        with self.lock:
+            self.refresh()
+            header = self.header
+            offsets = list(self.offsets.get(key_value, ()))
+        if not header or not offsets:
+            return []
+        rows = []
+        with open(self.filepath, 'rb') as fh:
+            for offset in offsets:
+                rows.append(row_to_dict(header, read_record(fh, offset)))
+        return rows
+
+
+class IndexRegistry:
+    """Process-wide registry of CSVIndex objects, one per (file, key)"""
+
+    def __init__(self):
+        self.indexes = {}
+        self.lock = threading.Lock()
+
+    def get(self, filepath, key='user_id'):
+        path = os.path.normpath(filepath)
+        with self.lock:
+            index = self.indexes.get((path, key))
+            if index is None:
+                index = CSVIndex(path, key)
+                self.indexes[(path, key)] = index
+            return index
+
+    def indexes_for(self, filepath):
+        path = os.path.normpath(filepath)
+        with self.lock:
+            return [index for (p, _), index in self.indexes.items() if p == path]
+
+
+index_registry = IndexRegistry()
@@ -0,0 +1,346 @@
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.tokenizer import sent_tokenize
+
+try:
+    import fcntl
+except ImportError:  # Windows: jobs are only resumed by the process that runs them
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+FINISHED = ('completed', 'failed', 'cancelled')
+
+
+def chunk_text(text, chunk_chars=2000):
+    """Split text into chunks of whole sentences, about chunk_chars long"""
+    chunks = []
+    current = []
+    length = 0
+    for paragraph in text.split('\n'):
+        for sentence in sent_tokenize(paragraph):
+            if current and length + len(sentence) > chunk_chars:
+                chunks.append(' '.join(current))
+                current = []
+                length = 0
+            current.append(sentence)
+            length += len(sentence) + 1
+    if current:
+        chunks.append(' '.join(current))
+    return chunks
+
+
+class DocumentJobs:
+    """Persistent background jobs for simplifying long documents.
+
+    Every job is a directory under `root`:
+
+    * meta.json     status and progress, rewritten atomically
+    * chunks.json   the input, split into chunks at submit time
+    * results.jsonl one line per finished chunk, in chunk order
+    * cancel        present once cancellation was requested
+
+    A fixed pool of worker threads processes the chunks in order. The
+    running process holds an flock on the job's `lock` file, so a job that
+    is queued or running but whose lock is free was orphaned by a worker
+    restart. Orphaned jobs are picked up when the serving process handles
+    its first request (resume_once) and whenever they are polled, and
+    continue after their last finished chunk. Any process can
+    read progress or request cancellation, since both go through the files.
+    """
+
+    def __init__(self, root, process_chunk, max_workers=1, max_pending=8, ttl=7 * 24 * 3600, on_complete=None):
+        self.root = root
+        self.process_chunk = process_chunk
+        self.on_complete = on_complete
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='document-job')
+        self.active = {}  # job id -> open lock file, for jobs queued or running here
+        self.lock = threading.Lock()
+        self.resumed = False
+        self.counters = {'submitted': 0, 'rejected': 0, 'resumed': 0, 'completed': 0, 'failed': 0, 'cancelled': 0}
+
+    # --- Files ---------------------------------------------------------------
+
+    def _path(self, job_id, name):
+        return os.path.join(self.root, job_id, name)
+
+    def _read_meta(self, job_id):
+        try:
+            with open(self._path(job_id, 'meta.json'), 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, meta):
+        meta['updated'] = time.time()
+        path = self._path(meta['id'], 'meta.json')
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(meta, file)
+        os.replace(tmp_path, path)
+
+    def _read_results(self, job_id, since=0):
+        results = []
+        try:
+            with open(self._path(job_id, 'results.jsonl'), 'r', encoding='utf-8') as file:
+                for line in file:
+                    if not line.endswith('\n'):
+                        break  # Partly written by a worker that died mid-write
+                    result = json.loads(line)
+                    if result['index'] >= since:
+                        results.append(result)
+        except FileNotFoundError:
+            pass
+        return results
+
+    def _claim(self, job_id):
+        """Take the job's lock; returns the open lock file, or None if another process holds it"""
+        handle = open(self._path(job_id, 'lock'), 'a')
+        if fcntl is not None:
+            try:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                handle.close()
+                return None
+        return handle
+
+    def _release(self, job_id):
+        with self.lock:
+            handle = self.active.pop(job_id, None)
+        if handle is not None:
+            handle.close()
+
+    # --- Running -------------------------------------------------------------
+
+    def _enqueue(self, job_id):
+        """Claim a job and queue it on this process's pool; False if it cannot run here"""
+        with self.lock:
+            if job_id in self.active or len(self.active) >= self.max_pending:
+                return False
+            handle = self._claim(job_id)
+            if handle is None:
+                return False
+            self.active[job_id] = handle
+        try:
+            self.executor.submit(self._run, job_id)
+        except RuntimeError:
+            self._release(job_id)
+            return False
+        return True
+
+    def _run(self, job_id):
+        try:
+            meta = self._read_meta(job_id)
+            if meta is None or meta['status'] in FINISHED:
+                return
+            with open(self._path(job_id, 'chunks.json'), 'r', encoding='utf-8') as file:
+                chunks = json.load(file)
+
+            # Resume after the last chunk that made it to disk
+            done = len(self._read_results(job_id))
+            self._truncate_partial_line(job_id)
+            meta.update(status='running', done_chunks=done)
+            self._write_meta(meta)
+
+            with open(self._path(job_id, 'results.jsonl'), 'a', encoding='utf-8') as results:
+                for index in range(done, len(chunks)):
+                    if os.path.exists(self._path(job_id, 'cancel')):
+                        self._finish(meta, 'cancelled')
+                        return
+                    result = self.process_chunk(chunks[index])
+                    results.write(json.dumps({'index': index, **result}) + '\n')
+                    results.flush()
+                    meta['done_chunks'] = index + 1
+                    self._write_meta(meta)
+
+            self._finish(meta, 'completed')
+        except Exception as e:
+            logger.exception("Error in document job %s", job_id)
+            meta = self._read_meta(job_id)
+            if meta is not None:
+                meta['error'] = str(e)
+                self._finish(meta, 'failed')
+            return
+        finally:
+            self._release(job_id)
+
+        if self.on_complete:
+            try:
+                self.on_complete(meta, ' '.join(chunks))
+            except Exception as e:
+                logger.exception("Error in document job %s completion hook", job_id)
+
+    def _truncate_partial_line(self, job_id):
+        path = self._path(job_id, 'results.jsonl')
+        if not os.path.exists(path):
+            return
+        with open(path, 'rb+') as file:
+            data = file.read()
+            if data and not data.endswith(b'\n'):
+                file.truncate(data.rfind(b'\n') + 1)
+
+    def _finish(self, meta, status):
+        meta['status'] = status
+        meta['finished'] = time.time()
+        self._write_meta(meta)
+        with self.lock:
+            self.counters[status] += 1
+
+    # --- API -----------------------------------------------------------------
+
+    def submit(self, text, owner, name=None, chunk_chars=2000):
+        """Store a new job and queue it; returns its metadata, or None if this worker is at capacity"""
+        with self.lock:
+            full = len(self.active) >= self.max_pending
+            if full:
+                self.counters['rejected'] += 1
+        if full:
+            return None
+        self._prune()
+
+        chunks = chunk_text(text, chunk_chars)
+        job_id = str(uuid.uuid4())
+        os.makedirs(os.path.join(self.root, job_id), exist_ok=True)
+        with open(self._path(job_id, 'chunks.json'), 'w', encoding='utf-8') as file:
+            json.dump(chunks, file)
+        meta = {
+            'id': job_id,
+            'owner': owner,
+            'name': name,
+            'status': 'queued',  # queued -> running -> completed | failed | cancelled
+            'total_chunks': len(chunks),
+            'done_chunks': 0,
+            'characters': len(text),
+            'error': None,
+            'created': time.time()
+        }
+        self._write_meta(meta)
+        with self.lock:
+            self.counters['submitted'] += 1
+        self._enqueue(job_id)
+        return meta
+
+    def get(self, job_id, owner, since=None):
+        """Job status for its owner (None otherwise), with results from chunk `since` on if given"""
+        meta = self._read_meta(job_id) if self._valid_id(job_id) else None
+        if meta is None or meta['owner'] != owner:
+            return None
+        if meta['status'] not in FINISHED and self._enqueue(job_id):
+            with self.lock:
+                self.counters['resumed'] += 1
+        status = {
+            'job_id': job_id,
+            'name': meta['name'],
+            'status': meta['status'],
+            'final': meta['status'] in FINISHED,
+            'cancel_requested': os.path.exists(self._path(job_id, 'cancel')),
+            'done_chunks': meta['done_chunks'],
+            'total_chunks': meta['total_chunks'],
+            'progress': round(meta['done_chunks'] / meta['total_chunks'], 3) if meta['total_chunks'] else 1.0,
+            'error': meta['error'],
+            'created': meta['created']
+        }
+        if since is not None:
+            status['results'] = self._read_results(job_id, since)
+        return status
+
+    def cancel(self, job_id, owner):
+        """Ask a job to stop after its current chunk; False if unknown or not the owner's"""
+        meta = self._read_meta(job_id) if self._valid_id(job_id) else None
+        if meta is None or meta['owner'] != owner:
+            return False
+        if meta['status'] not in FINISHED:
+            open(self._path(job_id, 'cancel'), 'a').close()
+            # Nobody is running it (queued elsewhere or orphaned): cancel it here
+            handle = self._claim(job_id)
+            if handle is not None:
+                try:
+                    meta = self._read_meta(job_id)
+                    if meta['status'] not in FINISHED and job_id not in self.active:
+                        self._finish(meta, 'cancelled')
+                finally:
+                    handle.close()
+        return True
+
+    def list_jobs(self, owner):
+        jobs = []
+        for meta in self._iter_meta():
+            if meta['owner'] == owner:
+                jobs.append(self.get(meta['id'], owner))
+        return sorted(jobs, key=lambda job: job['created'], reverse=True)
+
+    def resume(self):
+        """Queue every unfinished job no other process is running; returns how many"""
+        resumed = 0
+        for meta in sorted(self._iter_meta(), key=lambda meta: meta['created']):
+            if meta['status'] not in FINISHED and self._enqueue(meta['id']):
+                resumed += 1
+        with self.lock:
+            self.counters['resumed'] += resumed
+        return resumed
+
+    def resume_once(self):
+        """resume() on the first call in this process; later calls return 0"""
+        with self.lock:
+            if self.resumed:
+                return 0
+            self.resumed = True
+        return self.resume()
+
+    def stats(self):
+        with self.lock:
+            return {**self.counters, 'active': len(self.active)}
+
+    def _valid_id(self, job_id):
+        try:
+            return str(uuid.UUID(job_id)) == job_id
+        except ValueError:
+            return False
+
+    def _iter_meta(self):
+        if not os.path.isdir(self.root):
+            return
+        for job_id in os.listdir(self.root):
+            meta = self._read_meta(job_id)
+            if meta is not None:
+                yield meta
+
+    def _prune(self):
+        """Delete finished jobs older than the TTL"""
+        now = time.time()
+        for meta in list(self._iter_meta()):
+            if meta['status'] in FINISHED and now - meta.get('finished', now) > self.ttl:
+                shutil.rmtree(os.path.join(self.root, meta['id']), ignore_errors=True)
+
+
+_jobs = None
+_jobs_lock = threading.Lock()
+
+
+def get_document_jobs(config, process_chunk=None, on_complete=None):
+    """Process-wide document job runner; the first call must pass process_chunk.
+
+    Interrupted jobs are not resumed here: call resume_once() from the
+    process that serves requests.
+    """
+    global _jobs
+    with _jobs_lock:
+        if _jobs is None:
+            _jobs = DocumentJobs(
+                config.get('DOCUMENT_JOBS_DIR', 'data/jobs'),
+                process_chunk,
+                max_workers=config.get('DOCUMENT_JOBS_WORKERS', 1),
+                max_pending=config.get('DOCUMENT_JOBS_MAX_PENDING', 8),
+                ttl=config.get('DOCUMENT_JOBS_TTL', 7 * 24 * 3600),
+                on_complete=on_complete
+            )
+        return _jobs
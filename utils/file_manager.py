@@ -1,29 +1,58 @@
 import csv
 import json
+import logging
 import os
 from datetime import datetime
+import glob
 import uuid
+from flask import current_app, has_app_context
+from utils.csv_cache import csv_cache
+from utils.csv_index import index_registry, read_record, row_to_dict
 
 class FileManager:
     def __init__(self):
         self.base_path = 'data'
+        self.append_hooks = []
+    
+    def add_append_hook(self, hook):
+        """Call hook(filepath, row) after every append_csv, with the row as read_csv would return it"""
+        self.append_hooks.append(hook)
     
     def read_csv(self, filepath):
         """Read CSV file and return list of dictionaries"""
         try:
-            with open(filepath, 'r', newline='', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                return list(reader)
+            return csv_cache.read(filepath)
         except FileNotFoundError:
             return []
     
+    def read_user_rows(self, filepath, user_id, key='user_id'):
+        """Read only the rows of a CSV file whose `key` column equals user_id"""
+        return index_registry.get(filepath, key).read(user_id)
+    
+    def rebuild_index(self, filepath, key='user_id'):
+        """Rebuild the per-user row index of a CSV file from scratch"""
+        index_registry.get(filepath, key).rebuild()
+    
+    def rebuild_indexes(self):
+        """Rebuild the user_id index of every data/<module>/*.csv file"""
+        rebuilt = []
+        for filepath in sorted(glob.glob(os.path.join(self.base_path, '*', '*.csv'))):
+            key = 'id' if os.path.basename(filepath) == 'users.csv' else 'user_id'
+            self.rebuild_index(filepath, key)
+            rebuilt.append(filepath)
+        return rebuilt
+    
     def write_csv(self, filepath, data, fieldnames):
         """Write data to CSV file"""
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, 'w', newline='', encoding='utf-8') as file:
+        # Write to a temporary file and swap it in, so readers and indexes
+        # see a new inode instead of a file rewritten in place
+        tmp_path = f'{filepath}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', newline='', encoding='utf-8') as file:
             writer = csv.DictWriter(file, fieldnames=fieldnames)
             writer.writeheader()
             writer.writerows(data)
+        os.replace(tmp_path, filepath)
     
     def append_csv(self, filepath, data, fieldnames):
         """Append data to CSV file"""
@@ -34,7 +63,29 @@ class FileManager:
             writer = csv.DictWriter(file, fieldnames=fieldnames)
             if not file_exists:
                 writer.writeheader()
+            file.flush()
+            offset = file.tell()
             writer.writerow(data)
+            file.flush()
+            end = file.tell()
+        
+        # Keep per-user indexes current without re-scanning the file
+        values = ['' if data.get(name) is None else str(data.get(name)) for name in fieldnames]
+        for index in index_registry.indexes_for(filepath):
+            index.record_append(values, offset, end)
+        
+        if self.append_hooks:
+            header = fieldnames
+            if file_exists:
+                with open(filepath, 'rb') as fh:
+                    header = read_record(fh, 0)
+            row = row_to_dict(header, values)
+            for hook in self.append_hooks:
+                try:
+                    hook(os.path.normpath(filepath), row)
+                except Exception:
+                    logger = current_app.logger if has_app_context() else logging.getLogger(__name__)
+                    logger.exception("Error in append hook for %s", filepath)
     
     def read_json(self, filepath):
         """Read JSON file"""
@@ -0,0 +1,52 @@
+import base64
+import binascii
+
+import cv2
+import numpy as np
+
+# Request bodies accepted as a raw camera frame
+IMAGE_TYPES = ('image/jpeg', 'image/png', 'image/webp')
+
+
+def read_frame_upload(request):
+    """(frame, params) from a camera frame upload.
+
+    Three forms are accepted:
+    - a raw image body (Content-Type: image/jpeg), with the other
+      parameters in the query string
+    - multipart/form-data with the image in a 'frame' file field and
+      the other parameters as form fields
+    - JSON with the image base64-encoded in 'frame' (the original form)
+
+    The frame is bytes for the binary forms and base64 text for JSON, or
+    None if missing; decode_frame takes either. params is a plain dict
+    of the remaining parameters (strings for the binary forms).
+    """
+    if request.mimetype in IMAGE_TYPES:
+        return request.get_data(cache=False) or None, request.args.to_dict()
+    if request.mimetype == 'multipart/form-data':
+        upload = request.files.get('frame')
+        frame = upload.read() if upload else request.form.get('frame')
+        return frame or None, request.form.to_dict()
+    data = request.get_json(silent=True) or {}
+    return data.get('frame') or None, data
+
+
+def decode_frame(frame):
+    """BGR image from encoded image bytes or their base64 text, or None if it does not decode"""
+    if isinstance(frame, str):
+        try:
+            frame = base64.b64decode(frame)
+        except (binascii.Error, ValueError):
+            return None
+    if not frame:
+        return None
+    # frombuffer wraps the request bytes without copying them
+    return cv2.imdecode(np.frombuffer(frame, np.uint8), cv2.IMREAD_COLOR)
+
+
+def frame_to_text(frame):
+    """Base64 text for a frame given as bytes or already as base64 (for JSON transports)"""
+    if isinstance(frame, str):
+        return frame
+    return base64.b64encode(frame).decode('ascii')
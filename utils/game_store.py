@@ -0,0 +1,159 @@
+import json
+import os
+import re
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to the in-process lock only
+    fcntl = None
+
+GAME_ID_RE = re.compile(r'^[A-Za-z0-9_-]{16}$')  # secrets.token_urlsafe(12)
+
+
+class GameStore:
+    """Short-lived server-side game instances, shared by every worker.
+
+    Creating a game stores only what scoring needs: the owner, the game
+    type, the item ids of its questions and the seed the options were
+    shuffled with. Each game is a small JSON file in its owner's
+    directory under `root`, written atomically, so whichever worker
+    handles the submission finds it. Submitting removes the file under
+    the owner's flock, so a result can only be recorded once. Games
+    expire after `ttl` seconds, and beyond `max_per_owner` an owner's
+    oldest games are dropped; other users' games are never evicted.
+    """
+
+    def __init__(self, root='data/games', ttl=3600, max_per_owner=20):
+        self.root = root
+        self.ttl = ttl
+        self.max_per_owner = max_per_owner
+        self.lock = threading.Lock()
+        self.next_sweep = 0
+
+    def _owner_dir(self, owner):
+        safe_id = re.sub(r'[^A-Za-z0-9_.-]', '_', str(owner))
+        return os.path.join(self.root, safe_id)
+
+    @contextmanager
+    def _exclusive(self, directory):
+        """Serialize changes to one owner's games across threads and worker processes"""
+        with self.lock:
+            os.makedirs(directory, exist_ok=True)
+            if fcntl is None:
+                yield
+                return
+            with open(os.path.join(directory, '.lock'), 'a') as handle:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def create(self, owner, game_type, difficulty, item_ids, seed):
+        game_id = secrets.token_urlsafe(12)
+        now = time.time()
+        game = {
+            'owner': owner,
+            'game_type': game_type,
+            'difficulty': difficulty,
+            'item_ids': item_ids,
+            'seed': seed,
+            'created': now
+        }
+        directory = self._owner_dir(owner)
+        with self._exclusive(directory):
+            path = os.path.join(directory, f'{game_id}.json')
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as file:
+                json.dump(game, file)
+            os.replace(tmp_path, path)
+            self._prune_owner(directory, now)
+        self._sweep(now)
+        return game_id
+
+    def pop(self, game_id, owner):
+        """Remove and return a game if it exists, has not expired and belongs to `owner`"""
+        if not isinstance(game_id, str) or not GAME_ID_RE.match(game_id):
+            return None
+        directory = self._owner_dir(owner)
+        if not os.path.isdir(directory):
+            return None
+        with self._exclusive(directory):
+            path = os.path.join(directory, f'{game_id}.json')
+            try:
+                with open(path, 'r', encoding='utf-8') as file:
+                    game = json.load(file)
+            except (OSError, ValueError):
+                return None
+            # Owner ids that sanitize to the same directory still keep their own games
+            if game['owner'] != owner:
+                return None
+            os.remove(path)
+        if time.time() - game['created'] > self.ttl:
+            return None
+        return game
+
+    def _games(self, directory):
+        """(modified time, path) of the games in one owner's directory, oldest first"""
+        games = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.endswith('.json'):
+                    try:
+                        games.append((entry.stat().st_mtime, entry.path))
+                    except FileNotFoundError:
+                        pass
+        return sorted(games)
+
+    def _prune_owner(self, directory, now):
+        expired = []
+        live = []
+        for modified, path in self._games(directory):
+            (expired if now - modified > self.ttl else live).append(path)
+        for path in expired + live[:max(0, len(live) - self.max_per_owner)]:
+            _remove(path)
+
+    def _sweep(self, now):
+        """Delete expired games of every owner, at most once per TTL per process"""
+        with self.lock:
+            if now < self.next_sweep:
+                return
+            self.next_sweep = now + self.ttl
+        if not os.path.isdir(self.root):
+            return
+        for name in os.listdir(self.root):
+            directory = os.path.join(self.root, name)
+            if not os.path.isdir(directory):
+                continue
+            # Without the owner's lock: a game past its TTL is rejected by pop() anyway
+            for modified, path in self._games(directory):
+                if now - modified > self.ttl:
+                    _remove(path)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_game_store(config):
+    """Process-wide game store configured from the Flask config"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = GameStore(
+                config.get('GAMES_DIR', 'data/games'),
+                ttl=config.get('GAME_TTL', 3600),
+                max_per_owner=config.get('GAME_MAX_PER_OWNER', 20)
+            )
+        return _store
@@ -0,0 +1,54 @@
+import base64
+from itertools import chain
+from operator import attrgetter
+
+import numpy as np
+
+# Landmark fields in the order they are stored and packed
+HAND_FIELDS = ('x', 'y', 'z')
+POSE_FIELDS = ('x', 'y', 'z', 'visibility')
+
+
+def from_mediapipe(landmark_list, fields):
+    """(n, len(fields)) float32 array from a MediaPipe landmark list"""
+    # attrgetter reads all fields of a landmark in one C call and fromiter fills the array
+    # without intermediate lists; per-field getattr into nested lists took twice as long
+    landmarks = landmark_list.landmark
+    values = chain.from_iterable(map(attrgetter(*fields), landmarks))
+    return np.fromiter(values, dtype=np.float32, count=len(landmarks) * len(fields)).reshape(-1, len(fields))
+
+
+def as_array(landmarks, fields):
+    """Landmarks as an (n, len(fields)) array, whether given as an array or as a list of dicts"""
+    if isinstance(landmarks, np.ndarray):
+        return landmarks
+    return np.array([[landmark[field] for field in fields] for landmark in landmarks], dtype=np.float32)
+
+
+def to_dicts(landmarks, fields):
+    """The landmark array as a list of {'x', 'y', ...} dicts (the original JSON form); None stays None"""
+    if landmarks is None:
+        return None
+    return [dict(zip(fields, row)) for row in np.asarray(landmarks).tolist()]
+
+
+def pack_landmarks(landmarks, fields):
+    """Compact JSON form of landmarks: {'shape': [n, len(fields)], 'data': base64 float32}.
+
+    Takes the (n, fields) array or a list of dicts. The data is the
+    little-endian float32 values row by row (x, y, z[, visibility] per
+    landmark), which a browser reads with new Float32Array(...). 33 pose
+    landmarks take 704 characters instead of about 3 KB of x/y/z dicts.
+    None stays None.
+    """
+    if landmarks is None:
+        return None
+    values = as_array(landmarks, fields).astype('<f4', copy=False)
+    return {'shape': list(values.shape), 'data': base64.b64encode(values.tobytes()).decode('ascii')}
+
+
+def unpack_landmarks(packed):
+    """The (n, fields) float32 array from pack_landmarks output; None stays None"""
+    if packed is None:
+        return None
+    return np.frombuffer(base64.b64decode(packed['data']), dtype='<f4').reshape(packed['shape'])
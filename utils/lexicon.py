@@ -0,0 +1,153 @@
+import csv
+import os
+import re
+import threading
+import time
+from itertools import compress
+
+# Words are runs of letters, optionally joined by apostrophes or hyphens
+# ("it's", "well-known"), so a lexicon entry never matches inside a longer word
+TOKEN_SPLIT_RE = re.compile(r"([A-Za-z]+(?:['’-][A-Za-z]+)*)")
+
+
+def match_case(source, replacement):
+    """Give a replacement the capitalisation of the word it replaces"""
+    if len(source) > 1 and source.isupper():
+        return replacement.upper()
+    if source[0].isupper():
+        return replacement[0].upper() + replacement[1:]
+    return replacement
+
+
+class CompiledLexicon:
+    """Immutable single-pass matcher for one version of the lexicon.
+
+    Single words are a plain dict lookup per token. Multi-word phrases
+    ("in order to") form a token trie keyed by their first word, and the
+    longest phrase starting at a token wins. Tokens are checked against
+    the set of possible first words with C-level map() calls, so Python
+    code only runs for the (few) tokens that start a match.
+    """
+
+    def __init__(self, entries):
+        self.words = {}
+        self.phrases = {}
+        for complex_text, simple_text in entries:
+            tokens = complex_text.lower().split()
+            if len(tokens) == 1:
+                self.words[tokens[0]] = simple_text
+            else:
+                node = self.phrases.setdefault(tokens[0], {})
+                for token in tokens[1:]:
+                    node = node.setdefault(token, {})
+                node[None] = simple_text
+        self.starts = frozenset(self.words) | frozenset(self.phrases)
+        self.size = len(entries)
+
+    def replace(self, text):
+        """Replace every lexicon word or phrase in text, keeping everything else as is"""
+        # parts alternates separator, word, separator, ...: word k is parts[2k + 1]
+        parts = TOKEN_SPLIT_RE.split(text)
+        lowered = list(map(str.lower, parts[1::2]))
+        hits = list(compress(range(len(lowered)), map(self.starts.__contains__, lowered)))
+        if not hits:
+            return text
+
+        words = self.words
+        phrases = self.phrases
+        covered = -1
+        for k in hits:
+            if k <= covered:
+                continue
+            replacement = None
+            end = k
+            node = phrases.get(lowered[k])
+            if node is not None:
+                # Walk the phrase trie while the next words are separated only by whitespace
+                j = k
+                while True:
+                    if j > k and None in node:
+                        replacement, end = node[None], j
+                    if j + 1 >= len(lowered) or not parts[2 * j + 2].isspace():
+                        break
+                    node = node.get(lowered[j + 1])
+                    if node is None:
+                        break
+                    j += 1
+            if replacement is None:
+                replacement = words.get(lowered[k])
+                end = k
+                if replacement is None:
+                    continue
+
+            parts[2 * k + 1] = match_case(parts[2 * k + 1], replacement)
+            for m in range(k + 1, end + 1):
+                parts[2 * m] = parts[2 * m + 1] = ''
+            covered = end
+        return ''.join(parts)
+
+
+class Lexicon:
+    """Replacement vocabulary loaded from a CSV file (columns: complex, simple).
+
+    The file is checked for changes at most every `reload_interval`
+    seconds and recompiled when its mtime or size changes, so editing the
+    data file takes effect in running workers without a restart. Each
+    reload swaps in a new CompiledLexicon, so readers never see a
+    half-built matcher.
+    """
+
+    def __init__(self, filepath, reload_interval=5.0):
+        self.filepath = filepath
+        self.reload_interval = reload_interval
+        self.compiled = CompiledLexicon([])
+        self.signature = None
+        self.checked = 0
+        self.lock = threading.Lock()
+
+    def _load_entries(self):
+        entries = []
+        with open(self.filepath, 'r', newline='', encoding='utf-8') as file:
+            for row in csv.DictReader(file):
+                complex_text = (row.get('complex') or '').strip()
+                simple_text = (row.get('simple') or '').strip()
+                if complex_text and simple_text and not complex_text.startswith('#'):
+                    entries.append((complex_text, simple_text))
+        return entries
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if self.signature is not None and now - self.checked < self.reload_interval:
+            return
+        with self.lock:
+            if self.signature is not None and now - self.checked < self.reload_interval:
+                return
+            self.checked = now
+            try:
+                stat = os.stat(self.filepath)
+            except FileNotFoundError:
+                if self.signature is None:
+                    print(f"Lexicon file not found: {self.filepath}")
+                    self.signature = ()
+                return
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if signature == self.signature:
+                return
+            try:
+                self.compiled = CompiledLexicon(self._load_entries())
+                self.signature = signature
+            except (OSError, ValueError, csv.Error) as e:
+                print(f"Error loading lexicon {self.filepath}: {e}")
+                if self.signature is None:
+                    self.signature = ()
+
+    def replace(self, text):
+        self._maybe_reload()
+        return self.compiled.replace(text)
+
+    def __len__(self):
+        self._maybe_reload()
+        return self.compiled.size
+
+
+lexicon = Lexicon('data/lexicon/replacements.csv')
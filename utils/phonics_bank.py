@@ -0,0 +1,228 @@
+import json
+import os
+import random
+import threading
+
+from utils import pronunciation
+from utils.artifacts import source_digest
+
+SOURCE_FILE = 'data/phonics/word_families.json'
+BANK_FILE = 'data/phonics/item_bank.json'
+
+DIFFICULTIES = ('easy', 'medium', 'hard')
+DISTRACTOR_POOL_SIZE = 8
+
+# Graphemes children commonly mix up, for "wrong sound" distractors
+CONFUSABLE = {
+    'a': ['e', 'u', 'ai'], 'e': ['i', 'a', 'ee'], 'i': ['e', 'y', 'igh'], 'o': ['u', 'a', 'oa'], 'u': ['o', 'a', 'oo'],
+    'ee': ['ea', 'e'], 'ea': ['ee', 'e'], 'ai': ['ay', 'a'], 'ay': ['ai', 'a'], 'oa': ['ow', 'o'],
+    'ow': ['oa', 'ou'], 'ou': ['ow', 'oo'], 'oo': ['u', 'ew'], 'igh': ['i', 'y'],
+    'ar': ['or', 'a'], 'or': ['ar', 'ur'], 'ir': ['ur', 'er'], 'ur': ['ir', 'er'], 'er': ['ur', 'ir'],
+    'oy': ['oi'], 'oi': ['oy'], 'aw': ['au', 'or'], 'au': ['aw', 'or'], 'ew': ['oo', 'ue'], 'ue': ['ew', 'oo'],
+    'ough': ['off', 'ow'], 'augh': ['ough', 'aw'],
+    'b': ['d', 'p'], 'd': ['b', 't'], 'p': ['b', 'q'], 'm': ['n'], 'n': ['m'], 'f': ['v', 'th'], 'v': ['f'],
+    'ch': ['sh', 'tch'], 'sh': ['ch', 's'], 'th': ['f', 't'], 'ck': ['k', 'c'], 'ng': ['n', 'nk'], 'nk': ['ng', 'k'],
+    'tch': ['ch', 'sh'], 'dge': ['ge', 'j'], 'ph': ['f', 'p'], 'wh': ['w'], 'kn': ['n', 'k']
+}
+
+
+def segmentation_distractors(sounds):
+    """Plausible wrong answers for a sound split: misplaced boundaries, split digraphs, swapped graphemes"""
+    candidates = []
+    # Two sounds heard as one ("ca-t", "c-at")
+    for i in range(len(sounds) - 1):
+        candidates.append(sounds[:i] + [sounds[i] + sounds[i + 1]] + sounds[i + 2:])
+    # A digraph or blend split into letters ("s-h-i-p")
+    for i, sound in enumerate(sounds):
+        if len(sound) > 1:
+            candidates.append(sounds[:i] + list(sound) + sounds[i + 1:])
+    # A boundary one letter off ("s-hi-p")
+    for i in range(len(sounds) - 1):
+        left, right = sounds[i], sounds[i + 1]
+        if len(left) > 1:
+            candidates.append(sounds[:i] + [left[:-1], left[-1] + right] + sounds[i + 2:])
+        if len(right) > 1:
+            candidates.append(sounds[:i] + [left + right[0], right[1:]] + sounds[i + 2:])
+    # The wrong grapheme for one of the sounds ("c-e-t")
+    for i, sound in enumerate(sounds):
+        for other in CONFUSABLE.get(sound, []):
+            candidates.append(sounds[:i] + [other] + sounds[i + 1:])
+    # Not split at all
+    candidates.append([''.join(sounds)])
+    # Sounds in the wrong order, so even two-letter words get enough options
+    candidates.append(sounds[::-1])
+
+    correct = '-'.join(sounds)
+    pool = []
+    for candidate in candidates:
+        option = '-'.join(part for part in candidate if part)
+        if option != correct and option not in pool:
+            pool.append(option)
+    return pool[:DISTRACTOR_POOL_SIZE]
+
+
+def _onset_difficulty(onset):
+    if onset in ('kn', 'wr', 'gn') or len(onset) > 2:
+        return 'hard'
+    if len(onset) == 2:
+        return 'medium'
+    return 'easy'
+
+
+def build_item_bank(source, dictionary=None):
+    """Expand word families and explicit words into items with precomputed distractors.
+
+    Each item also gets its ARPAbet pronunciation and syllable count from
+    the pronunciation dictionary (None for words it does not know).
+    """
+    dictionary = dictionary or pronunciation.pronunciations
+    onsets = source['onsets']
+    voiced_th = set(source.get('voiced_th', []))
+    words = {}
+
+    for family in source['families']:
+        rime = [unit.split(':') for unit in family['rime'].split()]
+        rime_spelling = ''.join(grapheme for grapheme, _ in rime)
+        for word in family['words'].split():
+            if not word.endswith(rime_spelling) or word[:-len(rime_spelling)] not in onsets:
+                raise ValueError(f"'{word}' does not fit family {family['pattern']} ({rime_spelling})")
+            onset = word[:-len(rime_spelling)]
+            sounds = ([onset] if onset else []) + [grapheme for grapheme, _ in rime]
+            onset_phoneme = 'ð' if word in voiced_th else onsets[onset]
+            phonemes = ([onset_phoneme] if onset else []) + [phoneme for _, phoneme in rime]
+            difficulty = max(family['difficulty'], _onset_difficulty(onset), key=DIFFICULTIES.index)
+            patterns = [family['pattern']] + ([onset] if len(onset) > 1 else [])
+            words[word] = {'word': word, 'sounds': sounds, 'phonemes': phonemes,
+                           'difficulty': difficulty, 'patterns': patterns}
+
+    for entry in source['words']:
+        patterns = sorted({sound for sound in entry['sounds'] if len(sound) > 1})
+        if entry['word'] in words:
+            # Hand-written entries override a family's sounds but keep its pattern
+            patterns = [words[entry['word']]['patterns'][0]] + [p for p in patterns if p != words[entry['word']]['patterns'][0]]
+        words[entry['word']] = {'word': entry['word'], 'sounds': entry['sounds'], 'phonemes': entry['phonemes'],
+                                'difficulty': entry['difficulty'], 'patterns': entry.get('patterns', patterns)}
+
+    items = []
+    unknown = []
+    for item_id, word in enumerate(sorted(words)):
+        item = words[word]
+        phonemes = dictionary.lookup(word)
+        if phonemes is None:
+            unknown.append(word)
+        items.append({'id': item_id, **item, 'pronunciation': phonemes, 'syllables': dictionary.syllables(word),
+                      'distractors': segmentation_distractors(item['sounds'])})
+    if unknown:
+        print(f"No pronunciation for {len(unknown)} phonics words: {' '.join(unknown[:20])}")
+    return {'version': 1, 'items': items}
+
+
+class PhonicsBank:
+    """Phonics game items, indexed for constant-time question selection.
+
+    Items come from data/phonics/item_bank.json (built from
+    word_families.json by `flask build-phonics`), each with a
+    precomputed pool of distractors. Ids are grouped by difficulty,
+    phoneme and grapheme pattern, alone and combined with difficulty, so
+    picking k questions is a random.sample of k ids from one list. A
+    phoneme is either one of an item's sound units ('ʃ', 'st') or an
+    ARPAbet phoneme from its dictionary pronunciation ('SH').
+    """
+
+    def __init__(self, bank_file=BANK_FILE, source_file=SOURCE_FILE):
+        self.bank_file = bank_file
+        self.source_file = source_file
+        self.items = None
+        self.index = {}
+        self.lock = threading.Lock()
+
+    def _load(self):
+        if self.items is not None:
+            return
+        with self.lock:
+            if self.items is not None:
+                return
+            try:
+                digest = source_digest(self.source_file, pronunciation.SOURCE_FILE)
+            except OSError:
+                digest = None  # Sources not deployed: trust the bank
+            try:
+                with open(self.bank_file, 'r', encoding='utf-8') as file:
+                    bank = json.load(file)
+            except FileNotFoundError:
+                bank = None
+            if bank is None or (digest is not None and bank.get('source_digest') != digest):
+                print(f"Phonics item bank {self.bank_file} is missing or out of date; building it in memory")
+                with open(self.source_file, 'r', encoding='utf-8') as file:
+                    bank = build_item_bank(json.load(file))
+
+            index = {}
+            for item in bank['items']:
+                difficulty = item['difficulty']
+                keys = [('difficulty', difficulty)]
+                arpabet = {phoneme.rstrip('012') for phoneme in item.get('pronunciation') or []}
+                for phoneme in set(item['phonemes']) | arpabet:
+                    if phoneme:
+                        keys += [('phoneme', phoneme), ('difficulty', difficulty, 'phoneme', phoneme)]
+                for pattern in set(item['patterns']):
+                    keys += [('pattern', pattern), ('difficulty', difficulty, 'pattern', pattern)]
+                for key in keys:
+                    index.setdefault(key, []).append(item['id'])
+            self.index = index
+            self.items = bank['items']
+
+    def _key(self, difficulty=None, phoneme=None, pattern=None):
+        key = ('difficulty', difficulty) if difficulty else ()
+        if phoneme:
+            key += ('phoneme', phoneme)
+        elif pattern:
+            key += ('pattern', pattern)
+        return key
+
+    def count(self, difficulty=None, phoneme=None, pattern=None):
+        self._load()
+        key = self._key(difficulty, phoneme, pattern)
+        return len(self.items) if not key else len(self.index.get(key, []))
+
+    def select(self, count, difficulty=None, phoneme=None, pattern=None, rng=random):
+        """Up to `count` distinct random items matching the filters"""
+        self._load()
+        key = self._key(difficulty, phoneme, pattern)
+        ids = self.index.get(key, []) if key else range(len(self.items))
+        return [self.items[item_id] for item_id in rng.sample(ids, min(count, len(ids)))]
+
+    def get(self, item_id):
+        self._load()
+        return self.items[item_id] if 0 <= item_id < len(self.items) else None
+
+    def make_question(self, item, rng=random, option_count=4):
+        """Multiple-choice question for an item, drawing wrong options from its distractor pool"""
+        correct_sounds = '-'.join(item['sounds'])
+        options = [correct_sounds] + rng.sample(item['distractors'], min(option_count - 1, len(item['distractors'])))
+        rng.shuffle(options)
+        return {
+            'item_id': item['id'],
+            'word': item['word'],
+            'correct_sounds': correct_sounds,
+            'options': options,
+            'correct_index': options.index(correct_sounds),
+            'phonemes': item['phonemes'],
+            'level': item['difficulty'].capitalize()
+        }
+
+
+def write_item_bank(source_file=SOURCE_FILE, bank_file=BANK_FILE):
+    """Build the item bank from the word families and save it; returns the item count"""
+    with open(source_file, 'r', encoding='utf-8') as file:
+        bank = build_item_bank(json.load(file))
+    digest = source_digest(source_file, pronunciation.SOURCE_FILE)
+    tmp_path = f'{bank_file}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        # One item per line keeps diffs of the generated file readable
+        items = ',\n'.join(json.dumps(item, ensure_ascii=False) for item in bank['items'])
+        file.write(f'{{"version": {bank["version"]}, "source_digest": "{digest}", "items": [\n{items}\n]}}\n')
+    os.replace(tmp_path, bank_file)
+    return len(bank['items'])
+
+
+phonics_bank = PhonicsBank()
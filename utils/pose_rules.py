@@ -0,0 +1,224 @@
+import numpy as np
+
+X, Y = 0, 1
+
+# MediaPipe Pose landmark indexes used by the movement rules
+POSE_LANDMARKS = {
+    'nose': 0, 'left_shoulder': 11, 'right_shoulder': 12, 'left_wrist': 15, 'right_wrist': 16,
+    'left_hip': 23, 'right_hip': 24, 'left_knee': 25, 'right_knee': 26, 'left_ankle': 27, 'right_ankle': 28,
+    'left_heel': 29, 'right_heel': 30, 'left_foot_index': 31, 'right_foot_index': 32
+}
+
+# Camera exercise movements. 'all' lists clauses that must all hold; a clause is
+# one condition or a list of conditions of which any must hold. Conditions:
+#   ('above', a, b)          a is higher in the image than b (smaller y)
+#   ('below', a, b)          a is lower in the image than b
+#   ('apart_x', a, b, dist)  a and b are more than dist apart horizontally
+#   ('apart_y', a, b, dist)  a and b are more than dist apart vertically
+MOVEMENT_RULES = {
+    'arm_raise': {
+        'all': [('above', 'left_wrist', 'left_shoulder'), ('above', 'right_wrist', 'right_shoulder')],
+        'success': 'Arms raised correctly!', 'hint': 'Raise both arms above your head.'
+    },
+    'side_step': {
+        'all': [('apart_x', 'left_ankle', 'right_ankle', 0.35)],
+        'success': 'Good side step!', 'hint': 'Step wider to the side.'
+    },
+    'march_in_place': {
+        'all': [[('above', 'left_knee', 'left_hip'), ('above', 'right_knee', 'right_hip')]],
+        'success': 'Great knee lift!', 'hint': 'Lift your knees higher.'
+    },
+    'squat_hold': {
+        'all': [('below', 'left_hip', 'left_knee'), ('below', 'right_hip', 'right_knee')],
+        'success': 'Squat position held!', 'hint': 'Lower your hips more.'
+    },
+    'torso_twist': {
+        'all': [('apart_x', 'left_shoulder', 'right_shoulder', 0.25)],
+        'success': 'Good torso twist!', 'hint': 'Twist your torso more.'
+    },
+    'jumping_jacks': {
+        'all': [('above', 'left_wrist', 'nose'), ('above', 'right_wrist', 'nose'),
+                ('apart_x', 'left_ankle', 'right_ankle', 0.4)],
+        'success': 'Jumping jack detected!', 'hint': 'Jump higher and spread your feet.'
+    },
+    'heel_walk': {
+        'all': [('above', 'left_foot_index', 'left_heel'), ('above', 'right_foot_index', 'right_heel')],
+        'success': 'Heel walk detected!', 'hint': 'Lift your toes up for heel walk.'
+    },
+    'balance_reach': {
+        'all': [('above', 'left_wrist', 'left_hip'), ('above', 'right_wrist', 'right_hip'),
+                ('apart_y', 'left_ankle', 'right_ankle', 0.2)],
+        'success': 'Balance reach detected!', 'hint': 'Reach forward and balance on one foot.'
+    }
+}
+
+# Hand gestures by extended fingers (thumb, index, middle, ring, pinky): an exact
+# pattern, or None with a minimum number of extended fingers. First match wins.
+GESTURE_RULES = (
+    ('rock', (0, 0, 0, 0, 0), 0),
+    ('paper', (1, 1, 1, 1, 1), 0),
+    ('scissors', (0, 1, 1, 0, 0), 0),
+    ('point', (0, 1, 0, 0, 0), 0),
+    ('thumbs_up', (1, 0, 0, 0, 0), 0),
+    ('wave', None, 4)
+)
+DEFAULT_GESTURE = 'open_palm'
+
+FINGER_TIPS = [8, 12, 16, 20]  # index to pinky; the thumb is handled separately
+FINGER_JOINTS = [6, 10, 14, 18]
+
+
+def _condition(condition, landmarks):
+    """(first, second, axis, absolute, threshold): holds when coord(first) - coord(second), made
+    absolute if asked, is greater than threshold"""
+    op, a, b, *distance = condition
+    a, b = landmarks[a], landmarks[b]
+    if op == 'above':
+        return b, a, Y, False, 0.0  # Image y grows downwards
+    if op == 'below':
+        return a, b, Y, False, 0.0
+    if op == 'apart_x':
+        return a, b, X, True, float(distance[0])
+    if op == 'apart_y':
+        return a, b, Y, True, float(distance[0])
+    raise ValueError(f"Unknown rule condition '{op}'")
+
+
+def _coordinates(landmarks):
+    """One frame's (n, fields) landmarks indexable as values[i, axis] -> Python float.
+
+    A memoryview over the array: indexing it costs about as much as a
+    dict lookup, several times less than ndarray.item() or indexing the
+    array, and its floats are as exact as evaluate()'s float64.
+    """
+    return memoryview(np.asarray(landmarks))
+
+
+def _holds(plan, values):
+    """Whether every clause of a compiled rule has a condition that holds"""
+    for clause in plan:
+        for first, second, axis, absolute, threshold in clause:
+            diff = values[first, axis] - values[second, axis]
+            if (abs(diff) if absolute else diff) > threshold:
+                break
+        else:
+            return False
+    return True
+
+
+class RuleSet:
+    """Declarative landmark rules compiled into one vectorized check.
+
+    Every distinct condition becomes a column of index arrays, and the
+    clause/rule structure becomes two small 0/1 matrices. evaluate()
+    then checks every rule against a batch of frames with a few array
+    operations instead of per-rule Python branches. check() is the
+    single-frame path: it compares just the coordinates one rule uses as
+    plain floats, since for one frame the NumPy call overhead costs more
+    than the comparisons. Adding a movement only takes a rule entry.
+    """
+
+    def __init__(self, rules, landmarks=POSE_LANDMARKS):
+        self.rules = rules
+        self.names = tuple(rules)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        conditions = {}
+        clauses = []
+        rule_clauses = []
+        for rule in rules.values():
+            rule_clauses.append([])
+            for clause in rule['all']:
+                options = clause if isinstance(clause, list) else [clause]
+                clauses.append([conditions.setdefault(_condition(option, landmarks), len(conditions))
+                                for option in options])
+                rule_clauses[-1].append(len(clauses) - 1)
+
+        columns = list(zip(*conditions))
+        self.first = np.array(columns[0], dtype=np.intp)
+        self.second = np.array(columns[1], dtype=np.intp)
+        self.axis = np.array(columns[2], dtype=np.intp)
+        self.absolute = np.array(columns[3], dtype=bool)
+        self.threshold = np.array(columns[4], dtype=np.float64)
+        self.clause_matrix = np.zeros((len(conditions), len(clauses)), dtype=np.int32)
+        for clause, members in enumerate(clauses):
+            self.clause_matrix[members, clause] = 1
+        self.rule_matrix = np.zeros((len(clauses), len(rules)), dtype=np.int32)
+        for rule, members in enumerate(rule_clauses):
+            self.rule_matrix[members, rule] = 1
+        self.required = self.rule_matrix.sum(axis=0)
+        # Per rule, its clauses as tuples of (first, second, axis, absolute, threshold) conditions
+        condition_list = list(conditions)
+        self.plans = {name: [tuple(condition_list[c] for c in clauses[k]) for k in rule_clauses[i]]
+                      for i, name in enumerate(self.names)}
+
+    def evaluate(self, landmarks):
+        """Whether each rule holds: (n, fields) landmarks -> (rules,) bools, (frames, n, fields) -> (frames, rules)"""
+        landmarks = np.asarray(landmarks)
+        fields = landmarks.shape[-1]
+        values = landmarks.reshape(landmarks.shape[:-2] + (-1,))
+        # float64 so threshold comparisons match plain Python floats exactly
+        diffs = (values[..., self.first * fields + self.axis].astype(np.float64)
+                 - values[..., self.second * fields + self.axis])
+        np.abs(diffs, out=diffs, where=self.absolute)
+        clauses = (diffs > self.threshold).astype(np.int32) @ self.clause_matrix
+        return (clauses > 0).astype(np.int32) @ self.rule_matrix == self.required
+
+    def check(self, landmarks, name):
+        """Whether one rule holds for one frame of (n, fields) landmarks"""
+        return _holds(self.plans[name], _coordinates(landmarks))
+
+    def check_all(self, landmarks):
+        """{rule: holds} for one frame of (n, fields) landmarks"""
+        values = _coordinates(landmarks)
+        return {name: _holds(plan, values) for name, plan in self.plans.items()}
+
+
+def fingers_up(hands):
+    """Which fingers are extended: (21, fields) hand landmarks -> (5,) bools, (frames, 21, fields) -> (frames, 5)"""
+    hands = np.asarray(hands, dtype=np.float64)
+    x, y = hands[..., X], hands[..., Y]
+    # The thumb opens sideways, outwards from the palm: the little finger base left of
+    # the index base means a right hand
+    right = x[..., 17] < x[..., 5]
+    thumb = np.where(right, x[..., 4] > x[..., 3], x[..., 4] < x[..., 3])
+    others = y[..., FINGER_TIPS] < y[..., FINGER_JOINTS]
+    return np.concatenate([thumb[..., None], others], axis=-1)
+
+
+class GestureTable:
+    """GESTURE_RULES compiled into a lookup table over the 32 finger combinations.
+
+    Classifying is computing the five finger flags, reading them as a
+    5-bit number and indexing the table, for a batch at once. A single
+    hand takes the same steps on plain floats.
+    """
+
+    BITS = np.array([1, 2, 4, 8, 16])
+
+    def __init__(self, rules=GESTURE_RULES, default=DEFAULT_GESTURE):
+        table = []
+        for code in range(32):
+            fingers = tuple((code >> bit) & 1 for bit in range(5))
+            table.append(next((name for name, pattern, minimum in rules
+                               if (fingers == pattern if pattern is not None else sum(fingers) >= minimum)), default))
+        self.names = table
+        self.table = np.array(table)
+
+    def classify(self, hands):
+        """Gesture name for (21, fields) landmarks, or an array of names for (frames, 21, fields)"""
+        hands = np.asarray(hands)
+        if hands.ndim == 2:
+            return self.names[self._code(_coordinates(hands))]
+        return self.table[fingers_up(hands) @ self.BITS]
+
+    @staticmethod
+    def _code(v):
+        """fingers_up for one hand as a 5-bit number"""
+        thumb = v[4, X] > v[3, X] if v[17, X] < v[5, X] else v[4, X] < v[3, X]
+        # FINGER_TIPS over FINGER_JOINTS, unrolled
+        return (thumb | (v[8, Y] < v[6, Y]) << 1 | (v[12, Y] < v[10, Y]) << 2
+                | (v[16, Y] < v[14, Y]) << 3 | (v[20, Y] < v[18, Y]) << 4)
+
+
+movement_rules = RuleSet(MOVEMENT_RULES)
+gesture_table = GestureTable()
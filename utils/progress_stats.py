@@ -0,0 +1,182 @@
+from datetime import datetime
+
+MODULES = ['dyslexia', 'dyscalculia', 'dysgraphia', 'dyspraxia']
+
+# CSV file -> (module, kind). 'progress' rows count as activities.
+SOURCES = {
+    'data/dyslexia/progress.csv': ('dyslexia', 'progress'),
+    'data/dyslexia/games.csv': ('dyslexia', 'games'),
+    'data/dyscalculia/progress.csv': ('dyscalculia', 'progress'),
+    'data/dysgraphia/progress.csv': ('dysgraphia', 'progress'),
+    'data/dyspraxia/progress.csv': ('dyspraxia', 'progress'),
+    'data/dyspraxia/games.csv': ('dyspraxia', 'games'),
+}
+
+RECENT_ACTIVITY_LIMIT = 5
+
+
+def new_state():
+    """Empty running totals for one user"""
+    return {
+        'dyslexia': {'sessions': 0, 'games': 0, 'accuracy_sum': 0, 'recent': []},
+        'dyscalculia': {'problems': 0, 'correct': 0, 'recent': []},
+        'dysgraphia': {'sessions': 0, 'words': 0, 'recent': []},
+        'dyspraxia': {'exercises': 0, 'stability_sum': 0, 'duration_sum': 0, 'recent': [],
+                      'games': 0, 'game_accuracy_sum': 0, 'game_time_sum': 0, 'game_counts': {},
+                      'recent_scores': []},
+        'dates': set()
+    }
+
+
+def dump_state(state):
+    """JSON-serializable copy of a state"""
+    return {**state, 'dates': sorted(state['dates'])}
+
+
+def load_state(data):
+    """Inverse of dump_state()"""
+    state = new_state()
+    for key, value in data.items():
+        state[key] = set(value) if key == 'dates' else value
+    return state
+
+
+class ProgressAggregator:
+    """Single-pass aggregation of a user's progress rows.
+
+    Rows are folded in one at a time with add(); dashboard_data() then
+    builds the same payload the per-module helpers in modules/dashboard.py
+    used to compute with several passes over every file.
+    """
+
+    def __init__(self, state=None):
+        self.state = state or new_state()
+
+    def add(self, source, row):
+        """Fold one row from a SOURCES file into the running totals"""
+        module, kind = SOURCES[source]
+        totals = self.state[module]
+
+        if kind == 'games' and module == 'dyspraxia':
+            game_type = row.get('game_type')
+            totals['games'] += 1
+            totals['game_accuracy_sum'] += float(row.get('accuracy', 0))
+            totals['game_time_sum'] += float(row.get('game_time', 0))
+            totals['game_counts'][game_type] = totals['game_counts'].get(game_type, 0) + 1
+            totals['recent_scores'].append(float(row.get('accuracy', 0)))
+            del totals['recent_scores'][:-RECENT_ACTIVITY_LIMIT]
+            return
+        if kind == 'games':
+            totals['games'] += 1
+            totals['accuracy_sum'] += float(row.get('accuracy', 0))
+            return
+
+        if module == 'dyslexia':
+            totals['sessions'] += 1
+        elif module == 'dyscalculia':
+            totals['problems'] += 1
+            if row.get('correct') == 'True':
+                totals['correct'] += 1
+        elif module == 'dysgraphia':
+            totals['sessions'] += 1
+            totals['words'] += int(row.get('word_count', 0))
+        elif module == 'dyspraxia':
+            totals['exercises'] += 1
+            totals['stability_sum'] += float(row.get('stability_score', 0))
+            totals['duration_sum'] += float(row.get('duration', 0))
+
+        totals['recent'].append(row)
+        del totals['recent'][:-RECENT_ACTIVITY_LIMIT]
+
+        if 'timestamp' in row:
+            self.state['dates'].add(row['timestamp'].split('T')[0])
+
+    def add_rows(self, source, rows):
+        for row in rows:
+            self.add(source, row)
+
+    def dashboard_data(self):
+        """Build the 'data' section of /dashboard/data"""
+        dyslexia = self.state['dyslexia']
+        dyscalculia = self.state['dyscalculia']
+        dysgraphia = self.state['dysgraphia']
+        dyspraxia = self.state['dyspraxia']
+
+        avg_accuracy = dyslexia['accuracy_sum'] / dyslexia['games'] if dyslexia['games'] else 0
+        avg_stability = dyspraxia['stability_sum'] / dyspraxia['exercises'] if dyspraxia['exercises'] else 0
+
+        return {
+            'dyslexia': {
+                'total_sessions': dyslexia['sessions'],
+                'total_games': dyslexia['games'],
+                'avg_accuracy': round(avg_accuracy, 1),
+                'recent_activity': list(dyslexia['recent'])
+            },
+            'dyscalculia': {
+                'total_problems': dyscalculia['problems'],
+                'correct_answers': dyscalculia['correct'],
+                'accuracy': (dyscalculia['correct'] / dyscalculia['problems'] * 100) if dyscalculia['problems'] > 0 else 0,
+                'recent_activity': list(dyscalculia['recent'])
+            },
+            'dysgraphia': {
+                'total_sessions': dysgraphia['sessions'],
+                'total_words_written': dysgraphia['words'],
+                'avg_words_per_session': dysgraphia['words'] / dysgraphia['sessions'] if dysgraphia['sessions'] else 0,
+                'recent_activity': list(dysgraphia['recent'])
+            },
+            'dyspraxia': {
+                'total_exercises': dyspraxia['exercises'],
+                'avg_stability': round(avg_stability, 1),
+                'total_duration': dyspraxia['duration_sum'],
+                'recent_activity': list(dyspraxia['recent'])
+            },
+            'overall_stats': {
+                'total_activities': (dyslexia['sessions'] + dyscalculia['problems'] +
+                                     dysgraphia['sessions'] + dyspraxia['exercises']),
+                'active_days': len(self.state['dates']),
+                'streak': streak_from_dates(self.state['dates'])
+            }
+        }
+
+    def game_stats(self):
+        """Build the 'stats' payload of /dyspraxia/get-game-stats"""
+        totals = self.state['dyspraxia']
+        if not totals['games']:
+            return {'total_games': 0, 'average_accuracy': 0, 'total_time_played': 0, 'favorite_game': 'N/A', 'game_breakdown': {}, 'recent_scores': []}
+        return {
+            'total_games': totals['games'],
+            'average_accuracy': round(totals['game_accuracy_sum'] / totals['games'], 1),
+            'total_time_played': round(totals['game_time_sum']),
+            'favorite_game': max(totals['game_counts'].items(), key=lambda item: item[1])[0],
+            'game_breakdown': dict(totals['game_counts']),
+            'recent_scores': list(totals['recent_scores'])
+        }
+
+
+def streak_from_dates(dates):
+    """Count consecutive days ending at the most recent active date"""
+    unique_dates = sorted(set(dates), reverse=True)
+    if not unique_dates:
+        return 0
+
+    streak = 1
+    current_date = datetime.strptime(unique_dates[0], '%Y-%m-%d').date()
+
+    for i in range(1, len(unique_dates)):
+        prev_date = datetime.strptime(unique_dates[i], '%Y-%m-%d').date()
+        if (current_date - prev_date).days == 1:
+            streak += 1
+            current_date = prev_date
+        else:
+            break
+
+    return streak
+
+
+def aggregate_user_progress(file_manager, user_id, modules=None):
+    """Read each progress source for a user once and aggregate it"""
+    aggregator = ProgressAggregator()
+    for source, (module, _) in SOURCES.items():
+        if modules is None or module in modules:
+            aggregator.add_rows(source, file_manager.read_user_rows(source, user_id))
+    return aggregator
@@ -0,0 +1,223 @@
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+
+from utils.artifacts import source_digest
+
+SOURCE_FILE = 'data/pronunciation/dictionary.txt'
+DICTIONARY_FILE = 'data/pronunciation/dictionary.bin'
+
+MAGIC = b'PRONDICT'
+VERSION = 2
+HEADER = struct.Struct('<8sII32s')  # magic, version, entry count, SHA-256 of the source
+
+CONSONANTS = ('B', 'CH', 'D', 'DH', 'F', 'G', 'HH', 'JH', 'K', 'L', 'M', 'N', 'NG',
+              'P', 'R', 'S', 'SH', 'T', 'TH', 'V', 'W', 'Y', 'Z', 'ZH')
+VOWELS = ('AA', 'AE', 'AH', 'AO', 'AW', 'AY', 'EH', 'ER', 'EY', 'IH', 'IY', 'OW', 'OY', 'UH', 'UW')
+# One byte per phoneme in the compiled file; every id from len(CONSONANTS) on is a vowel
+PHONEMES = CONSONANTS + tuple(vowel + stress for vowel in VOWELS for stress in '012')
+PHONEME_IDS = {phoneme: index for index, phoneme in enumerate(PHONEMES)}
+
+# How each phoneme is written in a phonics-style breakdown ("ship" -> sh-i-p)
+SOUND_SPELLINGS = {
+    'B': 'b', 'CH': 'ch', 'D': 'd', 'DH': 'th', 'F': 'f', 'G': 'g', 'HH': 'h', 'JH': 'j', 'K': 'k',
+    'L': 'l', 'M': 'm', 'N': 'n', 'NG': 'ng', 'P': 'p', 'R': 'r', 'S': 's', 'SH': 'sh', 'T': 't',
+    'TH': 'th', 'V': 'v', 'W': 'w', 'Y': 'y', 'Z': 'z', 'ZH': 'zh',
+    'AA': 'o', 'AE': 'a', 'AH': 'u', 'AO': 'aw', 'AW': 'ow', 'AY': 'igh', 'EH': 'e', 'ER': 'er',
+    'EY': 'ay', 'IH': 'i', 'IY': 'ee', 'OW': 'oa', 'OY': 'oy', 'UH': 'oo', 'UW': 'oo'
+}
+
+
+def normalize_word(word):
+    return word.strip().lower().replace('’', "'")
+
+
+def parse_source(lines):
+    """{word: [phoneme, ...]} from CMUdict-format lines, keeping each word's first pronunciation"""
+    entries = {}
+    for number, line in enumerate(lines, 1):
+        line = line.split('#', 1)[0].strip()
+        if not line or line.startswith(';;;'):
+            continue
+        word, *phonemes = line.split()
+        if word.endswith(')') and '(' in word:
+            continue  # word(2), word(3): alternate pronunciations
+        for phoneme in phonemes:
+            if phoneme not in PHONEME_IDS:
+                raise ValueError(f"Line {number}: unknown phoneme '{phoneme}' for '{word}'")
+        if phonemes:
+            entries.setdefault(normalize_word(word), phonemes)
+    return entries
+
+
+def compile_dictionary(entries, digest=bytes(32)):
+    """The compiled file for {word: phonemes}, as bytes; digest is the raw source_digest of its source.
+
+    Layout (little-endian): the header; 257 uint32 bucket bounds, where
+    entries starting with byte b are buckets[b]..buckets[b + 1]; the key
+    and value offset tables (count + 1 uint32 each, positions in the
+    file); one syllable count byte per entry; the UTF-8 keys in sorted
+    order and one phoneme id byte per phoneme.
+    """
+    keys = sorted(word.encode('utf-8') for word in entries)
+    phonemes = [[PHONEME_IDS[phoneme] for phoneme in entries[key.decode('utf-8')]] for key in keys]
+    buckets = array('I', [bisect_left(keys, bytes([b])) for b in range(256)] + [len(keys)])
+    keys_start = HEADER.size + 4 * len(buckets) + 8 * (len(keys) + 1) + len(keys)
+    values_start = keys_start + sum(len(key) for key in keys)
+    key_offsets = array('I', [keys_start])
+    value_offsets = array('I', [values_start])
+    syllables = bytearray()
+    values = bytearray()
+    for key, ids in zip(keys, phonemes):
+        key_offsets.append(key_offsets[-1] + len(key))
+        values.extend(ids)
+        value_offsets.append(values_start + len(values))
+        syllables.append(min(255, sum(1 for i in ids if i >= len(CONSONANTS))))
+    if sys.byteorder != 'little':
+        for table in (buckets, key_offsets, value_offsets):
+            table.byteswap()
+    return b''.join([HEADER.pack(MAGIC, VERSION, len(keys), digest), buckets.tobytes(), key_offsets.tobytes(),
+                     value_offsets.tobytes(), bytes(syllables), b''.join(keys), bytes(values)])
+
+
+class PronunciationDictionary:
+    """Word -> ARPAbet pronunciation lookups from a compiled, memory-mapped file.
+
+    The CMUdict-format source (data/pronunciation/dictionary.txt) is
+    compiled by `flask build-pronunciations` into one sorted array file
+    that is mapped read-only, so every worker shares the same pages
+    through the OS page cache instead of holding its own dict. A lookup
+    is a binary search over the offset table. A missing or out of date
+    file is compiled on first use.
+    """
+
+    def __init__(self, path=DICTIONARY_FILE, source_file=SOURCE_FILE):
+        self.path = path
+        self.source_file = source_file
+        self.data = None
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def _load(self):
+        if self.data is not None:
+            return
+        with self.lock:
+            if self.data is not None:
+                return
+            try:
+                digest = bytes.fromhex(source_digest(self.source_file))
+            except OSError:
+                digest = None  # Source not deployed: trust the compiled file
+            data = self._map(digest)
+            if data is None:
+                print(f"Pronunciation dictionary {self.path} is missing or out of date; compiling it")
+                try:
+                    write_dictionary(self.source_file, self.path)
+                    data = self._map()
+                except OSError as e:
+                    # Read-only deployment: keep the compiled bytes in this process instead
+                    print(f"Could not write {self.path} ({e}); using an in-memory copy")
+                    with open(self.source_file, 'r', encoding='utf-8') as file:
+                        data = compile_dictionary(parse_source(file), digest)
+
+            count = HEADER.unpack_from(data, 0)[2]
+            view = memoryview(data)
+            self.buckets = self._offsets(view[HEADER.size:HEADER.size + 4 * 257])
+            start = HEADER.size + 4 * 257
+            table_size = 4 * (count + 1)
+            self.key_offsets = self._offsets(view[start:start + table_size])
+            self.value_offsets = self._offsets(view[start + table_size:start + 2 * table_size])
+            self.syllable_counts = view[start + 2 * table_size:start + 2 * table_size + count]
+            self.count = count
+            self.data = data
+
+    def _map(self, digest=None):
+        """The compiled file mapped read-only, or None if it is missing, was written by another
+        format version or was compiled from a source other than the one with this digest"""
+        try:
+            with open(self.path, 'rb') as file:
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return None
+        magic, version, _, stored = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION or (digest is not None and stored != digest):
+            data.close()
+            return None
+        return data
+
+    def _offsets(self, view):
+        if sys.byteorder == 'little':
+            return view.cast('I')
+        offsets = array('I', view.tobytes())
+        offsets.byteswap()
+        return offsets
+
+    def _find(self, word):
+        """Index of a word's entry, or -1"""
+        if self.data is None:
+            self._load()
+        key = normalize_word(word).encode('utf-8')
+        if not key:
+            return -1
+        data = self.data
+        offsets = self.key_offsets
+        # The first byte picks the bucket, so the search only covers words with the same initial
+        lo = self.buckets[key[0]]
+        hi = end = self.buckets[key[0] + 1]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if data[offsets[mid]:offsets[mid + 1]] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < end and data[offsets[lo]:offsets[lo + 1]] == key:
+            return lo
+        return -1
+
+    def lookup(self, word):
+        """ARPAbet phonemes with stress digits (['K', 'AE1', 'T']), or None for unknown words"""
+        index = self._find(word)
+        if index < 0:
+            return None
+        ids = self.data[self.value_offsets[index]:self.value_offsets[index + 1]]
+        return [PHONEMES[i] for i in ids]
+
+    def syllables(self, word):
+        """Syllable (vowel) count, or None for unknown words"""
+        index = self._find(word)
+        return self.syllable_counts[index] if index >= 0 else None
+
+    def sounds(self, word):
+        """Phonics-style spelling of each phoneme (['sh', 'i', 'p']), or None for unknown words"""
+        phonemes = self.lookup(word)
+        if phonemes is None:
+            return None
+        return ['uh' if phoneme == 'AH0' else SOUND_SPELLINGS[phoneme.rstrip('012')] for phoneme in phonemes]
+
+    def __contains__(self, word):
+        return self._find(word) >= 0
+
+    def __len__(self):
+        if self.data is None:
+            self._load()
+        return self.count
+
+
+def write_dictionary(source_file=SOURCE_FILE, path=DICTIONARY_FILE):
+    """Compile the source dictionary and save it; returns the entry count"""
+    with open(source_file, 'r', encoding='utf-8') as file:
+        entries = parse_source(file)
+    digest = bytes.fromhex(source_digest(source_file))
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as file:
+        file.write(compile_dictionary(entries, digest))
+    # Processes that already mapped the old file keep reading it until they reload
+    os.replace(tmp_path, path)
+    return len(entries)
+
+
+pronunciations = PronunciationDictionary()
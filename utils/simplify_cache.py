@@ -0,0 +1,171 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class SimplificationCache:
+    """Two-tier cache for model simplification results.
+
+    Keys are content hashes of the normalized input text together with the
+    model name and generation settings, so a change to either produces a
+    fresh entry. The memory tier is a per-process LRU; the disk tier is a
+    directory of small JSON files that every gunicorn worker can share.
+    Entries expire after `ttl` seconds and the disk tier is trimmed to
+    `max_disk_bytes`, oldest first.
+    """
+
+    # Check the disk tier size after this many writes
+    PRUNE_EVERY = 50
+
+    def __init__(self, cache_dir, max_entries=512, ttl=7 * 24 * 3600, max_disk_bytes=100 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_disk_bytes = max_disk_bytes
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.writes_since_prune = 0
+        self.counters = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+    @staticmethod
+    def normalize(text):
+        """Collapse whitespace so trivially different pastes share an entry"""
+        return ' '.join(text.split())
+
+    def make_key(self, text, model, settings):
+        payload = json.dumps({
+            'text': self.normalize(text),
+            'model': model,
+            'settings': settings
+        }, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f'{key}.json')
+
+    def _expired(self, created):
+        return self.ttl and time.time() - created > self.ttl
+
+    def get(self, key):
+        """Return the cached value for a key, or None"""
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None:
+                value, created = entry
+                if not self._expired(created):
+                    self.memory.move_to_end(key)
+                    self.counters['memory_hits'] += 1
+                    return value
+                del self.memory[key]
+
+        try:
+            with open(self._disk_path(key), 'r', encoding='utf-8') as file:
+                stored = json.load(file)
+        except (FileNotFoundError, ValueError):
+            stored = None
+
+        with self.lock:
+            if stored is None or self._expired(stored.get('created', 0)):
+                self.counters['misses'] += 1
+                return None
+            self.counters['disk_hits'] += 1
+            self._remember(key, stored['value'], stored['created'])
+            return stored['value']
+
+    def set(self, key, value):
+        """Store a value in both tiers"""
+        created = time.time()
+        with self.lock:
+            self._remember(key, value, created)
+            self.counters['stores'] += 1
+            self.writes_since_prune += 1
+            prune = self.writes_since_prune >= self.PRUNE_EVERY
+            if prune:
+                self.writes_since_prune = 0
+
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as file:
+                json.dump({'created': created, 'value': value}, file, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error writing simplification cache entry: {e}")
+
+        if prune:
+            self.prune()
+
+    def _remember(self, key, value, created):
+        self.memory[key] = (value, created)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+            self.counters['evictions'] += 1
+
+    def prune(self):
+        """Drop expired disk entries, then the oldest until under the size limit"""
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                if self._expired(stat.st_mtime):
+                    self._remove(path)
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_disk_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+            with self.lock:
+                self.counters['evictions'] += 1
+        except FileNotFoundError:
+            pass
+
+    def stats(self):
+        with self.lock:
+            lookups = self.counters['memory_hits'] + self.counters['disk_hits'] + self.counters['misses']
+            hits = lookups - self.counters['misses']
+            return {
+                **self.counters,
+                'memory_entries': len(self.memory),
+                'hit_rate': round(hits / lookups, 3) if lookups else 0
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_simplification_cache(config):
+    """Process-wide cache configured from the Flask config, or None when disabled"""
+    global _cache
+    if not config.get('SIMPLIFY_CACHE_ENABLED', True):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = SimplificationCache(
+                config.get('SIMPLIFY_CACHE_DIR', 'data/ai_models/simplify_cache'),
+                max_entries=config.get('SIMPLIFY_CACHE_MEMORY_ENTRIES', 512),
+                ttl=config.get('SIMPLIFY_CACHE_TTL', 7 * 24 * 3600),
+                max_disk_bytes=config.get('SIMPLIFY_CACHE_MAX_DISK_MB', 100) * 1024 * 1024
+            )
+        return _cache
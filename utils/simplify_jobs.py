@@ -0,0 +1,208 @@
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to the in-process lock only
+    fcntl = None
+
+
+class UpgradeJobs:
+    """Background model upgrades for two-phase simplification.
+
+    The request thread answers with the rule-based text straight away and
+    submits the model call here. A fixed pool of worker threads runs the
+    calls; when `max_pending` jobs are already queued or running in this
+    process, submit() refuses and the rule-based text is final. A job
+    that has not finished by its deadline resolves to the rule-based
+    text, and a late model result is dropped.
+
+    Every job is a JSON file under `root`, rewritten atomically, so any
+    worker can answer a poll for it. A job is resolved only once: the
+    runner and a poll past the deadline both settle it under an flock.
+    A job whose runner died with its worker stays pending until the
+    deadline and then resolves to the rule-based text. Job files are
+    deleted `ttl` seconds after their last update.
+    """
+
+    def __init__(self, root='data/jobs/upgrades', max_workers=2, max_pending=16, timeout=10.0, ttl=300):
+        self.root = root
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='simplify-upgrade')
+        self.slots = threading.BoundedSemaphore(max_pending)
+        self.timeout = timeout
+        self.ttl = ttl
+        self.pending = 0
+        self.lock = threading.Lock()
+        self.counters = {'submitted': 0, 'rejected': 0, 'upgraded': 0, 'fallback': 0, 'timed_out': 0}
+
+    # --- Files ---------------------------------------------------------------
+
+    def _path(self, job_id):
+        return os.path.join(self.root, f'{job_id}.json')
+
+    @contextmanager
+    def _exclusive(self):
+        """Serialize job resolution across threads and worker processes"""
+        with self.lock:
+            if fcntl is None:
+                yield
+                return
+            with open(os.path.join(self.root, '.lock'), 'a') as handle:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _read(self, job_id):
+        try:
+            with open(self._path(job_id), 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, job):
+        path = self._path(job['id'])
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(job, file)
+        os.replace(tmp_path, path)
+
+    # --- Running -------------------------------------------------------------
+
+    def submit(self, fn, fallback, owner=None):
+        """Run fn() in the background; returns a job id, or None if the pool is full.
+
+        fn returns the upgraded text, or None to keep `fallback`.
+        """
+        if not self.slots.acquire(blocking=False):
+            with self.lock:
+                self.counters['rejected'] += 1
+            return None
+
+        now = time.time()
+        job = {
+            'id': str(uuid.uuid4()),
+            'owner': owner,
+            'status': 'pending',  # pending -> upgraded | fallback | timed_out
+            'result': None,
+            'fallback': fallback,
+            'created': now,
+            'deadline': now + self.timeout
+        }
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            self._prune(now)
+            self._write(job)
+            self.executor.submit(self._run, job, fn)
+        except (OSError, RuntimeError):
+            self.slots.release()
+            try:
+                os.remove(self._path(job['id']))
+            except OSError:
+                pass
+            return None
+        with self.lock:
+            self.counters['submitted'] += 1
+            self.pending += 1
+        return job['id']
+
+    def _run(self, job, fn):
+        result = None
+        try:
+            if time.time() < job['deadline']:
+                result = fn()
+        except Exception as e:
+            print(f"Error in simplification upgrade: {e}")
+        finally:
+            self.slots.release()
+            with self.lock:
+                self.pending -= 1
+
+        with self._exclusive():
+            job = self._read(job['id'])
+            if job is None or job['status'] != 'pending':
+                return  # Pruned, or the deadline already passed and the fallback is final
+            if time.time() > job['deadline']:
+                self._finish(job, 'timed_out', job['fallback'])
+            elif result is None:
+                self._finish(job, 'fallback', job['fallback'])
+            else:
+                self._finish(job, 'upgraded', result)
+
+    def _finish(self, job, status, result):
+        """Resolve a job; the caller holds _exclusive()"""
+        job['status'] = status
+        job['result'] = result
+        job['finished'] = time.time()
+        self._write(job)
+        self.counters[status] += 1
+
+    def _prune(self, now):
+        for name in os.listdir(self.root):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.root, name)
+            try:
+                if now - os.path.getmtime(path) > self.ttl:
+                    os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    # --- API -----------------------------------------------------------------
+
+    def get(self, job_id, owner=None):
+        """Current state of a job, or None if unknown (or owned by someone else)"""
+        job = self._read(job_id) if _valid_id(job_id) else None
+        if job is None or job['owner'] != owner:
+            return None
+        now = time.time()
+        if job['status'] == 'pending' and now > job['deadline']:
+            with self._exclusive():
+                job = self._read(job_id)
+                if job is None:
+                    return None
+                if job['status'] == 'pending':
+                    self._finish(job, 'timed_out', job['fallback'])
+        return {
+            'job_id': job_id,
+            'status': job['status'],
+            'final': job['status'] != 'pending',
+            'simplified': job['result'],
+            'retry_after_ms': max(0, min(500, int((job['deadline'] - now) * 1000)))
+        }
+
+    def stats(self):
+        with self.lock:
+            return {**self.counters, 'pending': self.pending}
+
+
+def _valid_id(job_id):
+    try:
+        return str(uuid.UUID(job_id)) == job_id
+    except ValueError:
+        return False
+
+
+_jobs = None
+_jobs_lock = threading.Lock()
+
+
+def get_upgrade_jobs(config):
+    """Process-wide upgrade pool configured from the Flask config"""
+    global _jobs
+    with _jobs_lock:
+        if _jobs is None:
+            _jobs = UpgradeJobs(
+                config.get('SIMPLIFY_UPGRADE_DIR', 'data/jobs/upgrades'),
+                max_workers=config.get('SIMPLIFY_UPGRADE_WORKERS', 2),
+                max_pending=config.get('SIMPLIFY_UPGRADE_MAX_PENDING', 16),
+                timeout=config.get('SIMPLIFY_UPGRADE_TIMEOUT', 10.0),
+                ttl=config.get('SIMPLIFY_UPGRADE_TTL', 300)
+            )
+        return _jobs
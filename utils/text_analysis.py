@@ -0,0 +1,185 @@
+import re
+from functools import lru_cache
+
+from utils.pronunciation import pronunciations
+from utils.tokenizer import sent_tokenize, sentence_word_tokenize
+from utils.word_frequency import word_table
+
+_NON_WORD_RE = re.compile(r'[^\w]')
+
+DIFFICULT_WORD_LIMIT = 10
+# Grade levels (utils.word_frequency) from which a known word counts as difficult, and as hard
+DIFFICULT_GRADE = 6
+HARD_GRADE = 9
+
+
+@lru_cache(maxsize=65536)
+def count_syllables(word):
+    """Count syllables in a word: from the pronunciation dictionary, else vowel groups minus a silent final 'e'"""
+    syllables = pronunciations.syllables(word)
+    if syllables:
+        return syllables
+
+    word = word.lower()
+    vowels = 'aeiouy'
+    syllable_count = 0
+    prev_was_vowel = False
+
+    for char in word:
+        is_vowel = char in vowels
+        if is_vowel and not prev_was_vowel:
+            syllable_count += 1
+        prev_was_vowel = is_vowel
+
+    # Handle silent 'e'
+    if word.endswith('e') and syllable_count > 1:
+        syllable_count -= 1
+
+    return max(1, syllable_count)
+
+
+def tokenize(text):
+    """Split text into sentences and word tokens in one go.
+
+    Gives the same tokens as word_tokenize(text), which would otherwise
+    run the sentence splitter a second time.
+    """
+    sentences = sent_tokenize(text)
+    tokens = [token for sentence in sentences for token in sentence_word_tokenize(sentence)]
+    return sentences, tokens
+
+
+def readability_label(avg_sentence_length, avg_syllables):
+    """Label for a simplified Flesch Reading Ease score"""
+    score = flesch_reading_ease(avg_sentence_length, avg_syllables)
+
+    if score >= 90:
+        return 'Very Easy'
+    elif score >= 80:
+        return 'Easy'
+    elif score >= 70:
+        return 'Fairly Easy'
+    elif score >= 60:
+        return 'Standard'
+    elif score >= 50:
+        return 'Fairly Difficult'
+    elif score >= 30:
+        return 'Difficult'
+    else:
+        return 'Very Difficult'
+
+
+def is_difficult_word(word, grade, syllables):
+    """Graded words are difficult from DIFFICULT_GRADE up; unknown words when long or polysyllabic"""
+    if grade:
+        return grade >= DIFFICULT_GRADE
+    return len(word) > 7 or syllables > 3
+
+
+def flesch_reading_ease(avg_sentence_length, avg_syllables):
+    return 206.835 - (1.015 * avg_sentence_length) - (84.6 * avg_syllables)
+
+
+class TextAnalysis:
+    """Everything the reading features need, computed from one tokenization.
+
+    DyslexiaAI.analyze_text() and AIHelpers.annotate_text() used to
+    tokenize the same text up to three times and count syllables twice
+    per word; both now read their payloads from here. Word grade levels
+    come from one vectorized word table lookup for the whole text.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.sentences, self.tokens = tokenize(text)
+
+        word_count = 0
+        letter_count = 0
+        syllable_count = 0
+        token_length = 0
+        difficult_count = 0
+        difficult_words = []
+        annotations = {}
+
+        clean_words = [_NON_WORD_RE.sub('', token.lower()) for token in self.tokens]
+        grades = word_table.grades(clean_words)
+
+        for token, clean_word, grade in zip(self.tokens, clean_words, grades):
+            token_length += len(token)
+
+            if token.isalnum():
+                syllables = count_syllables(token)
+                word_count += 1
+                letter_count += len(token)
+                syllable_count += syllables
+                if is_difficult_word(token, grade, syllables):
+                    difficult_count += 1
+                    if len(difficult_words) < DIFFICULT_WORD_LIMIT:
+                        difficult_words.append({'word': token, 'syllables': syllables, 'length': len(token),
+                                                'grade': grade or None})
+
+            if clean_word:
+                syllables = count_syllables(clean_word)
+                if is_difficult_word(clean_word, grade, syllables):
+                    annotations[token] = {
+                        'syllables': syllables,
+                        'difficulty': 'hard' if grade >= HARD_GRADE or (not grade and len(clean_word) > 10) else 'medium',
+                        'grade': grade or None
+                    }
+
+        self.word_count = word_count
+        self.avg_word_length = letter_count / word_count if word_count else 0
+        self.avg_sentence_length = word_count / len(self.sentences) if self.sentences else 0
+        self.avg_syllables = syllable_count / word_count if word_count else 0
+        self.difficult_words = difficult_words
+        self.difficult_word_ratio = difficult_count / word_count if word_count else 0
+        self.annotations = annotations
+        # Reading level counts every token, punctuation included
+        self.avg_token_length = token_length / len(self.tokens) if self.tokens else 0
+        self.tokens_per_sentence = len(self.tokens) / len(self.sentences) if self.sentences else 0
+
+    @property
+    def difficulty(self):
+        if (self.avg_word_length > 6 or self.avg_sentence_length > 15 or self.avg_syllables > 2
+                or self.difficult_word_ratio > 0.2):
+            return 'Hard'
+        elif (self.avg_word_length > 4 or self.avg_sentence_length > 10 or self.avg_syllables > 1.5
+                or self.difficult_word_ratio > 0.1):
+            return 'Medium'
+        return 'Easy'
+
+    @property
+    def flesch_score(self):
+        return flesch_reading_ease(self.avg_sentence_length, self.avg_syllables)
+
+    @property
+    def reading_level(self):
+        if self.tokens_per_sentence < 10 and self.avg_token_length < 5:
+            return 'Easy'
+        elif self.tokens_per_sentence < 15 and self.avg_token_length < 6:
+            return 'Medium'
+        else:
+            return 'Hard'
+
+    def summary(self):
+        """Payload of DyslexiaAI.analyze_text()"""
+        return {
+            'word_count': self.word_count,
+            'sentence_count': len(self.sentences),
+            'avg_word_length': round(self.avg_word_length, 2),
+            'avg_sentence_length': round(self.avg_sentence_length, 2),
+            'avg_syllables': round(self.avg_syllables, 2),
+            'difficulty': self.difficulty,
+            'difficult_words': list(self.difficult_words),
+            'difficult_word_ratio': round(self.difficult_word_ratio, 3),
+            'readability_score': readability_label(self.avg_sentence_length, self.avg_syllables)
+        }
+
+    def annotation_payload(self):
+        """Payload of AIHelpers.annotate_text()"""
+        return {
+            'text': self.text,
+            'annotations': dict(self.annotations),
+            'word_count': len(self.tokens),
+            'reading_level': self.reading_level
+        }
@@ -0,0 +1,213 @@
+"""
+Sentence and word tokenizers used on the request hot paths.
+
+Two modes, selected with Config.TOKENIZER:
+
+* 'fast' (default): a precompiled regex tokenizer that approximates
+  NLTK's punkt sentence splitter and Treebank word tokenizer on our
+  reading content. Its abbreviation list ships in
+  data/tokenizer/english.json, so startup needs no downloads.
+* 'nltk': the original punkt + Treebank tokenizers. punkt is only looked
+  up (and downloaded if missing) the first time this mode is used.
+
+benchmarks/compare_tokenizers.py checks the fast mode against the
+golden corpus in data/tokenizer/golden_corpus.json.
+"""
+import json
+import os
+import re
+import threading
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         'data', 'tokenizer', 'english.json')
+
+# --- Sentences ---------------------------------------------------------------
+
+# Candidate boundary: terminal punctuation, optional closing quotes or
+# brackets, then whitespace before the next sentence
+_BOUNDARY_RE = re.compile(r'(\.{2,}|…|[.?!]+)(["\'’”)\]]*)\s+(?=\S)')
+_NEXT_WORD_RE = re.compile(r'["\'‘“(\[]*([\w\']*)')
+_INITIAL_RE = re.compile(r'^[A-Z]$')
+_NUMBER_RE = re.compile(r'^\d+$')
+
+
+class FastSentenceTokenizer:
+    """Punkt-style splitter with a fixed abbreviation list.
+
+    A '?' or '!' always ends a sentence. A period ends one unless it
+    follows a known title ("Dr."), or an abbreviation or initial that is
+    not followed by a capitalised common sentence starter ("etc. The"
+    splits, "J. K. Rowling" does not). Abbreviations that are also
+    ordinary words ("no", "sat", "sun") end a sentence unless the next
+    word starts lowercase or with a digit ("She said no. Tom cried."
+    splits, "No. 5" does not). An ellipsis ends a sentence only before
+    a capitalised word.
+    """
+
+    def __init__(self, data_file=DATA_FILE):
+        with open(data_file, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+        self.titles = frozenset(data['titles'])
+        self.abbreviations = frozenset(data['abbreviations']) | self.titles
+        self.ambiguous = frozenset(data['ambiguous_abbreviations'])
+        self.sentence_starters = frozenset(data['sentence_starters'])
+
+    def _is_boundary(self, text, match):
+        punctuation = match.group(1)
+        if '?' in punctuation or '!' in punctuation:
+            return True
+
+        next_word = _NEXT_WORD_RE.match(text, match.end()).group(1)
+        starts_upper = next_word[:1].isupper() or next_word[:1].isdigit()
+        starter = next_word.lower() in self.sentence_starters
+
+        if punctuation != '.':
+            # Ellipsis: a break only if a new sentence clearly starts
+            return starts_upper
+        # Abbreviations are short, so only look a little way back for the word
+        preceding = text[max(0, match.start() - 32):match.start()].rsplit(None, 1)
+        word = preceding[-1].lstrip('"\'‘“([') if preceding else ''
+        if word == 'I':
+            return True
+        initial = _INITIAL_RE.match(word)
+        word = word.lower()
+
+        if word in self.titles:
+            return False
+        if word in self.ambiguous:
+            return next_word[:1].isupper()
+        if word in self.abbreviations or '.' in word or initial:
+            return starts_upper and starter
+        if _NUMBER_RE.match(word):
+            # "Chapter 3. Then" splits; "3. apples" (a list item) does not
+            return starts_upper
+        return True
+
+    def tokenize(self, text):
+        sentences = []
+        start = 0
+        for match in _BOUNDARY_RE.finditer(text):
+            if self._is_boundary(text, match):
+                end = match.start(2) + len(match.group(2))
+                sentence = text[start:end].strip()
+                if sentence:
+                    sentences.append(sentence)
+                start = match.end()
+        tail = text[start:].strip()
+        if tail:
+            sentences.append(tail)
+        return sentences
+
+
+# --- Words -------------------------------------------------------------------
+
+_WORD_RE = re.compile(r"""
+      \.{2,}                                  # ellipsis
+    | --                                      # dash
+    | (?:[^\s.,:;@\#$%&?!()\[\]{}<>"*“”‘«„`]  # a word: anything but splitting punctuation,
+      | [,:](?=\d)                            #   with commas/colons inside numbers
+      | \.(?!\.)                              #   and single periods (abbreviations, decimals)
+      )+
+    | ``|''                                   # quotes already in Treebank form
+    | \S                                      # any other single punctuation character
+""", re.VERBOSE)
+_CONTRACTION_RE = re.compile(r"^(.+?)(n't|N'T|'[sSmMdD]|'ll|'LL|'re|'RE|'ve|'VE)$")
+_SPLIT_WORDS = {
+    'cannot': ('can', 'not'), 'gonna': ('gon', 'na'), 'gotta': ('got', 'ta'), 'wanna': ('wan', 'na'),
+    'gimme': ('gim', 'me'), 'lemme': ('lem', 'me'), "d'ye": ('d', "'ye"), "more'n": ('more', "'n"),
+}
+_OPENING = ' ([{<'
+_FINAL_PERIOD_RE = re.compile(r'([^.])(\.)([\]\)}>"\']*)\s*$')
+
+
+def fast_word_tokenize(sentence):
+    """Treebank-style word tokens for one sentence"""
+    # Treebank splits only the sentence-final period off its word
+    sentence = _FINAL_PERIOD_RE.sub(r'\1 \2\3', sentence)
+    tokens = []
+    append = tokens.append
+    for match in _WORD_RE.finditer(sentence):
+        token = match.group()
+        if token == '"':
+            start = match.start()
+            append('``' if start == 0 or sentence[start - 1] in _OPENING or sentence[start - 1].isspace() else "''")
+            continue
+        if len(token) > 1 and ("'" in token or token.lower() in _SPLIT_WORDS):
+            split = _SPLIT_WORDS.get(token.lower())
+            if split is not None:
+                tokens.append(token[:len(split[0])])
+                tokens.append(token[len(split[0]):])
+                continue
+            if token.endswith("'") and not token.endswith("''"):
+                # Trailing apostrophe of a plural possessive ("dogs'")
+                tokens.append(token[:-1])
+                tokens.append("'")
+                continue
+            contraction = _CONTRACTION_RE.match(token)
+            if contraction:
+                tokens.append(contraction.group(1))
+                tokens.append(contraction.group(2))
+                continue
+        append(token)
+    return tokens
+
+
+# --- Mode selection ----------------------------------------------------------
+
+_mode = os.environ.get('TOKENIZER', 'fast')
+_fast_sentences = None
+_nltk_word_tokenizer = None
+_lock = threading.Lock()
+
+
+def configure(mode):
+    """Select 'fast' or 'nltk' tokenization for the process"""
+    global _mode
+    if mode not in ('fast', 'nltk'):
+        raise ValueError(f"Unknown tokenizer mode: {mode}")
+    _mode = mode
+
+
+def _fast_sentence_tokenizer():
+    global _fast_sentences
+    if _fast_sentences is None:
+        with _lock:
+            if _fast_sentences is None:
+                _fast_sentences = FastSentenceTokenizer()
+    return _fast_sentences
+
+
+def _nltk():
+    """punkt-backed tokenizers, fetching the punkt model on first use"""
+    global _nltk_word_tokenizer
+    if _nltk_word_tokenizer is None:
+        with _lock:
+            if _nltk_word_tokenizer is None:
+                import nltk
+                from nltk.tokenize.destructive import NLTKWordTokenizer
+                try:
+                    nltk.data.find('tokenizers/punkt')
+                except LookupError:
+                    nltk.download('punkt')
+                _nltk_word_tokenizer = NLTKWordTokenizer()
+    return _nltk_word_tokenizer
+
+
+def sent_tokenize(text):
+    if _mode == 'nltk':
+        _nltk()
+        import nltk.tokenize
+        return nltk.tokenize.sent_tokenize(text)
+    return _fast_sentence_tokenizer().tokenize(text)
+
+
+def sentence_word_tokenize(sentence):
+    """Word tokens of a single sentence"""
+    if _mode == 'nltk':
+        return _nltk().tokenize(sentence)
+    return fast_word_tokenize(sentence)
+
+
+def word_tokenize(text):
+    """Same contract as nltk.word_tokenize: sentence-split, then tokenize each sentence"""
+    return [token for sentence in sent_tokenize(text) for token in sentence_word_tokenize(sentence)]
@@ -0,0 +1,117 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class TrackerPool:
+    """Bounded pool of MediaPipe graph instances, one holder at a time each.
+
+    Instances are created lazily by `factory`, up to `size` of them.
+    checkout() hands an idle one to a single caller (or creates one) and
+    blocks while all are in use; checkin() makes it available again,
+    first resetting its tracking state when `reset` is set. Instances
+    left idle for longer than `idle_timeout` seconds are closed on the
+    next checkout or checkin. Wait times and utilization are kept for
+    stats().
+    """
+
+    def __init__(self, factory, size, idle_timeout=None, reset=True):
+        self.factory = factory
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.reset = reset
+        self.idle = []  # (instance, idle since), most recently used last
+        self.created = 0  # Live instances, idle or in use
+        self.in_use = 0
+        self.condition = threading.Condition()
+        self.counters = {'checkouts': 0, 'waited': 0, 'timeouts': 0, 'created': 0, 'evicted': 0}
+        self.wait_seconds = 0.0
+        self.max_wait = 0.0
+        self.busy_seconds = 0.0
+        self.started = self.last_change = time.monotonic()
+
+    def checkout(self, timeout=None):
+        """An instance for the caller's exclusive use; TimeoutError if none frees up within timeout seconds"""
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        with self.condition:
+            self._evict(started)
+            while not self.idle and self.created >= self.size:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self.counters['timeouts'] += 1
+                    raise TimeoutError(f'All {self.size} trackers are in use')
+                self.condition.wait(remaining)
+            now = time.monotonic()
+            waited = now - started
+            self.counters['checkouts'] += 1
+            if waited > 0.001:
+                self.counters['waited'] += 1
+            self.wait_seconds += waited
+            self.max_wait = max(self.max_wait, waited)
+            self._count_in_use(1, now)
+            if self.idle:
+                return self.idle.pop()[0]
+            self.created += 1
+            self.counters['created'] += 1
+        try:
+            return self.factory()  # Outside the lock: building a graph takes a while
+        except Exception:
+            with self.condition:
+                self.created -= 1
+                self._count_in_use(-1, time.monotonic())
+                self.condition.notify()
+            raise
+
+    def checkin(self, tracker):
+        # A graph keeps tracking state between frames; the next holder starts clean
+        if self.reset and hasattr(tracker, 'reset'):
+            tracker.reset()
+        with self.condition:
+            now = time.monotonic()
+            self._count_in_use(-1, now)
+            self.idle.append((tracker, now))
+            self._evict(now)
+            self.condition.notify()
+
+    @contextmanager
+    def borrowed(self, timeout=None):
+        tracker = self.checkout(timeout)
+        try:
+            yield tracker
+        finally:
+            self.checkin(tracker)
+
+    def _count_in_use(self, delta, now):
+        self.busy_seconds += self.in_use * (now - self.last_change)
+        self.last_change = now
+        self.in_use += delta
+
+    def _evict(self, now):
+        """Close instances idle for longer than idle_timeout (called with the lock held)"""
+        if self.idle_timeout is None:
+            return
+        # Checkout takes from the end, so the least recently used are at the front
+        while self.idle and now - self.idle[0][1] > self.idle_timeout:
+            tracker, _ = self.idle.pop(0)
+            self.created -= 1
+            self.counters['evicted'] += 1
+            if hasattr(tracker, 'close'):
+                tracker.close()
+
+    def stats(self):
+        with self.condition:
+            now = time.monotonic()
+            busy = self.busy_seconds + self.in_use * (now - self.last_change)
+            checkouts = self.counters['checkouts']
+            return {
+                **self.counters,
+                'size': self.size,
+                'live': self.created,
+                'in_use': self.in_use,
+                'idle': len(self.idle),
+                'avg_wait_ms': round(1000 * self.wait_seconds / checkouts, 2) if checkouts else 0.0,
+                'max_wait_ms': round(1000 * self.max_wait, 2),
+                # Share of the pool's capacity (size instances since start) spent checked out
+                'utilization': round(busy / (self.size * max(now - self.started, 1e-9)), 3)
+            }
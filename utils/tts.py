@@ -0,0 +1,242 @@
+import array
+import hashlib
+import io
+import json
+import math
+import os
+import re
+import shutil
+import subprocess
+import threading
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+_VOICE_RE = re.compile(r'^[A-Za-z0-9_+-]{1,32}$')
+_KEY_RE = re.compile(r'^[0-9a-f]{64}$')
+
+
+class EspeakEngine:
+    """Offline synthesis with the espeak-ng (or espeak) command line tool"""
+
+    name = 'espeak'
+
+    def __init__(self, binary=None, timeout=30):
+        self.binary = binary or shutil.which('espeak-ng') or shutil.which('espeak')
+        self.timeout = timeout
+
+    def available(self):
+        return self.binary is not None
+
+    def synthesize(self, text, voice, rate, pitch):
+        # Text goes in on stdin so it can never be read as an option
+        result = subprocess.run(
+            [self.binary, '--stdin', '--stdout', '-v', voice, '-s', str(rate), '-p', str(pitch)],
+            input=text.encode('utf-8'), stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            timeout=self.timeout, check=True)
+        return result.stdout
+
+
+class StubEngine:
+    """Deterministic tones instead of speech, for tests and machines without espeak"""
+
+    name = 'stub'
+    SAMPLE_RATE = 16000
+
+    def available(self):
+        return True
+
+    def synthesize(self, text, voice, rate, pitch):
+        samples = array.array('h')
+        seconds_per_word = 60.0 / rate
+        frequency = 200 + 4 * pitch
+        for _ in text.split():
+            count = int(self.SAMPLE_RATE * seconds_per_word)
+            samples.extend(int(8000 * math.sin(2 * math.pi * frequency * i / self.SAMPLE_RATE)) if i < count * 0.8 else 0
+                           for i in range(count))
+        buffer = io.BytesIO()
+        with wave.open(buffer, 'wb') as out:
+            out.setnchannels(1)
+            out.setsampwidth(2)
+            out.setframerate(self.SAMPLE_RATE)
+            out.writeframes(samples.tobytes())
+        return buffer.getvalue()
+
+
+ENGINES = {'espeak': EspeakEngine, 'stub': StubEngine}
+
+
+class TTSService:
+    """Server-side speech rendering with an on-disk audio cache.
+
+    Clips are keyed by a hash of the text, engine and voice settings and
+    stored as WAV files under `cache_dir`, with a small manifest beside
+    each so any worker can render a clip it did not schedule. prepare()
+    schedules one clip per sentence in reading order on a background
+    pool, so the first sentence is ready to play while later ones are
+    still rendering. The cache is trimmed to `max_disk_bytes`, oldest
+    first.
+    """
+
+    PRUNE_EVERY = 50
+
+    def __init__(self, engine, cache_dir, max_workers=2, max_disk_bytes=200 * 1024 * 1024,
+                 voice='en', rate=140, pitch=50, render_timeout=30):
+        self.engine = engine
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.defaults = {'voice': voice, 'rate': rate, 'pitch': pitch}
+        self.render_timeout = render_timeout
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='tts')
+        self.pending = {}  # key -> Future of a render scheduled in this process
+        self.lock = threading.Lock()
+        self.renders_since_prune = 0
+        self.counters = {'hits': 0, 'renders': 0, 'errors': 0}
+
+    def settings(self, voice=None, rate=None, pitch=None):
+        """Voice settings with defaults filled in and values clamped to safe ranges"""
+        voice = voice if voice and _VOICE_RE.match(str(voice)) else self.defaults['voice']
+        rate = min(300, max(80, int(rate if rate is not None else self.defaults['rate'])))
+        pitch = min(99, max(0, int(pitch if pitch is not None else self.defaults['pitch'])))
+        return {'voice': voice, 'rate': rate, 'pitch': pitch}
+
+    def make_key(self, text, settings):
+        payload = json.dumps({'text': ' '.join(text.split()), 'engine': self.engine.name, 'settings': settings},
+                             sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key, suffix):
+        return os.path.join(self.cache_dir, key[:2], key + suffix)
+
+    def prepare(self, sentences, settings):
+        """Schedule one clip per sentence, in order; returns [{'index', 'text', 'key'}]"""
+        clips = []
+        for index, sentence in enumerate(sentences):
+            key = self.make_key(sentence, settings)
+            clips.append({'index': index, 'text': sentence, 'key': key})
+            if os.path.exists(self._path(key, '.wav')):
+                continue
+            manifest = self._path(key, '.json')
+            if not os.path.exists(manifest):
+                os.makedirs(os.path.dirname(manifest), exist_ok=True)
+                self._write_atomic(manifest, json.dumps({'text': sentence, 'settings': settings}).encode('utf-8'))
+            self._schedule(key, sentence, settings)
+        return clips
+
+    def _schedule(self, key, text, settings):
+        with self.lock:
+            future = self.pending.get(key)
+            if future is None:
+                future = self.executor.submit(self._render, key, text, settings)
+                self.pending[key] = future
+        return future
+
+    def _render(self, key, text, settings):
+        path = self._path(key, '.wav')
+        try:
+            if not os.path.exists(path):
+                audio = self.engine.synthesize(text, settings['voice'], settings['rate'], settings['pitch'])
+                self._write_atomic(path, audio)
+                with self.lock:
+                    self.counters['renders'] += 1
+                    self.renders_since_prune += 1
+                    prune = self.renders_since_prune >= self.PRUNE_EVERY
+                    if prune:
+                        self.renders_since_prune = 0
+                if prune:
+                    self.prune()
+            return path
+        except Exception as e:
+            print(f"Error rendering speech: {e}")
+            with self.lock:
+                self.counters['errors'] += 1
+            return None
+        finally:
+            with self.lock:
+                self.pending.pop(key, None)
+
+    def _write_atomic(self, path, data):
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as file:
+            file.write(data)
+        os.replace(tmp_path, path)
+
+    def audio_path(self, key):
+        """Path of a clip's WAV file, rendering it now if needed; None if unknown or failed"""
+        if not _KEY_RE.match(key):
+            return None
+        path = self._path(key, '.wav')
+        if os.path.exists(path):
+            with self.lock:
+                self.counters['hits'] += 1
+            return path
+        try:
+            with open(self._path(key, '.json'), 'r', encoding='utf-8') as file:
+                manifest = json.load(file)
+        except (OSError, ValueError):
+            return None
+        future = self._schedule(key, manifest['text'], manifest['settings'])
+        try:
+            return future.result(timeout=self.render_timeout)
+        except Exception:
+            return None
+
+    def prune(self):
+        """Drop the oldest clips (and their manifests) until under the size limit"""
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith('.wav'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_disk_bytes:
+                break
+            for stale in (path, path[:-len('.wav')] + '.json'):
+                try:
+                    os.remove(stale)
+                except FileNotFoundError:
+                    pass
+            total -= size
+
+    def stats(self):
+        with self.lock:
+            return {'engine': self.engine.name, **self.counters, 'rendering': len(self.pending)}
+
+
+_service = None
+_service_lock = threading.Lock()
+_service_checked = False
+
+
+def get_tts_service(config):
+    """Process-wide TTS service, or None when speech is left to the browser"""
+    global _service, _service_checked
+    with _service_lock:
+        if not _service_checked:
+            _service_checked = True
+            name = config.get('TTS_ENGINE', 'browser')
+            engine_class = ENGINES.get(name)
+            engine = engine_class() if engine_class else None
+            if engine is not None and not engine.available():
+                print(f"TTS engine '{name}' is not available; falling back to browser speech")
+                engine = None
+            if engine is not None:
+                _service = TTSService(
+                    engine,
+                    config.get('TTS_CACHE_DIR', 'data/tts_cache'),
+                    max_workers=config.get('TTS_WORKERS', 2),
+                    max_disk_bytes=config.get('TTS_CACHE_MAX_MB', 200) * 1024 * 1024,
+                    voice=config.get('TTS_VOICE', 'en'),
+                    rate=config.get('TTS_RATE', 140),
+                    pitch=config.get('TTS_PITCH', 50)
+                )
+        return _service
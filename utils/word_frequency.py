@@ -0,0 +1,199 @@
+import mmap
+import os
+import re
+import struct
+import threading
+
+import numpy as np
+
+from utils.artifacts import source_digest
+
+SOURCE_FILE = 'data/wordlist/word_frequency.txt'
+TABLE_FILE = 'data/wordlist/word_frequency.bin'
+
+MAGIC = b'WORDFREQ'
+VERSION = 2
+HEADER = struct.Struct('<8sIII32s')  # magic, version, entry count, key width, SHA-256 of the source
+
+# Grade level for words without one in the source, by frequency rank
+GRADE_BANDS = ((250, 1), (500, 2), (800, 3), (1100, 4), (1300, 5), (1500, 6))
+DEFAULT_GRADE = 7
+
+_WORD_RE = re.compile(r"^[a-z][a-z']*$")
+_DOUBLING_RE = re.compile(r'[^aeiou][aeiou][bdgmnprt]$')
+
+
+def grade_for_rank(rank):
+    for limit, grade in GRADE_BANDS:
+        if rank <= limit:
+            return grade
+    return DEFAULT_GRADE
+
+
+def inflections(word):
+    """Regular inflected forms of a word (over-generating is harmless: non-words are never looked up)"""
+    if word.endswith('e'):
+        stem, doubled = word[:-1], word[:-1]
+    elif len(word) <= 4 and _DOUBLING_RE.search(word):
+        stem, doubled = word, word + word[-1]
+    else:
+        stem, doubled = word, word
+    if word.endswith('y') and len(word) > 2 and word[-2] not in 'aeiou':
+        plural, base = word[:-1] + 'ies', word[:-1] + 'i'
+    elif word.endswith(('s', 'x', 'z', 'ch', 'sh')):
+        plural, base = word + 'es', word
+    else:
+        plural, base = word + 's', doubled
+    forms = {plural, base + 'ed', doubled + 'ing', base + 'er', base + 'est', base + 'ly'}
+    if word.endswith('e'):
+        forms |= {word + 'd', word + 'r', word + 'st', stem + 'ing', word + 'ly'}
+    forms.discard(word)
+    return forms
+
+
+def parse_source(lines):
+    """{word: (rank, grade)} from the source list, including generated inflections"""
+    entries = {}
+    rank = 0
+    for number, line in enumerate(lines, 1):
+        line = line.split('#', 1)[0].strip()
+        if not line:
+            continue
+        word, *rest = line.lower().split()
+        if not _WORD_RE.match(word) or len(rest) > 1 or (rest and not rest[0].isdigit()):
+            raise ValueError(f"Line {number}: expected 'word [grade]', got '{line}'")
+        rank += 1
+        if word not in entries:
+            entries[word] = (rank, int(rest[0]) if rest else grade_for_rank(rank))
+    # Listed words win over generated forms, and earlier (more frequent) bases over later ones
+    for word, (rank, grade) in sorted(entries.items(), key=lambda entry: entry[1][0]):
+        for form in inflections(word):
+            entries.setdefault(form, (rank, grade))
+    return entries
+
+
+def compile_table(entries, digest=bytes(32)):
+    """The compiled file for {word: (rank, grade)}, as bytes; digest is the raw source_digest of its source.
+
+    Layout (little-endian): the header, the ASCII keys in sorted order
+    as fixed-width NUL-padded records, one uint32 rank and one uint8
+    grade per key.
+    """
+    keys = sorted(entries)
+    width = max(map(len, keys), default=1)
+    return b''.join([
+        HEADER.pack(MAGIC, VERSION, len(keys), width, digest),
+        np.array(keys, dtype=f'S{width}').tobytes(),
+        np.array([entries[key][0] for key in keys], dtype='<u4').tobytes(),
+        np.array([entries[key][1] for key in keys], dtype='u1').tobytes()
+    ])
+
+
+class WordTable:
+    """Frequency rank and grade level per word, from a memory-mapped sorted array.
+
+    The source list (data/wordlist/word_frequency.txt) is compiled by
+    `flask build-wordlist` into fixed-width sorted keys plus parallel
+    rank and grade arrays. The file is mapped read-only and wrapped in
+    NumPy arrays, so all workers share its pages and a batch of words is
+    looked up with one vectorized searchsorted. A missing or out of date
+    file is compiled on first use.
+    """
+
+    def __init__(self, path=TABLE_FILE, source_file=SOURCE_FILE):
+        self.path = path
+        self.source_file = source_file
+        self.keys = None
+        self.lock = threading.Lock()
+
+    def _load(self):
+        with self.lock:
+            if self.keys is not None:
+                return
+            try:
+                digest = bytes.fromhex(source_digest(self.source_file))
+            except OSError:
+                digest = None  # Source not deployed: trust the compiled file
+            data = self._map(digest)
+            if data is None:
+                print(f"Word table {self.path} is missing or out of date; compiling it")
+                try:
+                    write_table(self.source_file, self.path)
+                    data = self._map()
+                except OSError as e:
+                    print(f"Could not write {self.path} ({e}); using an in-memory copy")
+                    with open(self.source_file, 'r', encoding='utf-8') as file:
+                        data = compile_table(parse_source(file), digest)
+
+            _, _, count, width, _ = HEADER.unpack_from(data, 0)
+            offset = HEADER.size
+            keys = np.frombuffer(data, dtype=f'S{width}', count=count, offset=offset)
+            offset += count * width
+            self.ranks = np.frombuffer(data, dtype='<u4', count=count, offset=offset)
+            self.grade_values = np.frombuffer(data, dtype='u1', count=count, offset=offset + 4 * count)
+            self.width = width
+            self.data = data
+            self.keys = keys
+
+    def _map(self, digest=None):
+        """The compiled file mapped read-only, or None if it is missing, was written by another
+        format version or was compiled from a source other than the one with this digest"""
+        try:
+            with open(self.path, 'rb') as file:
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return None
+        magic, version, _, _, stored = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION or (digest is not None and stored != digest):
+            data.close()
+            return None
+        return data
+
+    def _indexes(self, words):
+        """Entry index per word (lowercase, as given), -1 where the word is not in the table"""
+        if self.keys is None:
+            self._load()
+        if not words:
+            return np.empty(0, dtype=np.intp)
+        # Words that cannot be keys (non-ASCII or too long) are looked up as '' and miss
+        queries = [word if word.isascii() and len(word) <= self.width else '' for word in words]
+        queries = np.array(queries, dtype=f'S{self.width}')
+        indexes = np.searchsorted(self.keys, queries)
+        indexes[indexes == len(self.keys)] = 0
+        found = (self.keys[indexes] == queries) & (queries != b'')
+        return np.where(found, indexes, -1)
+
+    def lookup(self, words):
+        """(ranks, grades) arrays for lowercase words; 0 in both for unknown words"""
+        indexes = self._indexes(words)
+        known = indexes >= 0
+        ranks = np.where(known, self.ranks[indexes], 0)
+        grades = np.where(known, self.grade_values[indexes], 0)
+        return ranks, grades
+
+    def grades(self, words):
+        """Grade level per lowercase word as a list, 0 for unknown words"""
+        return self.lookup(words)[1].tolist()
+
+    def grade(self, word):
+        return self.grades([word.lower()])[0]
+
+    def __len__(self):
+        if self.keys is None:
+            self._load()
+        return len(self.keys)
+
+
+def write_table(source_file=SOURCE_FILE, path=TABLE_FILE):
+    """Compile the word list and save it; returns the entry count (inflections included)"""
+    with open(source_file, 'r', encoding='utf-8') as file:
+        entries = parse_source(file)
+    digest = bytes.fromhex(source_digest(source_file))
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as file:
+        file.write(compile_table(entries, digest))
+    os.replace(tmp_path, path)
+    return len(entries)
+
+
+word_table = WordTable()